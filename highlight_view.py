@@ -1,5 +1,5 @@
 from __future__ import annotations
-from collections import defaultdict, ChainMap
+from collections import Counter, defaultdict, ChainMap
 from contextlib import contextmanager
 import html
 from itertools import chain
@@ -11,7 +11,7 @@ import uuid
 import sublime
 import sublime_plugin
 
-from .lint import persist, events, style, util, queue, quick_fix
+from .lint import error_index, persist, events, style, util, queue, quick_fix
 from .lint.const import PROTECTED_REGIONS_KEY, ERROR, WARNING
 
 
@@ -32,6 +32,7 @@ ProtectedRegions = List[sublime.Region]
 RegionKey = Union['GutterIcon', 'Squiggle']
 DemotePredicate = Callable[[LintError], bool]
 FilteredErrors = Tuple[List[LintError], List[LintError]]
+RegionsSignature = Tuple[Tuple[int, int], ...]
 
 
 class State_(TypedDict):
@@ -110,10 +111,9 @@ class UpdateOnLoadController(sublime_plugin.EventListener):
     def on_load_async(self, view: sublime.View) -> None:
         # update this new view with any errors it currently has
         filename = util.canonical_filename(view)
-        errors = persist.file_errors.get(filename)
-        if errors:
+        linter_names = list(persist.file_errors.by_linter(filename))
+        if linter_names:
             set_idle(view, True)  # show errors immediately
-            linter_names = set(error['linter'] for error in errors)
             for linter_name in linter_names:
                 highlight_linter_errors([view], filename, linter_name)
 
@@ -134,6 +134,7 @@ def highlight_linter_errors(
     errors_for_the_gutter, _ = filter_errors(errors, by_line)
 
     gutter_regions = prepare_gutter_data(errors_for_the_gutter)
+    lazy = should_draw_lazily(errors)
 
     for view in views:
         vid = view.id()
@@ -151,32 +152,62 @@ def highlight_linter_errors(
 
             State['views'].add(vid)
 
+        if lazy:
+            # Draw the errors around the viewport in detail, and everything
+            # else aggregated, with only a few region keys.
+            detail_region = DETAIL_REGIONS[vid] = compute_detail_region(view)
+            detailed_errors, overview_errors = partition_by_region(
+                errors_for_the_highlights, detail_region)
+            detailed_loosers, _ = partition_by_region(loosers, detail_region)
+            if view == State['active_view']:
+                ensure_viewport_polling()
+        else:
+            DETAIL_REGIONS.pop(vid, None)
+            detailed_errors, overview_errors = errors_for_the_highlights, []
+            detailed_loosers = loosers
+
         highlight_regions = prepare_highlights_data(
-            errors_for_the_highlights,
+            detailed_errors,
             demote_predicate=demote_predicate,
             demote_scope=demote_scope,
             quiet=vid in State['quiet_views'],
             idle=vid in State['idle_views']
         )
         hidden_highlight_regions = prepare_highlights_data(
-            loosers,
+            detailed_loosers,
             demote_predicate=demote_predicate,
             demote_scope=demote_scope,
             quiet=True,
             idle=vid in State['idle_views']
         )
+        overview_members: dict[Squiggle, list[LintError]] = {}
+        overview_regions = prepare_highlights_data(
+            overview_errors,
+            demote_predicate=demote_predicate,
+            demote_scope=demote_scope,
+            quiet=vid in State['quiet_views'],
+            idle=vid in State['idle_views'],
+            aggregate=True,
+            members=overview_members
+        )
         squiggle_regions: Squiggles = ChainMap(
-            {}, highlight_regions, hidden_highlight_regions  # type: ignore[arg-type]
+            {}, highlight_regions, hidden_highlight_regions, overview_regions  # type: ignore[arg-type]
         )
 
         draw(view, linter_name, squiggle_regions, gutter_regions)
+        remember_overview_members(view, overview_members)
         draw_phantoms(view)
 
 
 def draw_phantoms(view):
     vid = view.id()
     filename = util.canonical_filename(view)
-    errors = persist.file_errors[filename]
+    detail_region = DETAIL_REGIONS.get(vid)
+    errors = (
+        persist.file_errors[filename]
+        if detail_region is None
+        else error_index.errors_intersecting(filename, detail_region)
+    )
     phantoms = (
         prepare_phantoms(view, errors)
         if vid not in State['views_without_phantoms']
@@ -342,6 +373,144 @@ def filter_errors(
     return filtered_errors, loosers
 
 
+# Files with more errors than 'highlights.max_detailed_errors' are drawn
+# lazily: only the errors in and around the viewport get their own
+# squiggle, annotation and phantom.  We remember the region we've drawn
+# in detail per view, and draw again when the user scrolls out of it.
+DETAIL_REGIONS: dict[sublime.ViewId, sublime.Region] = {}
+# The uids of the errors in each aggregated squiggle, in the order of their
+# regions, so that we can read back where Sublime moved them to.
+OVERVIEW_MEMBERS: dict[sublime.ViewId, dict[Squiggle, list[str]]] = {}
+# The aggregated squiggles carry this instead of the uid of an error
+OVERVIEW_UID = 'overview'
+
+# Sublime has no events for scrolling, so we poll the active view while it
+# is drawn lazily.  While the viewport doesn't move we back off, any
+# activity in the view makes us poll fast again.
+MIN_VIEWPORT_POLLING_INTERVAL = 100  # [ms]
+MAX_VIEWPORT_POLLING_INTERVAL = 2000  # [ms]
+viewport_polling = False
+viewport_polling_interval = MIN_VIEWPORT_POLLING_INTERVAL
+viewport_polling_generation = 0
+last_visible_region: Optional[sublime.Region] = None
+
+
+def should_draw_lazily(errors: list[LintError]) -> bool:
+    threshold = persist.settings.get('highlights.max_detailed_errors')
+    return isinstance(threshold, int) and len(errors) > threshold
+
+
+def compute_detail_region(view: sublime.View) -> sublime.Region:
+    """Return the visible region plus one screen above and below."""
+    visible = view.visible_region()
+    first_row, _ = view.rowcol(visible.begin())
+    last_row, _ = view.rowcol(visible.end())
+    height = last_row - first_row + 1
+    return sublime.Region(
+        view.text_point(max(0, first_row - height), 0),
+        min(view.size(), view.text_point(last_row + height, 0))
+    )
+
+
+def partition_by_region(
+    errors: list[LintError],
+    region: sublime.Region
+) -> FilteredErrors:
+    a, b = region.begin(), region.end()
+    inside: list[LintError] = []
+    outside: list[LintError] = []
+    for error in errors:
+        r = error['region']
+        (inside if r.begin() <= b and r.end() >= a else outside).append(error)
+    return inside, outside
+
+
+def ensure_viewport_polling() -> None:
+    """Poll the viewport of the active view, fast again if we backed off."""
+    sublime.set_timeout(_ensure_viewport_polling)
+
+
+def _ensure_viewport_polling() -> None:
+    global viewport_polling, viewport_polling_interval, viewport_polling_generation
+    if viewport_polling and viewport_polling_interval == MIN_VIEWPORT_POLLING_INTERVAL:
+        return
+
+    # Drop the pending, slow tick and start a new chain of fast ticks.
+    viewport_polling = True
+    viewport_polling_interval = MIN_VIEWPORT_POLLING_INTERVAL
+    viewport_polling_generation += 1
+    sublime.set_timeout(
+        partial(poll_viewport, viewport_polling_generation), viewport_polling_interval)
+
+
+def poll_viewport(generation: int) -> None:
+    global viewport_polling, viewport_polling_interval, last_visible_region
+    if generation != viewport_polling_generation:
+        return
+
+    view = State['active_view']
+    detail_region = DETAIL_REGIONS.get(view.id()) if view else None
+    if view is None or detail_region is None or not view.is_valid():
+        # Activating a lazily drawn view starts us again.
+        viewport_polling = False
+        return
+
+    visible_region = view.visible_region()
+    if not detail_region.contains(visible_region):
+        # Mark as handled until the redraw computes the new region
+        DETAIL_REGIONS[view.id()] = visible_region
+        filename = util.canonical_filename(view)
+        sublime.set_timeout_async(
+            lambda: highlight_linter_errors([view], filename, '')
+        )
+
+    if visible_region == last_visible_region:
+        viewport_polling_interval = min(
+            MAX_VIEWPORT_POLLING_INTERVAL, viewport_polling_interval * 2)
+    else:
+        viewport_polling_interval = MIN_VIEWPORT_POLLING_INTERVAL
+    last_visible_region = visible_region
+    sublime.set_timeout(partial(poll_viewport, generation), viewport_polling_interval)
+
+
+@util.ensure_on_ui_thread
+def remember_overview_members(
+    view: sublime.View,
+    members: dict[Squiggle, list[LintError]]
+) -> None:
+    # Runs after `draw`, so that the members match the drawn regions.
+    if not members:
+        OVERVIEW_MEMBERS.pop(view.id(), None)
+        return
+
+    OVERVIEW_MEMBERS[view.id()] = {
+        key: [
+            error['uid']
+            for error in sorted(errors, key=lambda e: (e['region'].begin(), e['region'].end()))
+        ]
+        for key, errors in members.items()
+    }
+
+
+def overview_regions_by_uid(
+    view: sublime.View,
+    region_keys: FrozenSet[RegionKey]
+) -> dict[str, tuple[Squiggle, sublime.Region]]:
+    """Return where the aggregated squiggles of the errors are now."""
+    rv = {}
+    for key, uids in OVERVIEW_MEMBERS.get(view.id(), {}).items():
+        if key not in region_keys:
+            continue
+        regions = view.get_regions(key)
+        # Sublime keeps the regions of a key sorted.  If it merged some,
+        # we can't tell which one belongs to which error anymore.
+        if len(regions) != len(uids):
+            continue
+        for uid, region in zip(uids, regions):
+            rv[uid] = (key, region)
+    return rv
+
+
 def by_position(error: LintError) -> Hashable:
     return error['line'], error['start'], error['region'].end()
 
@@ -383,8 +552,10 @@ def prepare_highlights_data(
     demote_scope: str,
     quiet: bool,
     idle: bool,
+    aggregate: bool = False,
+    members: Optional[dict[Squiggle, list[LintError]]] = None,
 ) -> Squiggles:
-    by_region_id = {}
+    by_region_id: dict[Squiggle, list[sublime.Region]] = {}
     for error in errors:
         if error.get('revalidate'):
             continue
@@ -398,8 +569,17 @@ def prepare_highlights_data(
         elif not idle and demote_while_busy:
             scope = demote_scope
 
-        uid = error['uid']
         linter_name = error['linter']
+        if aggregate:
+            # One key per style, without annotations
+            uid = OVERVIEW_UID + ('-demotable' if demote_while_busy else '')
+            key = Squiggle(linter_name, uid, scope, flags, demote_while_busy, alt_scope)
+            by_region_id.setdefault(key, []).append(error['region'])
+            if members is not None:
+                members.setdefault(key, []).append(error)
+            continue
+
+        uid = error['uid']
         annotation = style.get_value('annotation', error, '').format(**error)
         key = Squiggle(linter_name, uid, scope, flags, demote_while_busy, alt_scope, annotation=annotation)
         by_region_id[key] = [error['region']]
@@ -459,14 +639,20 @@ def draw(
 
     # overlaying all gutter regions with common invisible one,
     # to create unified handle for GitGutter and other plugins
-    view.add_regions(PROTECTED_REGIONS_KEY, list(flatten(gutter_regions.values())))
-
-    # otherwise update (or create) regions
-    for squiggle, regions in highlight_regions.items():
-        draw_view_region(view, squiggle, regions)
-
-    for icon, regions in gutter_regions.items():
-        draw_view_region(view, icon, regions)
+    protected_regions = list(flatten(gutter_regions.values()))
+    if not is_drawn(view, PROTECTED_REGIONS_KEY, protected_regions):
+        view.add_regions(PROTECTED_REGIONS_KEY, protected_regions)
+        DRAW_CALLS['add_regions'] += 1
+        remember_drawn(view, PROTECTED_REGIONS_KEY, protected_regions)
+
+    # otherwise update (or create) regions, but only if they changed
+    region_items: list[tuple[RegionKey, list[sublime.Region]]] = [
+        *highlight_regions.items(), *gutter_regions.items()
+    ]
+    for region_key, regions in region_items:
+        if region_key in current_region_keys and is_drawn(view, region_key, regions):
+            continue
+        draw_view_region(view, region_key, regions)
 
 
 class GutterIcon(str):
@@ -614,6 +800,52 @@ else:
         EVERSTORE = defaultdict(set)
 
 
+# What we've drawn per view: the regions and the annotation per key, and
+# the `change_count` of the view at that time.  Until the view changes
+# we can trust that Sublime still shows exactly these regions.  After that,
+# Sublime has moved them along with the edits, and we must ask for their
+# current positions.
+DrawnRegions = Tuple[RegionsSignature, str, int]
+DRAWN: defaultdict[sublime.ViewId, dict[str, DrawnRegions]] = defaultdict(dict)
+# Count the calls which (re)draw, so that we can check that unchanged
+# results don't draw anything
+DRAW_CALLS: Counter[str] = Counter()
+
+
+def signature(regions: Iterable[sublime.Region]) -> RegionsSignature:
+    return tuple((r.a, r.b) for r in regions)
+
+
+def is_drawn(view: sublime.View, key: str, regions: list[sublime.Region]) -> bool:
+    """Return True if `regions` are exactly what the view already shows."""
+    drawn = DRAWN.get(view.id(), {}).get(key)
+    if drawn is None:
+        return False
+
+    drawn_regions, annotation, change_count = drawn
+    if annotation != getattr(key, 'annotation', ''):
+        return False
+
+    next_regions = signature(regions)
+    if change_count == view.change_count():
+        return drawn_regions == next_regions
+
+    if signature(view.get_regions(key)) != next_regions:
+        return False
+    remember_drawn(view, key, regions)
+    return True
+
+
+def remember_drawn(view: sublime.View, key: str, regions: list[sublime.Region]) -> None:
+    DRAWN[view.id()][key] = (
+        signature(regions), getattr(key, 'annotation', ''), view.change_count()
+    )
+
+
+def forget_drawn(view: sublime.View) -> None:
+    DRAWN.pop(view.id(), None)
+
+
 @util.assert_on_ui_thread
 def draw_view_region(view: sublime.View, key: RegionKey, regions: list[sublime.Region]) -> None:
     if isinstance(key, Squiggle):
@@ -635,6 +867,8 @@ def draw_view_region(view: sublime.View, key: RegionKey, regions: list[sublime.R
         )
     else:
         view.add_regions(key, regions, key.scope, key.icon, key.flags)
+    DRAW_CALLS['add_regions'] += 1
+    remember_drawn(view, key, regions)
     vid = view.id()
     CURRENTSTORE[vid].add(key)
     EVERSTORE[vid].add(key)
@@ -643,6 +877,8 @@ def draw_view_region(view: sublime.View, key: RegionKey, regions: list[sublime.R
 @util.assert_on_ui_thread
 def erase_view_region(view: sublime.View, key: RegionKey) -> None:
     view.erase_regions(key)
+    DRAW_CALLS['erase_regions'] += 1
+    DRAWN.get(view.id(), {}).pop(key, None)
     CURRENTSTORE[view.id()].discard(key)
 
 
@@ -675,6 +911,9 @@ class ViewListCleanupController(sublime_plugin.EventListener):
         State['quiet_views'].discard(vid)
         State['views_without_phantoms'].discard(vid)
         State['views'].discard(vid)
+        DETAIL_REGIONS.pop(vid, None)
+        OVERVIEW_MEMBERS.pop(vid, None)
+        forget_drawn(view)
 
 
 class RevisitErrorRegions(sublime_plugin.EventListener):
@@ -709,6 +948,10 @@ def revalidate_regions(view: sublime.View) -> None:
     eof = view.size()
     for key in region_keys:
         if isinstance(key, Squiggle):
+            # Aggregated squiggles don't belong to a single error.
+            if key.uid.startswith(OVERVIEW_UID):
+                continue
+
             # We can have keys without any region drawn for example
             # if we loaded the `EVERSTORE`.
             region = head(view.get_regions(key))
@@ -767,16 +1010,28 @@ def maybe_update_error_store(view: sublime.View) -> None:
         if isinstance(key, Squiggle)
     }
 
+    detail_region = DETAIL_REGIONS.get(view.id())
+    # Errors outside of the region we've drawn in detail don't have a key
+    # of their own, we read their regions from the aggregated squiggles.
+    overview_regions = (
+        overview_regions_by_uid(view, region_keys) if detail_region is not None else {}
+    )
     changed = False
     new_errors = []
     regions_to_erase = []
     for error in errors:
         uid = error['uid']
         key = uid_key_map.get(uid, None)
-        if key is None:
+        if key is not None:
+            region = head(view.get_regions(key))
+        elif uid in overview_regions:
+            key, region = overview_regions[uid]
+        else:
+            # Keep errors we've drawn aggregated until the next lint result.
+            if detail_region is not None and not error['region'].intersects(detail_region):
+                new_errors.append(error)
             continue
 
-        region = head(view.get_regions(key))
         if region is None or region == error['region']:
             new_errors.append(error)
             continue
@@ -788,8 +1043,10 @@ def maybe_update_error_store(view: sublime.View) -> None:
             # or: Dangle! Sublime has invalidated our region, it has
             # zero length (and moved to a different line at col 0).
             # It is useless now so we remove the error by not
-            # copying it.
-            regions_to_erase.append(key)
+            # copying it.  (The aggregated squiggles are shared, the
+            # next draw drops the region.)
+            if uid_key_map.get(uid) is key:
+                regions_to_erase.append(key)
             continue
 
         line, start = view.rowcol(region.begin())
@@ -820,6 +1077,8 @@ class IdleViewController(sublime_plugin.EventListener):
             'active_view': active_view,
             'current_sel': get_current_sel(active_view)
         })
+        if active_view.id() in DETAIL_REGIONS:
+            ensure_viewport_polling()
 
         if previous_view and previous_view.id() != active_view.id():
             set_idle(previous_view, True)
@@ -850,6 +1109,8 @@ class IdleViewController(sublime_plugin.EventListener):
         current_sel = get_current_sel(active_view)
         if current_sel != State['current_sel']:
             State.update({'current_sel': current_sel})
+            if active_view.id() in DETAIL_REGIONS:
+                ensure_viewport_polling()
 
             time_to_idle = persist.settings.get('highlights.time_to_idle')
             queue.debounce(
@@ -1049,11 +1310,21 @@ TOOLTIP_TEMPLATE = '''
 QUICK_FIX_HELP = " | Click <span class='icon'>⌦</span> to trigger a quick action"
 
 
-def get_errors_where(filename: str, fn: Callable[[sublime.Region], bool]) -> list[LintError]:
-    return [
-        error for error in persist.file_errors[filename]
-        if fn(error['region'])
-    ]
+def get_errors_where(
+    filename: str,
+    fn: Callable[[sublime.Region], bool],
+    near: sublime.Region | None = None
+) -> list[LintError]:
+    """Return the errors of `filename` whose region satisfies `fn`.
+
+    If given, only errors touching or overlapping `near` are considered.
+    """
+    errors = (
+        persist.file_errors[filename]
+        if near is None
+        else error_index.errors_intersecting(filename, near)
+    )
+    return [error for error in errors if fn(error['region'])]
 
 
 def open_tooltip(view: sublime.View, point: int, line_report: bool = False) -> None:
@@ -1067,10 +1338,10 @@ def open_tooltip(view: sublime.View, point: int, line_report: bool = False) -> N
     if line_report:
         line = view.full_line(point)
         errors = get_errors_where(
-            filename, lambda region: region.intersects(line))
+            filename, lambda region: region.intersects(line), near=line)
     else:
         errors = get_errors_where(
-            filename, lambda region: region.contains(point))
+            filename, lambda region: region.contains(point), near=sublime.Region(point))
 
     if not errors:
         return
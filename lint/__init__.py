@@ -18,6 +18,7 @@ from .base_linter.python_linter import PythonLinter
 from .base_linter.ruby_linter import RubyLinter
 from .base_linter.node_linter import NodeLinter
 from .base_linter.php_linter import ComposerLinter, PhpLinter
+from .base_linter.daemon_linter import DaemonLinter
 
 
 
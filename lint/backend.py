@@ -1,10 +1,10 @@
 from __future__ import annotations
 import sublime
 
-from collections import deque
-from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from collections import OrderedDict, deque
+from concurrent.futures import Future, wait, FIRST_EXCEPTION
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import chain, count
 from functools import lru_cache, partial, wraps
 import hashlib
@@ -15,15 +15,19 @@ import time
 import threading
 import traceback
 
-from . import elect, events, linter as linter_module, persist, queue, style, util
+from . import (
+    disk_cache, elect, events, linter as linter_module, persist, queue, result_cache, scheduler,
+    style, util
+)
 
 from .const import IS_ENABLED_SWITCH
 from .elect import LinterInfo
 from .linter import Linter, ViewContext
 from .persist import LintError
+from .snapshot import Snapshot
 from .util import format_items
 
-from typing import Callable, Iterator, TypeVar
+from typing import Any, Callable, Dict, Iterator, Tuple, TypeVar
 from typing_extensions import ParamSpec, TypeAlias
 
 
@@ -36,6 +40,7 @@ ViewChangedFn = Callable[[], bool]
 FileName = str
 LinterName = str
 Reason = str
+Snapshots = Dict[Tuple[int, int], Snapshot]
 LintResultCallback = Callable[[LinterName, LintResult], None]
 
 
@@ -44,13 +49,39 @@ class LintJob:
     linter_name: LinterName
     ctx: ViewContext
     tasks: list[Task[LintResult]]
+    bid: Bid | None = None
+    priority: int = scheduler.PRIORITY_BACKGROUND
+    max_concurrent: int | None = None
+
+
+class LintJobExecutor(scheduler.PriorityExecutor):
+    def scheduling_hints(self, args: tuple) -> dict[str, Any]:
+        # Jobs are submitted as `submit(run_job, job, sink)`.  A queued job
+        # is superseded by a newer job for the same buffer and linter.
+        if args and isinstance(args[0], LintJob):
+            job = args[0]
+            return {
+                'priority': job.priority,
+                'owner': job.bid,
+                'group': job.linter_name,
+                'limit': job.max_concurrent,
+                'coalesce_key': (job.bid, job.linter_name),
+            }
+        return super().scheduling_hints(args)
+
+
+def get_process_budget() -> int | None:
+    budget = persist.settings.get('max_concurrent_processes')
+    return budget if isinstance(budget, int) and budget > 0 else None
 
 
 logger = logging.getLogger(__name__)
 
 MAX_CONCURRENT_TASKS = multiprocessing.cpu_count() or 1
-orchestrator = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASKS)
-executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_TASKS)
+orchestrator = LintJobExecutor(MAX_CONCURRENT_TASKS, 'SublimeLinterJob')
+executor = scheduler.PriorityExecutor(
+    MAX_CONCURRENT_TASKS, 'SublimeLinterTask', budget=get_process_budget
+)
 
 
 task_count = count(start=1)
@@ -71,6 +102,8 @@ def hit(
     f: Future[bool] = Future()
     bid = view.buffer_id()
 
+    # This is the base delay.  Slow linters get debounced for another while
+    # in `lint` below.
     delay = get_delay() if reason == 'on_modified' else 0.0
     logger.info(
         "Delay linting '{}' for {:.2}s"
@@ -135,6 +168,8 @@ def lint(
     else:
         on_result_ = None
 
+    linter_infos = {linter.name: linter for linter in runnable_linters}
+
     def sink(linter: LinterName, errors: LintResult):
         if view_has_changed():
             return
@@ -142,18 +177,91 @@ def lint(
         if on_result_:
             on_result_(linter, errors)
 
+        results_before_progress.pop((filename, linter), None)
         persist.group_by_filename_and_update(window, filename, reason, linter, errors)
+        disk_cache.store_result(view, linter_infos[linter], errors)
+
+    partial_sink = ProgressSink(window, filename, reason, view_has_changed)
+
+    extra_delays = (
+        {
+            linter.name: get_delay(linter.name, filename) - get_delay()
+            for linter in runnable_linters
+        }
+        if reason == 'on_modified'
+        else {}
+    )
+    immediate_linters = [
+        linter for linter in runnable_linters
+        if extra_delays.get(linter.name, 0.0) < MIN_DEBOUNCE_DELAY
+    ]
+    # An explicit request by the user bypasses the result cache
+    use_cache = reason != 'on_user_request'
+    # All linters share the snapshots of the regions they lint.
+    snapshots: Snapshots = {}
+    futures = [
+        submit_later(
+            linter, extra_delays[linter.name], view, view_has_changed, sink, use_cache, snapshots,
+            partial_sink
+        )
+        for linter in runnable_linters
+        if linter not in immediate_linters
+    ]
+    if immediate_linters:
+        futures.append(form_lint_jobs_and_submit_them(
+            immediate_linters, view, view_has_changed, sink,
+            use_cache=use_cache, snapshots=snapshots, partial_sink=partial_sink
+        ))
 
-    f = form_lint_jobs_and_submit_them(runnable_linters, view, view_has_changed, sink)
     if parent_future:
-        f.add_done_callback(lambda f: parent_future.set_result(True))
+        when_all_done(futures).add_done_callback(lambda f: parent_future.set_result(True))
+
+
+def submit_later(
+    linter: LinterInfo,
+    delay: float,
+    view: sublime.View,
+    view_has_changed: ViewChangedFn,
+    sink: LintResultCallback,
+    use_cache: bool = True,
+    snapshots: Snapshots | None = None,
+    partial_sink: ProgressSink | None = None
+) -> Future[bool]:
+    """Debounce the lint job of a slow linter for another `delay` seconds."""
+    f: Future[bool] = Future()
+    logger.info(
+        "Delay linting '{}' with {} for another {:.2}s"
+        .format(linter.context["short_canonical_filename"], linter.name, delay)
+    )
+
+    def submit():
+        if view_has_changed():
+            f.set_result(False)
+            return
+
+        form_lint_jobs_and_submit_them(
+            [linter], view, view_has_changed, sink,
+            use_cache=use_cache, snapshots=snapshots, partial_sink=partial_sink
+        ).add_done_callback(lambda _: f.set_result(True))
+
+    queue.debounce(
+        submit,
+        delay=delay,
+        key=f"lint.{view.buffer_id()}.{linter.name}",
+        on_cancel=lambda: f.set_result(False)
+    )
+    return f
 
 
 def form_lint_jobs_and_submit_them(
     linters: list[LinterInfo],
     view: sublime.View,
     view_has_changed: ViewChangedFn,
-    sink: LintResultCallback
+    sink: LintResultCallback,
+    priority: int | None = None,
+    use_cache: bool = True,
+    snapshots: Snapshots | None = None,
+    partial_sink: ProgressSink | None = None
 ) -> Future[bool]:
     """Transform [LinterInfo] -> [LintJob] and run them.
 
@@ -164,11 +272,30 @@ def form_lint_jobs_and_submit_them(
     as our data store must see all errors keyed by linter_name at once.  From
     the perspective of the data store each new (combined) result *replaces*
     the previous result.
+
+    All jobs and tasks are scheduled with the given `priority`, which
+    defaults to the priority class of the `view` at this point in time.
+    Tasks look up the result cache first unless `use_cache` is False.
+    The text of the regions is taken from `snapshots`, or added to it.
+    Slow linters may publish partial results to `partial_sink`, see
+    `tasks_per_linter`.
     """
+    if priority is None:
+        priority = scheduler.priority_for_view(view)
+    if snapshots is None:
+        snapshots = {}
+    bid = view.buffer_id()
     lint_jobs = [
-        LintJob(linter.name, linter.context, tasks)
+        LintJob(
+            linter.name, linter.context, tasks, bid, priority,
+            get_max_concurrent(linter)
+        )
         for linter in linters
-        if (tasks := list(tasks_per_linter(view, view_has_changed, linter)))
+        if (tasks := list(
+            tasks_per_linter(
+                view, view_has_changed, linter, use_cache, snapshots, partial_sink
+            )
+        ))
     ]
     warn_excessive_tasks(lint_jobs)
 
@@ -181,6 +308,24 @@ def form_lint_jobs_and_submit_them(
     return when_all_done(futures)
 
 
+def get_max_concurrent(linter: LinterInfo) -> int | None:
+    value = linter.settings.get('max_concurrent')
+    return value if isinstance(value, int) and value > 0 else None
+
+
+def get_scheduler_state() -> dict[str, dict[str, Any]]:
+    """Return the running, queued and rejected jobs and tasks for debugging."""
+    return {
+        'jobs': orchestrator.state(),
+        'tasks': executor.state(),
+    }
+
+
+def get_result_cache_stats() -> dict[str, int]:
+    """Return the hit/miss counters and the size of the result cache."""
+    return result_cache.cache.stats()
+
+
 def when_all_done(futures: list[Future]) -> Future[bool]:
     f: Future[bool] = Future()
     remaining = len(futures)
@@ -202,17 +347,75 @@ def when_all_done(futures: list[Future]) -> Future[bool]:
 def tasks_per_linter(
     view: sublime.View,
     view_has_changed: ViewChangedFn,
-    linter_info: LinterInfo
+    linter_info: LinterInfo,
+    use_cache: bool = True,
+    snapshots: Snapshots | None = None,
+    partial_sink: ProgressSink | None = None
 ) -> Iterator[Task[LintResult]]:
+    # For views with multiple cells, only changed cells actually get linted.
+    cells = (
+        start_cell_results(view.buffer_id(), linter_info.name)
+        if use_cache and len(linter_info.regions) > 1
+        else None
+    )
     for region in linter_info.regions:
         linter = linter_info.klass(view, linter_info.settings)
-        code = view.substr(region)
+        linter.snapshot = snapshot = get_snapshot(view, region, snapshots)
+        code = snapshot.text
         offsets = view.rowcol(region.begin()) + (region.begin(),)
-
-        task = partial(execute_lint_task, linter, code, offsets, view_has_changed)
+        task = (
+            partial(execute_lint_task_cached, linter, code, offsets, view_has_changed, cells)
+            if use_cache
+            else partial(execute_lint_task, linter, code, offsets, view_has_changed)
+        )
+        # The sink expects *all* errors of a linter, which we only know up
+        # front if there is just one region to lint.
+        if partial_sink and len(linter_info.regions) == 1:
+            linter.on_progress = partial(publish_progress, linter, offsets, partial_sink)
+            task = partial(retract_progress_on_abort, linter, partial_sink, task)
         yield partial(modify_thread_name, linter_info, then_run=task)
 
 
+def get_snapshot(
+    view: sublime.View,
+    region: sublime.Region,
+    snapshots: Snapshots | None = None
+) -> Snapshot:
+    if snapshots is None:
+        return Snapshot(view.substr(region))
+
+    key = (region.a, region.b)
+    try:
+        return snapshots[key]
+    except KeyError:
+        snapshots[key] = snapshot = Snapshot(view.substr(region))
+        return snapshot
+
+
+@dataclass
+class CellResults:
+    """The raw errors per cell (keyed by content) of a buffer and linter."""
+    previous: dict[result_cache.CacheKey, LintResult]
+    current: dict[result_cache.CacheKey, LintResult] = field(default_factory=dict)
+
+
+cell_results: dict[tuple[Bid, LinterName], CellResults] = {}
+
+
+def start_cell_results(bid: Bid, linter_name: LinterName) -> CellResults:
+    # We only carry over the cells of the last lint job, so this doesn't grow
+    # beyond the number of cells in the view.
+    key = (bid, linter_name)
+    last = cell_results.get(key)
+    cell_results[key] = cells = CellResults(last.current if last else {})
+    return cells
+
+
+def discard_cell_results(bid: Bid) -> None:
+    for key in [key for key in cell_results if key[0] == bid]:
+        cell_results.pop(key, None)
+
+
 def modify_thread_name(linter_info: LinterInfo, then_run: Callable[[], T]) -> T:
     original_name = threading.current_thread().name
     # We 'name' our threads, for logging purposes.
@@ -235,14 +438,56 @@ def make_good_task_name(linter: LinterInfo) -> str:
     )
 
 
+def execute_lint_task_cached(
+    linter: Linter,
+    code: str,
+    offsets: tuple,
+    view_has_changed: ViewChangedFn,
+    cells: CellResults | None = None
+) -> LintResult:
+    try:
+        key = result_cache.make_key(linter, code)
+    except Exception:
+        logger.exception('Computing the cache key failed:\n', extra={'demote': True})
+        key = None
+
+    if key is not None:
+        if cells and key in cells.previous:
+            errors: LintResult | None = result_cache.copy_errors(cells.previous[key])
+        else:
+            errors = result_cache.cache.get(key)
+        if errors is not None:
+            logger.info(
+                "{}: reuse cached result for '{}'"
+                .format(linter.name, util.short_canonical_filename(linter.view))
+            )
+            if cells:
+                cells.current[key] = result_cache.copy_errors(errors)
+            finalize_errors(linter, errors, offsets)
+            return errors
+
+    return execute_lint_task(
+        linter, code, offsets, view_has_changed,
+        cache_key=key, raw_results=cells.current if cells else None
+    )
+
+
 def execute_lint_task(
     linter: Linter,
     code: str,
     offsets: tuple,
-    view_has_changed: ViewChangedFn
+    view_has_changed: ViewChangedFn,
+    cache_key: result_cache.CacheKey | None = None,
+    raw_results: dict[result_cache.CacheKey, LintResult] | None = None
 ) -> LintResult:
     try:
-        errors = linter.lint(code, view_has_changed)
+        with remember_runtime(linter):
+            errors = linter.lint(code, view_has_changed)
+        if cache_key is not None:
+            # Store the errors *before* they get finalized for this region
+            result_cache.cache.put(cache_key, util.canonical_filename(linter.view), errors)
+            if raw_results is not None:
+                raw_results[cache_key] = result_cache.copy_errors(errors)
         finalize_errors(linter, errors, offsets)
         return errors
     except linter_module.TransientError:
@@ -258,6 +503,84 @@ def execute_lint_task(
         return []  # Empty list here to clear old errors
 
 
+# The last final result of a linter per file, kept aside while its partial
+# results are shown.  Only accessed on Sublime's worker thread.
+results_before_progress: dict[tuple[FileName, LinterName], LintResult] = {}
+
+
+class ProgressSink:
+    """Show the partial results of the linters of one lint of a view.
+
+    Partial results are only shown, they neither go to the callers nor into
+    the caches.  If a run aborts, e.g. on a timeout, `retract` puts the
+    previous final result back.  Must be called on Sublime's worker thread.
+    """
+
+    def __init__(
+        self,
+        window: sublime.Window,
+        filename: FileName,
+        reason: Reason,
+        view_has_changed: ViewChangedFn
+    ) -> None:
+        self.window = window
+        self.filename = filename
+        self.reason = reason
+        self.view_has_changed = view_has_changed
+
+    def __call__(self, linter: LinterName, errors: LintResult) -> None:
+        if self.view_has_changed():
+            return
+
+        key = (self.filename, linter)
+        if key not in results_before_progress:
+            results_before_progress[key] = current_errors(self.filename, linter)
+        persist.group_by_filename_and_update(
+            self.window, self.filename, self.reason, linter, errors)
+
+    def retract(self, linter: LinterName) -> None:
+        try:
+            errors = results_before_progress.pop((self.filename, linter))
+        except KeyError:
+            return
+
+        persist.group_by_filename_and_update(
+            self.window, self.filename, self.reason, linter, errors)
+
+
+def current_errors(filename: FileName, linter: LinterName) -> LintResult:
+    """Return the errors `linter` reported for `filename`, including other files."""
+    affected: dict[LinterName, set[FileName]] = persist.affected_filenames_per_filename.get(filename, {})
+    other_filenames = affected.get(linter, set())
+    return [
+        error
+        for filename_ in [filename, *sorted(other_filenames)]
+        for error in persist.file_errors.by_linter(filename_).get(linter, [])
+    ]
+
+
+def publish_progress(
+    linter: Linter,
+    offsets: tuple,
+    sink: ProgressSink,
+    errors: LintResult
+) -> None:
+    # The linter keeps collecting into these errors, and we finalize in place.
+    errors = result_cache.copy_errors(errors)
+    finalize_errors(linter, errors, offsets)
+    sublime.set_timeout_async(lambda: sink(linter.name, errors))
+
+
+def retract_progress_on_abort(linter: Linter, sink: ProgressSink, task: Task[T]) -> T:
+    # Without a final result, the partial results would stay until the next
+    # lint.  As there is only one task, its abort is the abort of the job.
+    try:
+        return task()
+    except linter_module.TransientError:
+        sublime.set_timeout_async(lambda: sink.retract(linter.name))
+        raise
+
+
 def finalize_errors(
     linter: Linter,
     errors: list[LintError],
@@ -269,7 +592,9 @@ def finalize_errors(
     view_filename = util.canonical_filename(view)
     line_offset, col_offset, pt_offset = offsets
 
-    for error in errors:
+    for i, error in enumerate(errors):
+        # Plugins may still return plain dicts
+        errors[i] = error = persist.make_error_record(error)
         belongs_to_main_file = (
             os.path.normcase(error['filename']) == os.path.normcase(view_filename)
         )
@@ -309,12 +634,16 @@ PROPERTIES_FOR_UID = (
 
 
 def make_error_uid(error: LintError) -> str:
-    return hashlib.sha256(
+    # The uid only needs to be unique among the errors of one file and
+    # linter, so 64 bits are plenty.  It is part of the region keys, the
+    # shorter the better.
+    return hashlib.blake2b(
         ''.join(
             str(error[k])  # type: ignore
             for k in PROPERTIES_FOR_UID
         )
-        .encode('utf-8')
+        .encode('utf-8'),
+        digest_size=8
     ).hexdigest()
 
 
@@ -354,9 +683,16 @@ def catch_but_print_all_exceptions(fn: Callable[P, T]) -> Callable[P, T]:
 
 
 def run_job(job: LintJob, sink: LintResultCallback) -> None:
-    with broadcast_lint_runtime(job), remember_runtime(job):
+    with broadcast_lint_runtime(job):
         try:
-            results = run_concurrently(job.tasks, executor=executor)
+            results = run_concurrently(
+                job.tasks,
+                executor=executor,
+                priority=job.priority,
+                owner=job.bid,
+                group=job.linter_name,
+                limit=job.max_concurrent,
+            )
         except linter_module.TransientError:
             return  # ABORT
         except Exception:
@@ -371,8 +707,15 @@ def run_job(job: LintJob, sink: LintResultCallback) -> None:
     sublime.set_timeout_async(lambda: sink(job.linter_name, errors))
 
 
-def run_concurrently(tasks: list[Task[T]], executor: ThreadPoolExecutor) -> list[T]:
-    work = [executor.submit(task) for task in tasks]
+def run_concurrently(
+    tasks: list[Task[T]],
+    executor: scheduler.PriorityExecutor,
+    priority: int = scheduler.PRIORITY_BACKGROUND,
+    owner: scheduler.Owner = None,
+    group: LinterName | None = None,
+    limit: int | None = None
+) -> list[T]:
+    work = [executor.schedule(task, priority, owner, group, limit) for task in tasks]
     done, not_done = wait(work, return_when=FIRST_EXCEPTION)
 
     for future in not_done:
@@ -428,38 +771,71 @@ def kill_active_popen_calls(bid):
             ', '.join('<pid {}>'.format(proc.pid) for proc in procs)
         ))
     for proc in procs:
-        proc.terminate()
         setattr(proc, 'friendly_terminated', True)
+        util.terminate_process(proc)
 
 
 global_lock = threading.RLock()
-elapsed_runtimes = deque([0.6] * 3, maxlen=10)
+# Runtime statistics per (linter, file), and per linter as a fallback for
+# files we haven't seen yet.
+elapsed_runtimes: OrderedDict[tuple[LinterName, FileName], deque[float]] = OrderedDict()
+linter_runtimes: dict[LinterName, deque[float]] = {}
+MAX_RUNTIME_SAMPLES = 10
+MAX_TRACKED_FILES = 500
 MIN_DEBOUNCE_DELAY = 0.0005
 MAX_AUTOMATIC_DELAY = 2.0
 
 
-def get_delay() -> float:
-    """Return the delay between a lint request and when it will be processed."""
-    runtimes = sorted(elapsed_runtimes)
+def get_delay(linter_name: LinterName | None = None, filename: FileName | None = None) -> float:
+    """Return the delay between a lint request and when it will be processed.
+
+    Without arguments, return the base delay as set by the user.  For a
+    given linter, the delay adapts to the median runtime of that linter on
+    `filename`, or on any file if we don't know that file yet.
+    """
+    base_delay = max(MIN_DEBOUNCE_DELAY, float(persist.settings.get('delay')))
+    if linter_name is None:
+        return base_delay
+
+    with global_lock:
+        samples = (
+            elapsed_runtimes.get((linter_name, filename or ''))
+            or linter_runtimes.get(linter_name)
+        )
+        runtimes = sorted(samples) if samples else []
+    if not runtimes:
+        return base_delay
+
     middle = runtimes[len(runtimes) // 2]
-    return max(
-        max(MIN_DEBOUNCE_DELAY, float(persist.settings.get('delay'))),
-        min(MAX_AUTOMATIC_DELAY, middle / 2)
-    )
+    return max(base_delay, min(MAX_AUTOMATIC_DELAY, middle / 2))
 
 
 @contextmanager
-def remember_runtime(job: LintJob) -> Iterator[None]:
+def remember_runtime(linter: Linter) -> Iterator[None]:
+    """Record how long the linter process takes.
+
+    Only runs which complete count, t.i. not the ones which raise, e.g.
+    because they got aborted.  Cached results never get here.
+    """
     start_time = time.perf_counter()
     yield
     end_time = time.perf_counter()
     runtime = end_time - start_time
+    key = (linter.name, linter.context["canonical_filename"])
     with global_lock:
-        elapsed_runtimes.append(runtime)
+        if key not in elapsed_runtimes:
+            elapsed_runtimes[key] = deque(maxlen=MAX_RUNTIME_SAMPLES)
+            if len(elapsed_runtimes) > MAX_TRACKED_FILES:
+                elapsed_runtimes.popitem(last=False)
+        elapsed_runtimes.move_to_end(key)
+        elapsed_runtimes[key].append(runtime)
+        linter_runtimes.setdefault(
+            linter.name, deque(maxlen=MAX_RUNTIME_SAMPLES)
+        ).append(runtime)
 
     logger.info(
         "Linting '{}' with {} took {:.2f}s"
-        .format(job.ctx["short_canonical_filename"], job.linter_name, runtime)
+        .format(linter.context["short_canonical_filename"], linter.name, runtime)
     )
 
 
@@ -0,0 +1,339 @@
+"""This module exports the DaemonLinter subclass of Linter.
+
+A `DaemonLinter` does not spawn a new process for every lint.  Instead it
+keeps a worker process alive per (project root, command) and sends it
+requests over stdin.  The protocol is line-delimited JSON, one object per
+line, in both directions:
+
+  request:   {"id": 1, "cwd": "/project", "filename": "/project/a.js",
+              "code": "..."}
+  response:  {"id": 1, "stdout": "...", "stderr": "...", "returncode": 0}
+             {"id": 1, "error": "Something went wrong"}
+
+`code` is `null` for linters which lint the file on disk
+(`tempfile_suffix = '-'`).  Subclasses can add more keys to the request by
+overriding `make_request`.  The output is then parsed as usual by
+`parse_output`, so a daemon linter still defines its `regex` etc.
+
+Workers which haven't been used for `idle_timeout` seconds are shut down.
+If a worker crashes, it is restarted, but only a limited number of times
+in a row.
+"""
+from __future__ import annotations
+from concurrent.futures import Future, TimeoutError
+from itertools import count
+import json
+import logging
+import subprocess
+import threading
+import time
+
+from .. import linter, util
+
+from typing import Any, Hashable, Optional, Union
+
+
+DaemonKey = Hashable
+
+# Restart a crashed daemon at most this many times within `RESTART_WINDOW`
+MAX_RESTARTS = 3
+RESTART_WINDOW = 60.0
+REAP_INTERVAL = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonCrashed(Exception):
+    pass
+
+
+class DaemonWorker:
+    """A long-running process which answers lint requests."""
+
+    def __init__(
+        self,
+        cmd: list[str],
+        cwd: Optional[str] = None,
+        env: Optional[Any] = None,
+        idle_timeout: float = 300.0
+    ) -> None:
+        self.cmd = cmd
+        self.idle_timeout = idle_timeout
+        self.last_used = time.monotonic()
+        self._ids = count(1)
+        self._pending: dict[int, Future[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        # Writing to stdin can block until the daemon reads.  Never do that
+        # while holding `_lock`, which the reader needs to hand out the
+        # responses; the daemon would block on its full stdout.
+        self._write_lock = threading.Lock()
+        self.proc = subprocess.Popen(
+            cmd, env=env, cwd=cwd,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            startupinfo=util.create_startupinfo(),
+            creationflags=util.get_creationflags(),
+            start_new_session=util.start_new_session()
+        )
+        logger.info("Started daemon <pid {}>: {}".format(self.proc.pid, ' '.join(cmd)))
+        for target in (self._read_responses, self._read_stderr):
+            threading.Thread(
+                target=target,
+                name='SublimeLinterDaemon|{}'.format(self.proc.pid),
+                daemon=True
+            ).start()
+
+    def is_alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def is_idle(self, now: float) -> bool:
+        with self._lock:
+            return not self._pending and now - self.last_used > self.idle_timeout
+
+    def request(self, payload: dict[str, Any], timeout: Optional[float] = None) -> dict[str, Any]:
+        f: Future[dict[str, Any]] = Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = f
+            self.last_used = time.monotonic()
+
+        line = json.dumps(dict(payload, id=request_id)) + '\n'
+        try:
+            with self._write_lock:
+                assert self.proc.stdin
+                self.proc.stdin.write(line.encode('utf8'))
+                self.proc.stdin.flush()
+        except (OSError, ValueError) as exc:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise DaemonCrashed(str(exc))
+
+        try:
+            return f.result(timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+                self.last_used = time.monotonic()
+
+    def stop(self) -> None:
+        logger.info("Stopping daemon <pid {}>".format(self.proc.pid))
+        # Signal first, a concurrent write blocks `close()` until it fails.
+        util.terminate_process(self.proc)
+        try:
+            assert self.proc.stdin
+            self.proc.stdin.close()
+        except Exception:
+            pass
+        self._fail_pending('daemon stopped')
+
+    def _read_responses(self) -> None:
+        assert self.proc.stdout
+        for line in self.proc.stdout:
+            try:
+                response = json.loads(line.decode('utf8'))
+                request_id = response['id']
+            except Exception:
+                logger.warning(
+                    "Daemon <pid {}> sent garbage: {!r}".format(self.proc.pid, line))
+                continue
+
+            with self._lock:
+                f = self._pending.pop(request_id, None)
+            if f and not f.done():
+                f.set_result(response)
+
+        self._fail_pending('daemon exited with {}'.format(self.proc.wait()))
+
+    def _read_stderr(self) -> None:
+        assert self.proc.stderr
+        for line in self.proc.stderr:
+            logger.info("Daemon <pid {}>: {}".format(
+                self.proc.pid, util.decode(line).rstrip()))
+
+    def _fail_pending(self, reason: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for f in pending.values():
+            if not f.done():
+                f.set_exception(DaemonCrashed(reason))
+
+
+workers: dict[DaemonKey, DaemonWorker] = {}
+restarts: dict[DaemonKey, list[float]] = {}
+workers_lock = threading.Lock()
+_reaper: Optional[threading.Timer] = None
+
+
+def get_worker(
+    key: DaemonKey,
+    cmd: list[str],
+    cwd: Optional[str] = None,
+    env: Optional[Any] = None,
+    idle_timeout: float = 300.0
+) -> DaemonWorker:
+    """Return the running worker for `key`, or start a new one."""
+    with workers_lock:
+        worker = workers.get(key)
+        if worker and worker.is_alive():
+            return worker
+
+        if worker:
+            now = time.monotonic()
+            recent = [t for t in restarts.get(key, []) if now - t < RESTART_WINDOW]
+            if len(recent) >= MAX_RESTARTS:
+                raise DaemonCrashed(
+                    "daemon crashed {} times within {:.0f}s".format(len(recent), RESTART_WINDOW))
+            restarts[key] = recent + [now]
+
+        workers[key] = worker = DaemonWorker(cmd, cwd, env, idle_timeout)
+        _ensure_reaper()
+        return worker
+
+
+def discard_worker(key: DaemonKey, worker: DaemonWorker) -> None:
+    with workers_lock:
+        if workers.get(key) is worker:
+            del workers[key]
+    worker.stop()
+
+
+def reap_idle_workers(now: Optional[float] = None) -> None:
+    if now is None:
+        now = time.monotonic()
+    with workers_lock:
+        idle = [
+            (key, worker) for key, worker in workers.items()
+            if worker.is_idle(now) or not worker.is_alive()
+        ]
+        for key, _ in idle:
+            del workers[key]
+    for _, worker in idle:
+        worker.stop()
+
+
+def shutdown_all_workers() -> None:
+    global _reaper
+    with workers_lock:
+        all_workers = list(workers.values())
+        workers.clear()
+        restarts.clear()
+        if _reaper:
+            _reaper.cancel()
+            _reaper = None
+    for worker in all_workers:
+        worker.stop()
+
+
+def _ensure_reaper() -> None:
+    # Must be called with the `workers_lock` held.
+    global _reaper
+    if _reaper:
+        return
+
+    def reap():
+        global _reaper
+        reap_idle_workers()
+        with workers_lock:
+            _reaper = None
+            if workers:
+                _ensure_reaper()
+
+    _reaper = threading.Timer(REAP_INTERVAL, reap)
+    _reaper.daemon = True
+    _reaper.start()
+
+
+class _DaemonProcess:
+    # Stand-in for the `Popen` object `util.popen_output` wants to see
+    def __init__(self, pid: int, returncode: int) -> None:
+        self.pid = pid
+        self.returncode = returncode
+
+
+class DaemonLinter(linter.Linter):
+    """
+    This Linter subclass provides support for linters which stay resident.
+
+    The `cmd` of a `DaemonLinter` is the command to *start* the daemon.  It
+    is resolved as usual, t.i. the `executable` and `args` settings apply.
+    The actual lint requests are then sent to the running daemon.  See the
+    module docstring for the protocol.
+    """
+    __abstract__ = True
+
+    # Shut down a daemon which hasn't been used for that many seconds
+    idle_timeout: float = 300.0
+    # Give up waiting for the answer of a daemon after that many seconds
+    request_timeout: float = 30.0
+
+    def run(self, cmd: Union[list[str], None], code: str) -> Union[util.popen_output, str]:
+        assert cmd is not None
+
+        self.context['file_on_disk'] = self.filename
+        daemon_cmd: list[str] = linter.substitute_variables(self.context, cmd)
+        request = self.make_request(None if self.tempfile_suffix == '-' else code)
+
+        # A crashed daemon is restarted once per lint
+        for attempt in (1, 2):
+            key = self.get_daemon_key(daemon_cmd)
+            try:
+                worker = get_worker(
+                    key, daemon_cmd, self.get_working_dir(), self.get_environment(), self.idle_timeout)
+            except DaemonCrashed as exc:
+                self.logger.error("{}: {}".format(self.name, exc))
+                self.notify_failure()
+                raise linter.PermanentError(str(exc))
+            except Exception as exc:
+                self.logger.error(linter.make_nice_log_message(
+                    '  Starting the daemon failed\n\n  {}'.format(str(exc)),
+                    daemon_cmd, False, self.get_working_dir(), self.view))
+                self.notify_failure()
+                raise linter.PermanentError("daemon could not be started")
+
+            try:
+                response = worker.request(request, self.request_timeout)
+            except TimeoutError:
+                self.logger.warning(
+                    "{}: daemon did not answer within {}s.  Restarting it."
+                    .format(self.name, self.request_timeout))
+                discard_worker(key, worker)
+                raise linter.TransientError('daemon timed out')
+            except DaemonCrashed as exc:
+                self.logger.warning("{}: daemon crashed: {}".format(self.name, exc))
+                if attempt == 2:
+                    self.notify_failure()
+                    raise linter.PermanentError('daemon crashed')
+                continue
+
+            if 'error' in response:
+                self.logger.error("{}: {}".format(self.name, response['error']))
+                self.notify_failure()
+                raise linter.PermanentError('daemon returned an error')
+
+            return self.make_output(worker, response)
+
+        raise AssertionError('unreachable')  # pragma: no cover
+
+    def get_daemon_key(self, cmd: list[str]) -> DaemonKey:
+        """Return the key under which a daemon can be shared."""
+        return (
+            self.name,
+            self.context.get('project_root') or self.get_working_dir(),
+            tuple(cmd),
+        )
+
+    def make_request(self, code: Optional[str]) -> dict[str, Any]:
+        """Return the payload of a lint request."""
+        return {
+            'cwd': self.get_working_dir(),
+            'filename': self.filename,
+            'code': code,
+        }
+
+    def make_output(self, worker: DaemonWorker, response: dict[str, Any]) -> util.popen_output:
+        stdout = response.get('stdout') or ''
+        stderr = response.get('stderr') or ''
+        return util.popen_output(
+            _DaemonProcess(worker.proc.pid, response.get('returncode', 0)),
+            stdout.encode('utf8') if self.error_stream & util.STREAM_STDOUT else None,
+            stderr.encode('utf8') if self.error_stream & util.STREAM_STDERR else None,
+        )
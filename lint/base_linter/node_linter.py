@@ -1,16 +1,19 @@
 """This module exports the NodeLinter subclass of Linter."""
 from __future__ import annotations
 
+from collections import OrderedDict
 from itertools import chain
 import os
 import shutil
+import threading
+import time
 
-from .. import linter, util
+from .. import discovery, linter, util
 # Compat: `read_json_file` may be used by plugins. Check `eslint` and
 # `xo` for example.
 from ..util import read_json_file
 
-from typing import Any, Iterator, Optional, Union
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Union
 
 
 def smart_paths_upwards(start_dir: str) -> Iterator[str]:
@@ -33,10 +36,90 @@ def is_yarn_project(path: str, manifest: dict[str, Any]) -> bool:
         return name == 'yarn' or name == '@yarnpkg/berry'
 
     yarn_files = ['yarn.lock', '.yarnrc.yml', '.yarnrc']
-    if any(os.path.exists(os.path.join(path, file)) for file in yarn_files):
+    if any(discovery.exists(os.path.join(path, file)) for file in yarn_files):
         return True
 
-    return os.path.exists(os.path.join(path, 'node_modules', '.yarn-integrity'))
+    return discovery.exists(os.path.join(path, 'node_modules', '.yarn-integrity'))
+
+
+class Resolution(NamedTuple):
+    executable: str | list[str] | None
+    project_root: str | None
+    paths: list[str]
+    stamps: list[tuple[str, Optional[int]]]
+    binaries: list[tuple[str, Optional[str]]]
+    checked_at: float
+
+
+# We remember where we found the executable of a linter, per start dir.
+# A resolution only depends on the directories we walked, their
+# 'package.json' and their 'node_modules/.bin', so we only need to check
+# their mtimes to know if it is still valid.  If it runs a script with
+# `node` or `yarn`, we also check that we still find the same binary.
+resolutions: OrderedDict[tuple[str, str], Resolution] = OrderedDict()
+resolutions_lock = threading.Lock()
+MAX_RESOLUTIONS = 1024
+
+
+def get_fresh_resolution(
+    key: tuple[str, str],
+    which_binary: Callable[[str], Optional[str]]
+) -> Resolution | None:
+    with resolutions_lock:
+        resolution = resolutions.get(key)
+    if resolution is None:
+        return None
+
+    now = time.monotonic()
+    if now - resolution.checked_at < discovery.RECHECK_INTERVAL:
+        return resolution
+
+    if (
+        stamp_paths(resolution.paths) != resolution.stamps
+        or any(which_binary(name) != binary for name, binary in resolution.binaries)
+    ):
+        return None
+
+    store_resolution(key, resolution._replace(checked_at=now))
+    return resolution
+
+
+def store_resolution(key: tuple[str, str], resolution: Resolution) -> None:
+    with resolutions_lock:
+        resolutions[key] = resolution
+        resolutions.move_to_end(key)
+        while len(resolutions) > MAX_RESOLUTIONS:
+            resolutions.popitem(last=False)
+
+
+def clear_resolutions() -> None:
+    with resolutions_lock:
+        resolutions.clear()
+
+
+def record_paths(paths: Iterator[str], walked: list[str]) -> Iterator[str]:
+    for path in paths:
+        walked.append(path)
+        yield path
+
+
+def stamp_paths(paths: list[str]) -> list[tuple[str, Optional[int]]]:
+    return [
+        (filename, get_mtime(filename))
+        for path in paths
+        for filename in (
+            path,
+            os.path.join(path, 'package.json'),
+            os.path.join(path, 'node_modules', '.bin'),
+        )
+    ]
+
+
+def get_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
 
 class NodeLinter(linter.Linter):
@@ -98,15 +181,48 @@ class NodeLinter(linter.Linter):
         )
 
     def find_local_executable(self, start_dir: str, npm_name: str) -> str | list[str] | None:
-        paths = smart_paths_upwards(start_dir)
+        key = (start_dir, npm_name)
+        resolution = get_fresh_resolution(key, self._which_binary)
+        if resolution:
+            if resolution.project_root:
+                self.context['project_root'] = resolution.project_root
+            return resolution.executable
+
+        walked: list[str] = []
+        binaries: list[tuple[str, Optional[str]]] = []
+        project_root_before = self.context.get('project_root')
+        executable = self._find_local_executable(
+            record_paths(smart_paths_upwards(start_dir), walked), npm_name, binaries)
+        project_root = self.context.get('project_root')
+        store_resolution(key, Resolution(
+            executable,
+            project_root if project_root != project_root_before else None,
+            walked,
+            stamp_paths(walked),
+            binaries,
+            time.monotonic()
+        ))
+        return executable
+
+    def _which_binary(self, name: str) -> str | None:
+        # Plugins may customize how we find `node`, Yarn is always taken
+        # from the PATH.
+        return self.which(name) if name == 'node' else shutil.which(name)
+
+    def _find_local_executable(
+        self,
+        paths: Iterator[str],
+        npm_name: str,
+        binaries: list[tuple[str, Optional[str]]]
+    ) -> str | list[str] | None:
         for path in paths:
-            executable = shutil.which(npm_name, path=os.path.join(path, 'node_modules', '.bin'))
+            executable = discovery.which(npm_name, os.path.join(path, 'node_modules', '.bin'))
             if executable:
                 self.context['project_root'] = path
                 return executable
 
             manifest_file = os.path.join(path, 'package.json')
-            if os.path.exists(manifest_file):
+            if discovery.exists(manifest_file):
                 try:
                     manifest = read_json_file(manifest_file)
                 except Exception as err:
@@ -124,7 +240,7 @@ class NodeLinter(linter.Linter):
                 except (KeyError, TypeError):
                     pass
                 else:
-                    if not os.path.exists(os.path.join(path, 'node_modules', '.bin')):
+                    if not discovery.exists(os.path.join(path, 'node_modules', '.bin')):
                         self.logger.warning(
                             "We want to execute 'node {}'; but you should first "
                             "'npm install' this project.".format(script)
@@ -132,7 +248,8 @@ class NodeLinter(linter.Linter):
                         self.notify_failure()
                         raise linter.PermanentError()
 
-                    node_binary = self.which('node')
+                    node_binary = self._which_binary('node')
+                    binaries.append(('node', node_binary))
                     if node_binary:
                         self.context['project_root'] = path
                         return [node_binary, script]
@@ -152,7 +269,8 @@ class NodeLinter(linter.Linter):
                     # Perhaps this is a Yarn project?
                     if is_yarn_project(path, manifest):
                         # https://yarnpkg.com/advanced/rulebook#user-scripts-shouldnt-hardcode-the-node_modulesbin-folder
-                        yarn_binary = shutil.which('yarn')
+                        yarn_binary = self._which_binary('yarn')
+                        binaries.append(('yarn', yarn_binary))
                         if yarn_binary:
                             return [yarn_binary, 'run', '--silent', npm_name]
 
@@ -166,8 +284,8 @@ class NodeLinter(linter.Linter):
                     # Since we've found a valid 'package.json' as our 'project_root'
                     # exhaust outer loop looking just for installations.
                     for path_ in paths:
-                        executable = shutil.which(
-                            npm_name, path=os.path.join(path_, 'node_modules', '.bin')
+                        executable = discovery.which(
+                            npm_name, os.path.join(path_, 'node_modules', '.bin')
                         )
                         if executable:
                             return executable
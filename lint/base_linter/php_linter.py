@@ -2,9 +2,8 @@
 from __future__ import annotations
 
 import os
-import shutil
 
-from .. import linter, util
+from .. import discovery, linter, util
 from ..util import read_json_file
 
 
@@ -76,12 +75,12 @@ class PhpLinter(linter.Linter):
         look in vendor/bin for that binary.
         """
         for path in util.paths_upwards_until_home(start_dir):
-            if executable := shutil.which(cmd, path=os.path.join(path, 'vendor', 'bin')):
+            if executable := discovery.which(cmd, os.path.join(path, 'vendor', 'bin')):
                 self.context['project_root'] = path
                 return executable
 
             manifest_file = os.path.join(path, 'composer.json')
-            if os.path.exists(manifest_file):
+            if discovery.exists(manifest_file):
                 try:
                     manifest = read_json_file(manifest_file)
                 except Exception as err:
@@ -1,31 +1,55 @@
 """This module exports the PythonLinter subclass of Linter."""
 from __future__ import annotations
 
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
 import os
 import re
-import shutil
+import tempfile
+import threading
+import time
 
 import sublime
 
-from .. import linter, util
+from .. import discovery, linter, result_cache, spawn_cache, util
 
-from typing import Optional
+from typing import Any, Optional
 
 
 POSIX = sublime.platform() in ('osx', 'linux')
 ON_WINDOWS = sublime.platform() == 'windows'
 BIN = 'bin' if POSIX else 'Scripts'
 VIRTUAL_ENV_MARKERS = ('venv', '.env', '.venv')
+# (marker file, command printing the virtualenv, files the answer depends on)
+VENV_UTILITIES: tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...] = (
+    ('poetry.lock', ('poetry', 'env', 'info', '-p'), ('poetry.lock', 'pyproject.toml')),
+    ('Pipfile', ('pipenv', '--venv'), ('Pipfile', 'Pipfile.lock')),
+)
+# Ask poetry/pipenv again after that many seconds, e.g. after `poetry env use`,
+# when the user switches to or saves a file of the project
+VENV_REFRESH_INTERVAL = 60.0
+VENVS_STATE_FILE = 'python_venvs.json'
+INTERPRETERS_STATE_FILE = 'python_interpreters.json'
 ROOT_MARKERS = ("setup.cfg", "pyproject.toml", "tox.ini", ".git", ".hg", )
 
+logger = logging.getLogger(__name__)
+# Asking poetry or pipenv, or probing interpreters, takes up to seconds, so
+# we don't want to do it in a lint task but on this thread.
+background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='SublimeLinterPython')
+venv_lock = threading.Lock()
+pending_venvs: set[str] = set()
+interpreter_lock = threading.Lock()
+# Interpreters whose identity we checked since the last venv refresh event
+validated_interpreters: set[str] = set()
+
 
 class SimplePath(str):
     def append(self, *parts: str) -> SimplePath:
         return SimplePath(os.path.join(self, *parts))
 
     def exists(self) -> bool:
-        return os.path.exists(self)
+        return discovery.exists(self)
 
 
 class PythonLinter(linter.Linter):
@@ -181,26 +205,19 @@ class PythonLinter(linter.Linter):
         for path in paths:
             path_to = SimplePath(path).append
             for candidate in VIRTUAL_ENV_MARKERS:
-                if os.path.isdir(path_to(candidate, BIN)):
+                if discovery.isdir(path_to(candidate, BIN)):
                     return root_dir or path, path_to(candidate)
 
-            poetrylock = path_to('poetry.lock')
-            if poetrylock.exists():
-                venv = ask_utility_for_venv(path, ('poetry', 'env', 'info', '-p'))
-                if not venv:
-                    self.logger.info(
-                        "virtualenv for '{}' not created yet".format(poetrylock)
-                    )
-                return root_dir or path, venv
-
-            pipfile = path_to('Pipfile')
-            if pipfile.exists():
-                venv = ask_utility_for_venv(path, ('pipenv', '--venv'))
-                if not venv:
-                    self.logger.info(
-                        "virtualenv for '{}' not created yet".format(pipfile)
-                    )
-                return root_dir or path, venv
+            for marker, cmd, _ in VENV_UTILITIES:
+                marker_file = path_to(marker)
+                if marker_file.exists():
+                    venv = ask_utility_for_venv(path, cmd)
+                    if not venv:
+                        self.logger.info(
+                            "virtualenv for '{}' not created yet or not known yet"
+                            .format(marker_file)
+                        )
+                    return root_dir or path, venv
 
             if not root_dir and any(
                 path_to(candidate).exists()
@@ -225,27 +242,189 @@ def find_python_version(version: str) -> str | None:
 def find_script_by_python_env(python_env_path: str, script: str) -> str | None:
     """Return full path to a script, given a python environment base dir."""
     full_path = os.path.join(python_env_path, BIN)
-    return shutil.which(script, path=full_path)
+    return discovery.which(script, full_path)
+
 
+def ask_utility_for_venv(
+    cwd: str,
+    cmd: tuple[str, ...],
+    max_age: float | None = None
+) -> str | None:
+    """Return the last known virtualenv `cmd` reported for `cwd`.
 
-def ask_utility_for_venv(cwd: str, cmd: tuple[str, ...]) -> str | None:
+    Never blocks.  If we don't know the answer yet, or the lock files
+    changed, or we asked more than `max_age` seconds ago, we ask again in
+    the background.
+    """
+    key = venv_key(cwd, cmd)
+    with venv_lock:
+        entry = known_venvs().get(key)
+    if (
+        entry is None
+        or entry['stamp'] != venv_stamp(cwd, cmd)
+        or (max_age is not None and time.time() - entry['checked'] > max_age)
+    ):
+        refresh_venv(cwd, cmd)
+    return entry['venv'] if entry else None
+
+
+def prefetch_venv(filename: str) -> None:
+    """Resolve the virtualenv of a poetry or pipenv project in the background.
+
+    Called when the user activates or saves a file, and unlike a lint also
+    asks again if the last answer is older than `VENV_REFRESH_INTERVAL`.
+    """
+    invalidate_interpreters()
+    for path in util.paths_upwards_until_home(os.path.dirname(filename)):
+        if any(
+            discovery.isdir(os.path.join(path, candidate, BIN))
+            for candidate in VIRTUAL_ENV_MARKERS
+        ):
+            return
+
+        for marker, cmd, _ in VENV_UTILITIES:
+            if discovery.exists(os.path.join(path, marker)):
+                ask_utility_for_venv(path, cmd, max_age=VENV_REFRESH_INTERVAL)
+                return
+
+
+def refresh_venv(cwd: str, cmd: tuple[str, ...]) -> None:
+    key = venv_key(cwd, cmd)
+    with venv_lock:
+        if key in pending_venvs:
+            return
+        pending_venvs.add(key)
+    background_executor.submit(_refresh_venv, cwd, cmd)
+
+
+def _refresh_venv(cwd: str, cmd: tuple[str, ...]) -> None:
+    key = venv_key(cwd, cmd)
     try:
-        return _ask_utility_for_venv(cwd, cmd)
-    except Exception:
+        stamp = venv_stamp(cwd, cmd)
+        try:
+            venv: str | None = util.check_output(cmd, cwd=cwd).strip().split('\n')[-1] or None
+        except Exception:
+            venv = None
+
+        with venv_lock:
+            venvs = known_venvs()
+            previous = venvs.get(key)
+            venvs[key] = {'venv': venv, 'stamp': stamp, 'checked': time.time()}
+            data = dict(venvs)
+        save_state(VENVS_STATE_FILE, data)
+    finally:
+        with venv_lock:
+            pending_venvs.discard(key)
+
+    if (previous['venv'] if previous else None) != venv:
+        logger.info("virtualenv for '{}' is now {}".format(cwd, venv))
+        # The command lines and results computed with the old virtualenv
+        # are outdated, but only for the files of this project.
+        invalidate_interpreters()
+        spawn_cache.cache.discard_below(cwd)
+        result_cache.cache.discard_below(cwd)
+        sublime.run_command('sublime_linter_config_changed', {'hint': 'relint', 'folder': cwd})
+
+
+def venv_key(cwd: str, cmd: tuple[str, ...]) -> str:
+    return '{}\0{}'.format(cwd, ' '.join(cmd))
+
+
+def venv_stamp(cwd: str, cmd: tuple[str, ...]) -> list[float | None]:
+    stamp_files = next(
+        (stamp_files for _, cmd_, stamp_files in VENV_UTILITIES if cmd_ == cmd),
+        ()
+    )
+    return [mtime(os.path.join(cwd, name)) for name in stamp_files]
+
+
+def known_venvs() -> dict[str, dict[str, Any]]:
+    # Must be called with the `venv_lock` held.
+    global _known_venvs
+    if _known_venvs is None:
+        _known_venvs = load_state(VENVS_STATE_FILE)
+    return _known_venvs
+
+
+_known_venvs: dict[str, dict[str, Any]] | None = None
+
+
+def mtime(path: str) -> float | None:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
         return None
 
 
-@lru_cache(maxsize=None)
-def _ask_utility_for_venv(cwd: str, cmd: tuple[str, ...]) -> str:
-    return util.check_output(cmd, cwd=cwd).strip().split('\n')[-1]
+def state_path(name: str) -> str:
+    return os.path.join(sublime.cache_path(), 'SublimeLinter', name)
+
+
+def load_state(name: str) -> dict[str, Any]:
+    try:
+        with open(state_path(name), 'r', encoding='utf8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_state(name: str, data: dict[str, Any]) -> None:
+    # Writers run on different threads, so each one gets its own temp file
+    # and the last `os.replace` wins atomically.
+    path = state_path(name)
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf8', dir=os.path.dirname(path),
+            prefix=name + '.', suffix='.tmp', delete=False
+        ) as f:
+            tmp_path = f.name
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError as err:
+        logger.warning("Could not write '{}': {}".format(path, err))
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
 
 
 VERSION_RE = re.compile(r'(?P<major>\d+)(?:\.(?P<minor>\d+))?')
 
 
-@lru_cache(maxsize=None)
 def get_python_version(path):
     """Return a dict with the major/minor version of the python at path."""
+    with interpreter_lock:
+        entry = known_interpreters().get(path)
+        if entry and path in validated_interpreters:
+            return entry['version']
+
+    identity = interpreter_identity(path)
+    if entry and entry['identity'] == identity:
+        with interpreter_lock:
+            validated_interpreters.add(path)
+        return entry['version']
+
+    version = probe_python_version(path)
+    with interpreter_lock:
+        interpreters = known_interpreters()
+        interpreters[path] = {'identity': identity, 'version': version}
+        validated_interpreters.add(path)
+        data = dict(interpreters)
+    save_state(INTERPRETERS_STATE_FILE, data)
+    return version
+
+
+def invalidate_interpreters() -> None:
+    """Check the identity of the known interpreters again on next use."""
+    with interpreter_lock:
+        validated_interpreters.clear()
+
+
+def probe_python_version(path):
     try:
         output = util.check_output([path, '-V'])
     except Exception:
@@ -254,6 +433,36 @@ def get_python_version(path):
     return extract_major_minor_version(output.split(' ')[-1])
 
 
+def interpreter_identity(path: str) -> list[Any] | None:
+    """Return what identifies the binary at `path`, following symlinks."""
+    real_path = os.path.realpath(path)
+    try:
+        stat = os.stat(real_path)
+    except OSError:
+        return None
+    return [real_path, stat.st_mtime, stat.st_ino, stat.st_size]
+
+
+def known_interpreters() -> dict[str, dict[str, Any]]:
+    # Must be called with the `interpreter_lock` held.
+    global _known_interpreters
+    if _known_interpreters is None:
+        _known_interpreters = load_state(INTERPRETERS_STATE_FILE)
+    return _known_interpreters
+
+
+_known_interpreters: dict[str, dict[str, Any]] | None = None
+
+
+def prefetch_python_versions() -> None:
+    """Probe the versions of all pythons on PATH in the background."""
+    def task():
+        for python in util.where('python'):
+            get_python_version(python)
+
+    background_executor.submit(task)
+
+
 def extract_major_minor_version(version):
     """Extract and return major and minor versions from a string version."""
     match = VERSION_RE.match(version)
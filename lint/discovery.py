@@ -0,0 +1,145 @@
+"""Answer file system questions for the discovery of executables.
+
+To find the executable of a linter, or the root of a project, we walk
+up the directory tree starting at the linted file and ask at every level
+if there is a `package.json`, a `node_modules/.bin/eslint`, a `.venv`
+etc.  That's dozens of syscalls per lint and linter, which is noticeable
+in deep monorepos and on network drives.
+
+Here we memoize the answers per directory.  An answer is valid as long as
+the modification time of its directory didn't change, because adding or
+removing an entry updates the mtime of the directory.  We check that at
+most every `RECHECK_INTERVAL` seconds, t.i. one `stat` per directory instead
+of one per question.  Saving a file through Sublime invalidates its
+directory immediately, see `invalidate`.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+import os
+import shutil
+import threading
+import time
+
+from typing import Callable, Hashable, Optional, TypeVar
+T = TypeVar('T')
+
+
+MAX_DIRECTORIES = 2048
+RECHECK_INTERVAL = 2.0  # seconds
+
+
+class Directory:
+    __slots__ = ('mtime', 'checked_at', 'answers')
+
+    def __init__(self, mtime: Optional[int], checked_at: float) -> None:
+        self.mtime = mtime
+        self.checked_at = checked_at
+        self.answers: dict[Hashable, object] = {}
+
+
+class StatCache:
+    def __init__(self, max_directories: int = MAX_DIRECTORIES) -> None:
+        self.max_directories = max_directories
+        self._directories: OrderedDict[str, Directory] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ask(self, directory: str, question: Hashable, compute: Callable[[], T]) -> T:
+        """Return the memoized answer to `question` about `directory`."""
+        node = self._directory(directory)
+        with self._lock:
+            try:
+                answer = node.answers[question]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                return answer  # type: ignore[return-value]
+
+        answer = compute()
+        with self._lock:
+            node.answers[question] = answer
+        return answer
+
+    def _directory(self, directory: str) -> Directory:
+        now = time.monotonic()
+        with self._lock:
+            node = self._directories.get(directory)
+            if node is not None:
+                self._directories.move_to_end(directory)
+                if now - node.checked_at < RECHECK_INTERVAL:
+                    return node
+
+        mtime = get_mtime(directory)
+        with self._lock:
+            node = self._directories.get(directory)
+            if node is None or node.mtime != mtime:
+                node = self._directories[directory] = Directory(mtime, now)
+                while len(self._directories) > self.max_directories:
+                    self._directories.popitem(last=False)
+            else:
+                node.checked_at = now
+            return node
+
+    def invalidate(self, directory: str) -> None:
+        with self._lock:
+            self._directories.pop(directory, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._directories.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'directories': len(self._directories),
+            }
+
+
+cache = StatCache()
+
+
+def get_mtime(directory: str) -> Optional[int]:
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def exists(path: str) -> bool:
+    """Like `os.path.exists` but memoized."""
+    directory, name = os.path.split(path)
+    return cache.ask(directory, ('exists', name), lambda: os.path.exists(path))
+
+
+def isdir(path: str) -> bool:
+    """Like `os.path.isdir` but memoized."""
+    directory, name = os.path.split(path)
+    return cache.ask(directory, ('isdir', name), lambda: os.path.isdir(path))
+
+
+def which(cmd: str, path: str) -> Optional[str]:
+    """Like `shutil.which(cmd, path=path)` but memoized per folder of `path`."""
+    if os.path.dirname(cmd):
+        return shutil.which(cmd, path=path)
+
+    for folder in path.split(os.pathsep):
+        if not folder:
+            continue
+        executable = cache.ask(
+            folder, ('which', cmd), lambda: shutil.which(cmd, path=folder))
+        if executable:
+            return executable
+    return None
+
+
+def invalidate(filename: str) -> None:
+    """Forget what we know about the directory of `filename`."""
+    cache.invalidate(os.path.dirname(filename))
+
+
+def clear() -> None:
+    cache.clear()
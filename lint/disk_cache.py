@@ -0,0 +1,301 @@
+"""A persistent, on-disk cache for lint results.
+
+After a restart we want to show the errors of the visible views immediately
+instead of waiting for all linters to finish.  For that, we store the final
+errors per (file, linter) as JSON files in Sublime's cache path.  An entry
+is only valid if
+
+  - the content of the buffer has the same hash,
+  - the resolved executable of the linter is still the same file (path,
+    size and mtime),
+  - the linter settings and the config files next to the file and up to
+    its working dir (dotfiles and usual config formats) did not change.
+
+Cached results are painted right away and then revalidated by the normal
+lint which runs afterwards anyway.
+
+Only results for the content on disk can ever match again, so we only store
+the results of views which are not dirty, t.i. after loading or saving, and
+at most once per `STORE_DELAY` per file and linter.  Old entries get evicted
+at startup and then every `EVICT_INTERVAL` while storing.
+
+This is opt-in, see the global setting `persistent_cache`.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import hashlib
+import json
+import logging
+import os
+import time
+
+import sublime
+
+from . import elect, linter as linter_module, persist, queue, result_cache, spawn_cache, util
+
+from typing import Any, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .elect import LinterInfo
+    from .persist import LintError
+
+
+FileName = str
+LinterName = str
+
+CACHE_VERSION = 2
+# The keys we store; `panel_line` et.al. are computed by the views
+STORED_KEYS = (
+    'linter', 'filename', 'line', 'start', 'error_type', 'code', 'msg',
+    'offending_text', 'uid', 'priority',
+)
+DEFAULT_MAX_SIZE_MB = 50
+DEFAULT_MAX_AGE_DAYS = 14
+STORE_DELAY = 2.0  # seconds
+EVICT_INTERVAL = 10 * 60  # seconds
+
+logger = logging.getLogger(__name__)
+# All IO runs on its own thread, sequentially.
+io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='SublimeLinterDiskCache')
+
+
+def is_enabled() -> bool:
+    return bool(persist.settings.get('persistent_cache'))
+
+
+def cache_dir() -> str:
+    return os.path.join(sublime.cache_path(), 'SublimeLinter', 'results')
+
+
+def entry_path(filename: FileName, linter_name: LinterName) -> str:
+    name = hashlib.sha256('{}\0{}'.format(filename, linter_name).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir(), name + '.json')
+
+
+def content_hash(view: sublime.View) -> str:
+    global _last_content_hash
+    state = (view.buffer_id(), view.change_count())
+    if _last_content_hash[0] == state:
+        return _last_content_hash[1]
+
+    code = view.substr(sublime.Region(0, view.size()))
+    hash_ = hashlib.sha256(code.encode('utf-8')).hexdigest()
+    _last_content_hash = (state, hash_)
+    return hash_
+
+
+# Usually all linters of a view report in a row, so we remember the last hash.
+_last_content_hash: tuple[tuple[int, int] | None, str] = (None, '')
+
+
+def paint_cached_results(view: sublime.View) -> None:
+    """Paint the cached results for all linters assigned to the view.
+
+    Must be called before the initial lint of the view.
+    """
+    if not is_enabled() or not view.file_name():
+        return
+
+    filename = util.canonical_filename(view)
+    linters = list(elect.assignable_linters_for_view(view, 'on_load'))
+    if not linters:
+        return
+
+    hash_ = content_hash(view)
+
+    def task():
+        for linter_info in linters:
+            errors = load(view, filename, linter_info, hash_)
+            if errors is not None:
+                sublime.set_timeout_async(partial(paint, view, hash_, linter_info.name, errors))
+
+    io_executor.submit(task)
+
+
+def paint(view: sublime.View, hash_: str, linter_name: LinterName, errors: list[LintError]) -> None:
+    # A real lint result might have been faster, and of course the user
+    # might have typed in between.
+    filename = util.canonical_filename(view)
+    if (
+        not view.is_valid()
+        or linter_name in persist.actual_linters.get(filename, set())
+        or content_hash(view) != hash_
+    ):
+        return
+
+    logger.info("Paint cached results of {} for '{}'".format(
+        linter_name, util.short_canonical_filename(view)))
+    persist.update_file_errors(filename, linter_name, errors, reason='cached')
+
+
+def store_result(
+    view: sublime.View,
+    linter_info: LinterInfo,
+    errors: list[LintError]
+) -> None:
+    """Store the final errors of a lint, which must still be valid for the view."""
+    if not is_enabled() or not view.file_name() or view.is_dirty():
+        return
+
+    filename = util.canonical_filename(view)
+    hash_ = content_hash(view)
+    errors = [error for error in errors if error['filename'] == filename]
+
+    def task():
+        io_executor.submit(store, view, filename, linter_info, hash_, errors)
+        if time.monotonic() - _last_eviction > EVICT_INTERVAL:
+            evict()
+
+    queue.debounce(task, delay=STORE_DELAY, key='disk_cache.{}.{}'.format(filename, linter_info.name))
+
+
+def load(
+    view: sublime.View,
+    filename: FileName,
+    linter_info: LinterInfo,
+    hash_: str
+) -> list[LintError] | None:
+    path = entry_path(filename, linter_info.name)
+    try:
+        with open(path, 'r', encoding='utf8') as f:
+            entry = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.info("Ignoring broken cache entry '{}': {}".format(path, exc))
+        return None
+
+    try:
+        if (
+            entry['version'] != CACHE_VERSION
+            or entry['content_hash'] != hash_
+            or entry['identity'] != make_identity(view, linter_info)
+        ):
+            return None
+        errors = [deserialize_error(error) for error in entry['errors']]
+    except Exception as exc:
+        logger.info("Ignoring invalid cache entry '{}': {}".format(path, exc))
+        return None
+
+    # Remember the usage for `evict`
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return errors
+
+
+def store(
+    view: sublime.View,
+    filename: FileName,
+    linter_info: LinterInfo,
+    hash_: str,
+    errors: list[LintError]
+) -> None:
+    try:
+        identity = make_identity(view, linter_info)
+    except Exception as exc:
+        logger.info("Not caching results of {}: {}".format(linter_info.name, exc))
+        return
+
+    entry = {
+        'version': CACHE_VERSION,
+        'filename': filename,
+        'linter': linter_info.name,
+        'content_hash': hash_,
+        'identity': identity,
+        'created': time.time(),
+        'errors': [serialize_error(error) for error in errors],
+    }
+    path = entry_path(filename, linter_info.name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Writing the lint cache failed: {}".format(exc))
+
+
+def make_identity(view: sublime.View, linter_info: LinterInfo) -> list[Any]:
+    """Compute what, besides the content, the result of a lint depends on."""
+    linter = linter_info.klass(view, linter_info.settings)
+    return [
+        executable_identity(linter),
+        result_cache.fingerprint(linter_info.settings.raw_settings),
+        config_fingerprint(linter),
+    ]
+
+
+def executable_identity(linter: linter_module.Linter) -> list[Any]:
+    if linter.cmd is None:
+        return [type(linter).__qualname__]
+
+    spec = spawn_cache.get_spawn_spec(linter)
+    if not spec:
+        raise ValueError("couldn't find an executable")
+
+    identity = result_cache.executable_identity(spec.cmd[0])
+    if identity is None:
+        raise ValueError("couldn't stat the executable")
+    return list(identity)
+
+
+def config_fingerprint(linter: linter_module.Linter) -> str:
+    return result_cache.config_fingerprint(linter, linter.get_working_dir())
+
+
+def serialize_error(error: LintError) -> dict[str, Any]:
+    rv: dict[str, Any] = {key: error[key] for key in STORED_KEYS if key in error}  # type: ignore[literal-required]
+    region = error['region']
+    rv['region'] = [region.a, region.b]
+    return rv
+
+
+def deserialize_error(data: dict[str, Any]) -> LintError:
+    error = persist.make_error_record({key: data[key] for key in STORED_KEYS if key in data})
+    a, b = data['region']
+    error['region'] = sublime.Region(a, b)
+    return error
+
+
+def evict() -> None:
+    """Remove entries which are too old or exceed the total size limit."""
+    global _last_eviction
+    _last_eviction = time.monotonic()
+    max_age_days = persist.settings.get('persistent_cache.max_age_days', DEFAULT_MAX_AGE_DAYS)
+    max_size_mb = persist.settings.get('persistent_cache.max_size_mb', DEFAULT_MAX_SIZE_MB)
+    io_executor.submit(_evict, max_age_days * 24 * 60 * 60, max_size_mb * 1024 * 1024)
+
+
+_last_eviction = 0.0
+
+
+def _evict(max_age: float, max_size: float) -> None:
+    try:
+        entries = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(cache_dir())
+            if entry.is_file()
+        ]
+    except OSError:
+        return
+
+    now = time.time()
+    # Newest first, so we keep the recently used entries
+    entries.sort(reverse=True)
+    running_size = 0
+    removed = 0
+    for mtime, size, path in entries:
+        running_size += size
+        if now - mtime > max_age or running_size > max_size:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            else:
+                removed += 1
+
+    if removed:
+        logger.info("Evicted {} entries from the lint cache".format(removed))
@@ -1,16 +1,18 @@
 from __future__ import annotations
 import sublime
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import lru_cache
 import logging
 import os
+import threading
 
 from . import linter as linter_module
 from . import persist
 
 
-from typing import Iterable, Iterator
+from typing import Dict, Hashable, Iterable, Iterator, Type
 
 Linter = linter_module.Linter
 LinterName = str
@@ -18,6 +20,8 @@ LinterSettings = linter_module.LinterSettings
 LintError = persist.LintError
 Reason = str
 ViewContext = linter_module.ViewContext
+# Per linter class: may it match the view at all?
+Candidates = Dict[Type[Linter], bool]
 
 
 @dataclass(frozen=True)
@@ -32,6 +36,15 @@ class LinterInfo:
 
 logger = logging.getLogger(__name__)
 
+# Most installed linters can never match a given view, e.g. `eslint` can't
+# match a Python file.  We remember per buffer and base scope which linters
+# are candidates so that we only compute the settings of these on the next
+# lint.  The key also contains everything else that goes into the
+# decision, t.i. the global settings, the view settings and the filename.
+MAX_ELECTIONS = 256
+elections: OrderedDict[Hashable, Candidates] = OrderedDict()
+elections_lock = threading.Lock()
+
 
 def assignable_linters_for_view(
     view: sublime.View,
@@ -52,8 +65,14 @@ def assignable_linters_for_view(
         return
 
     ctx = linter_module.get_view_context(view, {'reason': reason})
+    candidates = get_candidates(view)
     for name, klass in persist.linter_classes.items():
+        if candidates.get(klass) is False:
+            continue
+
         settings = linter_module.get_linter_settings(klass, view, ctx)
+        if klass not in candidates:
+            candidates[klass] = is_candidate(view, klass, settings)
         if (
             klass.can_lint_view(view, settings)
             and (regions := klass.match_selector(view, settings))
@@ -72,6 +91,56 @@ def assignable_linters_for_view(
             )
 
 
+def get_candidates(view: sublime.View) -> Candidates:
+    """Return the (mutable) election record for the current state of `view`.
+
+    Linter classes missing in the record, e.g. because they were just
+    loaded, have not been checked yet.
+    """
+    key = election_key(view)
+    with elections_lock:
+        try:
+            candidates = elections[key]
+        except KeyError:
+            candidates = elections[key] = {}
+            while len(elections) > MAX_ELECTIONS:
+                elections.popitem(last=False)
+        else:
+            elections.move_to_end(key)
+    return candidates
+
+
+def election_key(view: sublime.View) -> Hashable:
+    return (
+        view.buffer_id(),
+        view.scope_name(0),
+        persist.settings.change_count(),
+        linter_module.view_settings_change_count(view),
+        view.file_name(),
+    )
+
+
+def is_candidate(view: sublime.View, linter: type[Linter], settings: LinterSettings) -> bool:
+    """Decide if `linter` may match `view` as long as its base scope is the same."""
+    # We don't know what an overridden `match_selector` looks at.
+    if linter.match_selector is not Linter.match_selector:
+        return True
+
+    # Cells are searched in the whole buffer, the outcome changes with
+    # every edit.
+    if settings.get('enable_cells', False):
+        return True
+
+    selector = settings.get('selector', None)
+    return selector is not None and bool(view.score_selector(0, selector))
+
+
+def forget_elections(bid: sublime.BufferId) -> None:
+    with elections_lock:
+        for key in [key for key in elections if key[0] == bid]:  # type: ignore[index]
+            elections.pop(key, None)
+
+
 def runnable_linters_for_view(view: sublime.View, reason: Reason) -> Iterator[LinterInfo]:
     return filter_runnable_linters(assignable_linters_for_view(view, reason))
 
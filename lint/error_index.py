@@ -0,0 +1,119 @@
+"""Index the errors of a file by their regions.
+
+The status bar, the tooltips and the quick actions ask on every cursor
+move or hover which errors are at a given point or touch a given line.
+Scanning all errors of a file for that gets noticeable with thousands
+of errors, so we answer these questions from an interval tree.
+
+The index is built lazily on the first query after the errors of a
+file have changed.  We recognize a change by identity: all writers
+*replace* the list in `persist.file_errors`, they never mutate it.
+"""
+from __future__ import annotations
+import threading
+
+import sublime
+
+from . import persist
+
+from typing import Iterator, Optional
+
+
+FileName = str
+LintError = persist.LintError
+
+
+class ErrorIndex:
+    """A static, implicit interval tree over the regions of `errors`.
+
+    The intervals are sorted by their begin.  The node of the sub-range
+    `[lo, hi)` is at `mid = (lo + hi) // 2` and stores the maximal end of
+    its sub-range, so that we can prune sub-trees which end before the
+    query starts.  Intervals are closed, t.i. an error at `(3, 5)` is *at*
+    the points 3, 4 and 5, like `sublime.Region.contains`.
+    """
+
+    def __init__(self, errors: list[LintError]) -> None:
+        self.errors = errors
+        order = sorted(range(len(errors)), key=lambda i: errors[i]['region'].begin())
+        self._order = order
+        self._begins = [errors[i]['region'].begin() for i in order]
+        self._ends = [errors[i]['region'].end() for i in order]
+        self._max_ends = self._ends[:]
+        self._compute_max_ends(0, len(order))
+
+    def _compute_max_ends(self, lo: int, hi: int) -> int:
+        if lo >= hi:
+            return -1
+        mid = (lo + hi) // 2
+        self._max_ends[mid] = max(
+            self._ends[mid],
+            self._compute_max_ends(lo, mid),
+            self._compute_max_ends(mid + 1, hi),
+        )
+        return self._max_ends[mid]
+
+    def at(self, point: int) -> list[LintError]:
+        """Return the errors whose region contains `point`."""
+        return self.intersecting(sublime.Region(point))
+
+    def intersecting(self, region: sublime.Region) -> list[LintError]:
+        """Return the errors whose region touches or overlaps `region`.
+
+        This is deliberately more than `sublime.Region.intersects`
+        which ignores touching regions; callers filter further if needed.
+        The errors are returned in their original order.
+        """
+        a, b = region.begin(), region.end()
+        hits = sorted(self._order[i] for i in self._search(a, b))
+        return [self.errors[i] for i in hits]
+
+    def _search(self, a: int, b: int) -> Iterator[int]:
+        stack = [(0, len(self._order))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_ends[mid] < a:
+                continue
+            stack.append((lo, mid))
+            # Everything right of `mid` begins after `mid`.
+            if self._begins[mid] > b:
+                continue
+            if self._ends[mid] >= a:
+                yield mid
+            stack.append((mid + 1, hi))
+
+
+indexes: dict[FileName, ErrorIndex] = {}
+indexes_lock = threading.Lock()
+
+
+def get_index(filename: FileName) -> ErrorIndex:
+    errors = persist.file_errors.get(filename, [])
+    with indexes_lock:
+        index = indexes.get(filename)
+    if index is not None and index.errors is errors:
+        return index
+
+    index = ErrorIndex(errors)
+    with indexes_lock:
+        indexes[filename] = index
+    return index
+
+
+def errors_at(filename: FileName, point: int) -> list[LintError]:
+    return get_index(filename).at(point)
+
+
+def errors_intersecting(filename: FileName, region: sublime.Region) -> list[LintError]:
+    return get_index(filename).intersecting(region)
+
+
+def forget(filename: Optional[FileName] = None) -> None:
+    with indexes_lock:
+        if filename is None:
+            indexes.clear()
+        else:
+            indexes.pop(filename, None)
@@ -6,7 +6,6 @@ from contextlib import contextmanager
 from fnmatch import fnmatch
 from functools import lru_cache
 import inspect
-from itertools import accumulate
 import logging
 import os
 import re
@@ -14,9 +13,12 @@ import shlex
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 
 import sublime
-from . import events, persist, util
+from . import events, persist, spawn_cache, util
+from .snapshot import Snapshot, compute_line_offsets
 from .const import WARNING, ERROR
 
 
@@ -152,19 +154,9 @@ class PermanentError(Exception):
 # HTML-file. The tiny `VirtualView` is just enough code, so we can get the
 # source code of a line, the linter reported to be problematic.
 class VirtualView:
-    def __init__(self, code: str = ''):
+    def __init__(self, code: str = '', newlines: Optional[Sequence[int]] = None):
         self._code = code
-        newlines = list(accumulate(
-            map(len, code.splitlines(keepends=True)),
-            initial=0
-        ))
-        # A trailing "\n" *begins* a new line.
-        # Refer the two interpretations of "split":
-        #   "mypy\n".splitlines(keepends=True) == ['mypy\n']
-        #   "mypy\n".split("\n")               == ['mypy', '']
-        if code.endswith("\n"):
-            newlines.append(len(code))
-        self._newlines = newlines
+        self._newlines = compute_line_offsets(code) if newlines is None else newlines
 
     def full_line(self, line: int) -> tuple[int, int]:
         """Return the start/end character positions for the given line."""
@@ -253,11 +245,50 @@ class ViewSettings:
     def __contains__(self, key):
         return self.view.settings().has(self._compute_final_key(key))
 
+    def __iter__(self):
+        # Allows to enumerate (and thus fingerprint) the settings of a
+        # `ChainMap` containing this object.
+        prefix = self.prefix
+        return iter([
+            key[len(prefix):]
+            for key in self.view.settings().to_dict()
+            if key.startswith(prefix)
+        ])
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
     def __repr__(self):
         return "ViewSettings({}, {!r})".format(
             self.view.id(), self.prefix.rstrip('.'))
 
 
+VIEW_SETTINGS_OBSERVER_KEY = 'SublimeLinter.change_count'
+view_settings_change_counts: dict[sublime.ViewId, int] = {}
+
+
+def view_settings_change_count(view: sublime.View) -> int:
+    """Return a number which increments whenever a setting of `view` changes.
+
+    Comparing `view.settings().to_dict()` instead would copy all settings
+    of the view on every lint.
+    """
+    vid = view.id()
+    try:
+        return view_settings_change_counts[vid]
+    except KeyError:
+        pass
+
+    def on_change():
+        view_settings_change_counts[vid] = view_settings_change_counts.get(vid, 0) + 1
+
+    settings = view.settings()
+    # Drop the observer of a previous instance of this plugin
+    settings.clear_on_change(VIEW_SETTINGS_OBSERVER_KEY)
+    settings.add_on_change(VIEW_SETTINGS_OBSERVER_KEY, on_change)
+    return view_settings_change_counts.setdefault(vid, 0)
+
+
 NOT_EXPANDABLE_SETTINGS = {
     "lint_mode",
     "selector",
@@ -423,6 +454,19 @@ def get_view_context(view: sublime.View, additional_context: Optional[Mapping] =
     return context
 
 
+def excluded_by(filename: str, excludes: Union[str, list[str]]) -> Optional[str]:
+    """Return the first pattern of `excludes` which matches `filename`."""
+    for pattern in util.ensure_list(excludes):
+        if pattern.startswith('!'):
+            matched = not fnmatch(filename, pattern[1:])
+        else:
+            matched = fnmatch(filename, pattern)
+
+        if matched:
+            return pattern
+    return None
+
+
 def guess_project_root_of_view(view):
     window = view.window()
     if not window:
@@ -768,6 +812,13 @@ class Linter(metaclass=LinterMeta):
         # real `LinterSettings`.
         self.context: MutableMapping[str, str] = getattr(settings, 'context', {})
         self.env: dict[str, str] = {}
+        # The (cached) command, cwd and env of the current lint
+        self.spawn_spec: Optional[spawn_cache.SpawnSpec] = None
+        # The snapshot of the code to lint, shared with the other linters
+        self.snapshot: Optional[Snapshot] = None
+        # Called with the errors found so far while the linter is still
+        # running, see `make_progress_reporter`
+        self.on_progress: Optional[Callable[[list[LintError]], None]] = None
 
         # Ensure instances have their own copy in case a plugin author
         # mangles it.
@@ -1060,18 +1111,13 @@ class Linter(metaclass=LinterMeta):
         excludes: Union[str, list[str]] = settings.get('excludes', [])
         if excludes:
             filename = view.file_name() or '<untitled>'
-            for pattern in util.ensure_list(excludes):
-                if pattern.startswith('!'):
-                    matched = not fnmatch(filename, pattern[1:])
-                else:
-                    matched = fnmatch(filename, pattern)
-
-                if matched:
-                    cls.logger.info(
-                        "{} skipped '{}', excluded by '{}'"
-                        .format(cls.name, filename, pattern)
-                    )
-                    return False
+            pattern = excluded_by(filename, excludes)
+            if pattern:
+                cls.logger.info(
+                    "{} skipped '{}', excluded by '{}'"
+                    .format(cls.name, filename, pattern)
+                )
+                return False
 
         return True
 
@@ -1164,19 +1210,32 @@ class Linter(metaclass=LinterMeta):
         if self.cmd is None:
             output: Union[str, util.popen_output] = self.run(None, code)
         else:
-            cmd = self.get_cmd()
-            if not cmd:
+            self.spawn_spec = spawn_cache.get_spawn_spec(self)
+            if not self.spawn_spec:
                 self.notify_failure()
                 raise PermanentError("couldn't find an executable")
 
-            output = self.run(cmd, code)
+            output = self.run(list(self.spawn_spec.cmd), code)
 
         if view_has_changed():
             raise TransientError('View not consistent.')
 
-        virtual_view = VirtualView(code)
+        virtual_view = self.make_virtual_view(code)
         return self.filter_errors(self.parse_output(output, virtual_view))
 
+    def make_virtual_view(self, code: str) -> VirtualView:
+        snapshot = self.snapshot_of(code)
+        if snapshot:
+            return VirtualView(code, snapshot.line_offsets)
+        return VirtualView(code)
+
+    def snapshot_of(self, code: Optional[str]) -> Optional[Snapshot]:
+        """Return the shared snapshot if `code` is its text."""
+        snapshot = self.snapshot
+        if snapshot is not None and code is snapshot.text:
+            return snapshot
+        return None
+
     def filter_errors(self, errors: Iterable[LintError]) -> list[LintError]:
         filter_patterns = self.settings.get('filter_errors') or []
         if isinstance(filter_patterns, str):
@@ -1211,23 +1270,26 @@ class Linter(metaclass=LinterMeta):
         # Note: We support type str for `proc`. E.g. the user might have
         # implemented `run`.
         if isinstance(proc, util.popen_output):
-            # Split output, but only for STREAM_BOTH linters, and if
-            # `on_stderr` is defined.
-            if (
-                proc.stdout is not None and
-                proc.stderr is not None and
-                callable(self.on_stderr)
-            ):
-                output, stderr = proc.stdout, proc.stderr
-                if stderr.strip():
-                    self.on_stderr(stderr)
-            else:
-                output = proc.combined_output
+            output = self.select_output(proc)
         else:
             output = proc
 
         return self.parse_output_via_regex(output, virtual_view)
 
+    def select_output(self, proc: util.popen_output) -> str:
+        """Return the output of `proc` we parse for errors."""
+        # Split output, but only for STREAM_BOTH linters, and if
+        # `on_stderr` is defined.
+        if (
+            proc.stdout is not None and
+            proc.stderr is not None and
+            callable(self.on_stderr)
+        ):
+            if proc.stderr.strip():
+                self.on_stderr(proc.stderr)
+            return proc.stdout
+        return proc.combined_output
+
     def parse_output_via_regex(self, output: str, virtual_view: VirtualView) -> Iterable[LintError]:
         if not output:
             self.logger.info('{}: no output'.format(self.name))
@@ -1263,13 +1325,7 @@ class Linter(metaclass=LinterMeta):
             assert isinstance(self.regex, Pattern)
             match: Optional[Match] = None
 
-        def _process_match(match: Match) -> LintMatch | None:
-            if lint_match := self.split_match(match):
-                if not isinstance(lint_match, LintMatch):
-                    lint_match = LintMatch(*lint_match)  # type: ignore[unreachable]  # backwards compatibility
-                if lint_match.fulfills_minimal_requirements():
-                    return lint_match
-            return None
+        _process_match = self._lint_match_of
 
         if self.multiline:
             matches = list(self.regex.finditer(output))
@@ -1291,6 +1347,14 @@ class Linter(metaclass=LinterMeta):
                     self.logger.info(
                         "{}: No match for line: '{}'".format(self.name, line))
 
+    def _lint_match_of(self, match: Match) -> LintMatch | None:
+        if lint_match := self.split_match(match):
+            if not isinstance(lint_match, LintMatch):
+                lint_match = LintMatch(*lint_match)  # type: ignore[unreachable]  # backwards compatibility
+            if lint_match.fulfills_minimal_requirements():
+                return lint_match
+        return None
+
     def split_match(self, match: Match) -> LintMatch:
         """Convert the regex match to a `LintMatch`
 
@@ -1430,16 +1494,16 @@ class Linter(metaclass=LinterMeta):
         )
         offending_text = vv.substr(normalized_region)
 
-        return {
-            "filename": filename,
-            "line": line,
-            "start": col,
-            "region": normalized_region,
-            "error_type": error_type,
-            "code": code,
-            "msg": m.message.strip(),
-            "offending_text": offending_text
-        }
+        return persist.ErrorRecord(
+            filename=filename,
+            line=line,
+            start=col,
+            region=normalized_region,
+            error_type=error_type,
+            code=code,
+            msg=m.message.strip(),
+            offending_text=offending_text,
+        )  # type: ignore[return-value]
 
     def get_error_type(self, error, warning):
         if error:
@@ -1584,7 +1648,8 @@ class Linter(metaclass=LinterMeta):
         if suffix is None:
             suffix = self.get_tempfile_suffix()
 
-        with make_temp_file(suffix, code) as file:
+        snapshot = self.snapshot_of(code)
+        with make_temp_file(suffix, snapshot.encoded if snapshot else code) as file:
             self.context['file_on_disk'] = self.filename
             self.context['temp_file'] = file.name
 
@@ -1669,15 +1734,97 @@ class Linter(metaclass=LinterMeta):
 
         return suffix
 
+    def get_progress_interval(self) -> Optional[float]:
+        """Return the seconds between publishing partial results, if any."""
+        value = self.settings.get('progressive_results')
+        return value if isinstance(value, (int, float)) and value > 0 else None
+
+    def can_stream_output(self) -> bool:
+        """Return whether we can parse the output line by line as it arrives.
+
+        That's only the case for line based regexes, and if the plugin
+        didn't customize how we parse the output.
+        """
+        cls = type(self)
+        return bool(
+            self.regex
+            and not self.multiline
+            and self.error_stream & util.STREAM_STDOUT
+            and cls.parse_output is Linter.parse_output
+            and cls.parse_output_via_regex is Linter.parse_output_via_regex
+            and cls.find_errors is Linter.find_errors
+        )
+
+    def make_progress_reporter(self) -> Optional[Callable[[bytes], None]]:
+        """Return a callback which parses the output line by line.
+
+        The callback publishes the errors found so far to `on_progress`,
+        at most every `progressive_results` seconds.  The final result,
+        parsed from the complete output, replaces them eventually.
+        """
+        interval = self.get_progress_interval()
+        on_progress = self.on_progress
+        snapshot = self.snapshot
+        if not interval or not on_progress or not snapshot or not self.can_stream_output():
+            return None
+
+        if TYPE_CHECKING:
+            assert isinstance(self.regex, Pattern)
+        regex = self.regex
+        virtual_view = self.make_virtual_view(snapshot.text)
+        errors: list[LintError] = []
+        published = 0
+        next_publish = time.monotonic() + interval
+        failed = False
+
+        def on_line(line: bytes) -> None:
+            nonlocal published, next_publish, failed
+            if failed:
+                return
+
+            try:
+                if match := regex.match(util.process_popen_output(line).rstrip()):
+                    if lint_match := self._lint_match_of(match):
+                        if error := self.process_match(lint_match, virtual_view):
+                            errors.append(error)
+
+                now = time.monotonic()
+                if now >= next_publish and len(errors) > published:
+                    published = len(errors)
+                    next_publish = now + interval
+                    on_progress(self.filter_errors(errors))
+            except Exception:
+                # Partial results are a nicety, the final result still comes.
+                failed = True
+                self.logger.exception(
+                    'Parsing partial output failed:\n', extra={'demote': True})
+
+        return on_line
+
+    def get_timeout(self) -> Optional[float]:
+        """Return the seconds after which we abort a running linter, if any."""
+        value = self.settings.get('timeout')
+        return value if isinstance(value, (int, float)) and value > 0 else None
+
     def _communicate(self, cmd: list[str], code: Optional[str] = None) -> util.popen_output:
         """Run command and return result."""
-        cwd = self.get_working_dir()
-        env = self.get_environment()
+        spec = self.spawn_spec
+        if spec:
+            cwd = spec.cwd
+            env = spawn_cache.environment_of(self, spec)
+        else:
+            cwd = self.get_working_dir()
+            env = self.get_environment()
 
         output_stream = self.error_stream
         view = self.view
 
-        code_b = code.encode('utf8') if code is not None else None
+        snapshot = self.snapshot_of(code)
+        code_b = (
+            snapshot.encoded if snapshot
+            else code.encode('utf8') if code is not None
+            else None
+        )
         uses_stdin = code is not None
         stdin = subprocess.PIPE if uses_stdin else None
         stdout = subprocess.PIPE if output_stream & util.STREAM_STDOUT else None
@@ -1688,7 +1835,8 @@ class Linter(metaclass=LinterMeta):
                 cmd, env=env, cwd=cwd,
                 stdin=stdin, stdout=stdout, stderr=stderr,
                 startupinfo=util.create_startupinfo(),
-                creationflags=util.get_creationflags()
+                creationflags=util.get_creationflags(),
+                start_new_session=util.start_new_session()
             )
         except Exception as err:
             augmented_env = dict(ChainMap(*env.maps[0:-1]))
@@ -1704,10 +1852,27 @@ class Linter(metaclass=LinterMeta):
             self.logger.info(make_nice_log_message(
                 'Running ...', cmd, uses_stdin, cwd, view, env=augmented_env))
 
+        timeout = self.get_timeout()
+        on_line = self.make_progress_reporter() if stdout else None
         bid = view.buffer_id()
         with store_proc_while_running(bid, proc):
             try:
-                out = proc.communicate(code_b)
+                if on_line:
+                    out = communicate_streaming(proc, code_b, timeout, on_line)
+                else:
+                    out = proc.communicate(code_b, timeout=timeout)
+
+            except subprocess.TimeoutExpired:
+                persist.linter_timeouts[self.name] += 1
+                self.logger.warning(
+                    '{} timed out after {}s, terminating <pid {}>'
+                    .format(self.name, timeout, proc.pid)
+                )
+                util.terminate_process(proc)
+                if not on_line:  # `communicate_streaming` has drained the pipes
+                    proc.communicate()
+                self.notify_failure()
+                raise TransientError('Timed out')
 
             except BrokenPipeError as err:
                 friendly_terminated = getattr(proc, 'friendly_terminated', False)
@@ -1749,6 +1914,76 @@ class Linter(metaclass=LinterMeta):
         return util.popen_output(proc, *out)
 
 
+def communicate_streaming(
+    proc: subprocess.Popen,
+    input: Optional[bytes],
+    timeout: Optional[float],
+    on_line: Callable[[bytes], None]
+) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """Like `proc.communicate` but call `on_line` for each line of stdout.
+
+    We feed stdin and read stderr in threads, and read stdout line by line
+    as the process writes it.  Raise `subprocess.TimeoutExpired` after the
+    process has been terminated because it exceeded `timeout`.
+    """
+    assert proc.stdout
+    stderr_chunks: list[bytes] = []
+    threads = []
+    if proc.stdin:
+        stdin = proc.stdin
+
+        def feed_stdin():
+            try:
+                if input:
+                    stdin.write(input)
+                stdin.close()
+            except (BrokenPipeError, OSError):
+                # The process doesn't read (all of) stdin, like `communicate`
+                # we ignore that.
+                pass
+
+        threads.append(threading.Thread(target=feed_stdin, daemon=True))
+    if proc.stderr:
+        stderr = proc.stderr
+        threads.append(threading.Thread(
+            target=lambda: stderr_chunks.append(stderr.read()), daemon=True))
+    for thread in threads:
+        thread.start()
+
+    timed_out = threading.Event()
+    timer = None
+    if timeout:
+        def on_timeout():
+            timed_out.set()
+            util.terminate_process(proc)
+
+        timer = threading.Timer(timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+
+    stdout_chunks = []
+    try:
+        for line in iter(proc.stdout.readline, b''):
+            stdout_chunks.append(line)
+            on_line(line)
+        proc.stdout.close()
+        for thread in threads:
+            thread.join()
+        if proc.stderr:
+            proc.stderr.close()
+        proc.wait()
+    finally:
+        if timer:
+            timer.cancel()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(proc.args, timeout)  # type: ignore[arg-type]
+    return (
+        b''.join(stdout_chunks),
+        (stderr_chunks[0] if stderr_chunks else b'') if proc.stderr else None
+    )
+
+
 # Old python versions do not protect (typically: ignore) against
 # `BrokenPipeError`s enough.   I.e. within `Popen._communicate` there is (still)
 # an unprotected call to `self.stdin.close()`.  This has been fixed rather late
@@ -1784,10 +2019,10 @@ def recover_broken_pipe(self):  # self refers `subprocess.Popen`
 
 
 @contextmanager
-def make_temp_file(suffix: str, code: str) -> Iterator[IO]:
+def make_temp_file(suffix: str, code: Union[str, bytes]) -> Iterator[IO]:
     file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
     try:
-        file.write(bytes(code, 'UTF-8'))
+        file.write(code if isinstance(code, bytes) else bytes(code, 'UTF-8'))
         file.close()
         yield file
 
@@ -1,10 +1,15 @@
 """This module provides persistent global storage for other modules."""
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import chain
 import subprocess
+import sys
 import threading
-from typing import DefaultDict, Type, TypedDict, TYPE_CHECKING
+from typing import (
+    Any, DefaultDict, Iterator, List, Mapping, MutableMapping, Optional, Type, TypedDict,
+    TypeVar, Union, overload, TYPE_CHECKING
+)
 
 import sublime
 from . import events, util
@@ -17,6 +22,7 @@ if TYPE_CHECKING:
 FileName = str
 LinterName = str
 Reason = str
+T = TypeVar('T')
 
 
 class LintError(TypedDict, total=False):
@@ -37,12 +43,179 @@ class LintError(TypedDict, total=False):
     panel_line: tuple[int, int]
 
 
+ERROR_FIELDS = tuple(LintError.__annotations__)
+_ERROR_FIELDS_SET = frozenset(ERROR_FIELDS)
+# Fields with only a few distinct values which we share between the errors
+INTERNED_FIELDS = frozenset(('linter', 'filename', 'error_type', 'code'))
+
+
+class ErrorRecord(MutableMapping):
+    """A compact `LintError`.
+
+    Behaves like the plain dict a `LintError` used to be, but stores the
+    well-known fields in slots and interns the strings which repeat from
+    error to error.  Unknown keys, e.g. added by plugins, go into an extra
+    dict which is only created when needed.
+    """
+
+    __slots__ = ERROR_FIELDS + ('_extra',)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._extra: dict[str, Any] | None = None
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _ERROR_FIELDS_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _ERROR_FIELDS_SET:
+            if key in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _ERROR_FIELDS_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in _ERROR_FIELDS_SET:
+            return hasattr(self, key)  # type: ignore[arg-type]
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in ERROR_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return '{}({})'.format(type(self).__name__, dict(self.items()))
+
+    def copy(self) -> ErrorRecord:
+        return type(self)(self)
+
+
+def make_error_record(error: Mapping[str, Any]) -> LintError:
+    """Return `error` as an `ErrorRecord`, converting it if necessary."""
+    if isinstance(error, ErrorRecord):
+        return error  # type: ignore[return-value]
+    return ErrorRecord(error)  # type: ignore[return-value]
+
+
+class ErrorStore(MutableMapping[FileName, List[LintError]]):
+    """The errors per file, partitioned by linter.
+
+    Reading `store[filename]` returns the combined errors of all linters
+    for that file (and like a `defaultdict` creates an empty entry if
+    there is none).  Replacing the errors of one linter via `set_linter_errors`
+    doesn't touch the errors of the other linters; the combined list is
+    concatenated again on the next read only.
+
+    The combined lists must be treated as immutable.  Assign a new list
+    instead, which is then partitioned again.
+    """
+
+    def __init__(self) -> None:
+        self._partitions: dict[FileName, dict[LinterName, list[LintError]]] = {}
+        self._combined: dict[FileName, list[LintError]] = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, filename: FileName) -> list[LintError]:
+        with self._lock:
+            try:
+                return self._combined[filename]
+            except KeyError:
+                pass
+
+            partitions = self._partitions.setdefault(filename, {})
+            combined = self._combined[filename] = list(chain.from_iterable(partitions.values()))
+            return combined
+
+    def __setitem__(self, filename: FileName, errors: list[LintError]) -> None:
+        partitions: dict[LinterName, list[LintError]] = defaultdict(list)
+        for error in errors:
+            partitions[error.get('linter', '')].append(error)
+        with self._lock:
+            self._partitions[filename] = dict(partitions)
+            # Keep the list as given, its identity signals a change
+            self._combined[filename] = errors
+
+    def __delitem__(self, filename: FileName) -> None:
+        with self._lock:
+            del self._partitions[filename]
+            self._combined.pop(filename, None)
+
+    def __contains__(self, filename: object) -> bool:
+        return filename in self._partitions
+
+    def __iter__(self) -> Iterator[FileName]:
+        with self._lock:
+            return iter(list(self._partitions))
+
+    def __len__(self) -> int:
+        return len(self._partitions)
+
+    @overload
+    def get(self, filename: FileName) -> Optional[list[LintError]]: ...
+    @overload
+    def get(self, filename: FileName, default: Union[list[LintError], T]) -> Union[list[LintError], T]: ...
+
+    def get(self, filename, default=None):
+        # Unlike `__getitem__`, do not create an entry
+        with self._lock:
+            if filename not in self._partitions:
+                return default
+            return self[filename]
+
+    def set_linter_errors(
+        self,
+        filename: FileName,
+        linter_name: LinterName,
+        errors: list[LintError]
+    ) -> None:
+        """Replace the errors of `linter_name` for `filename`."""
+        with self._lock:
+            partitions = self._partitions.setdefault(filename, {})
+            if errors:
+                partitions[linter_name] = list(errors)
+            else:
+                partitions.pop(linter_name, None)
+            self._combined.pop(filename, None)
+
+    def by_linter(self, filename: FileName) -> dict[LinterName, list[LintError]]:
+        """Return the errors of `filename` grouped by linter."""
+        with self._lock:
+            return dict(self._partitions.get(filename, {}))
+
+
 api_ready = False
 kill_switch = True
 
 settings = Settings()
 
-file_errors: DefaultDict[FileName, list[LintError]] = defaultdict(list)
+file_errors = ErrorStore()
 linter_classes: dict[str, Type[Linter]] = {}
 assigned_linters: dict[Bid, set[LinterName]] = {}
 actual_linters: dict[FileName, set[LinterName]] = {}
@@ -53,6 +226,13 @@ affected_filenames_per_filename: \
     DefaultDict[FileName, DefaultDict[LinterName, set[FileName]]] = \
     defaultdict(lambda: defaultdict(set))
 
+# Files linted by a project lint, per window, so that their errors show up
+# in the panel although they're not open
+project_filenames: DefaultDict[sublime.WindowId, set[FileName]] = defaultdict(set)
+
+# How often a linter has been aborted because it hit its `timeout`
+linter_timeouts: Counter[LinterName] = Counter()
+
 active_procs: DefaultDict[Bid, list[subprocess.Popen]] = defaultdict(list)
 active_procs_lock = threading.Lock()
 
@@ -139,11 +319,7 @@ def update_file_errors(
 
 
 def update_errors_store(filename: FileName, linter_name: LinterName, errors: list[LintError]) -> None:
-    file_errors[filename] = [
-        error
-        for error in file_errors[filename]
-        if error['linter'] != linter_name
-    ] + errors
+    file_errors.set_linter_errors(filename, linter_name, errors)
 
 
 def record_filename_change(old_filename: FileName, new_filename: FileName) -> None:
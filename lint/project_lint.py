@@ -0,0 +1,531 @@
+"""Lint all files in the folders of a window.
+
+Opening every file of a project, or running a linter once per file, is way
+too slow for a few hundred files.  Instead we collect the files matching
+the `selector` of each linter and run the linter over *many* paths at once.
+A linter can be batched if it reads the files from disk (t.i. it has a
+`tempfile_suffix`) and if its `regex` has a `filename` group, so that we
+can tell the errors of the different files apart.  Other linters run once
+per file, linters which implement their own `run` or `parse_output` are
+skipped.
+
+The settings of the linters are read from the active view of the window,
+the executable and the variables like `${file}` are resolved for the first
+file of each batch.
+
+The invocations run on the shared task executor of the backend, in the
+background priority class, so they count towards `max_concurrent_processes`
+and `max_concurrent` like any other linter process, and the lints of the
+views the user looks at go first.  The results are routed through
+`persist.group_by_filename_and_update` like the results of a normal lint.
+"""
+from __future__ import annotations
+from collections import ChainMap, defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from functools import partial
+import logging
+import os
+import subprocess
+import threading
+
+import sublime
+
+from . import backend, error_index, linter as linter_module, persist, scheduler, style, util
+
+from typing import Any, Iterable, Iterator, Mapping, Optional, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .linter import Linter
+    from .persist import LintError
+
+
+FileName = str
+LinterName = str
+
+DEFAULT_BATCH_SIZE = 50
+SKIPPED_FOLDERS = {'node_modules', '__pycache__', 'venv', 'site-packages'}
+# Tokens in `cmd` which stand for the file to lint
+FILE_MARKERS = ('${file}', '${file_on_disk}', '${temp_file}', '@')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Batch:
+    linter_name: LinterName
+    klass: type[Linter]
+    raw_settings: Mapping[str, Any]
+    folder: str
+    filenames: list[FileName]
+    batched: bool
+
+
+def collect_files(
+    folder: str,
+    folder_exclude_patterns: Iterable[str] = (),
+    file_exclude_patterns: Iterable[str] = ()
+) -> Iterator[FileName]:
+    """Yield all files below `folder`, skipping hidden and vendor folders."""
+    folder_exclude_patterns = list(folder_exclude_patterns)
+    file_exclude_patterns = list(file_exclude_patterns)
+    for root, dirnames, filenames in os.walk(folder):
+        dirnames[:] = sorted(
+            name for name in dirnames
+            if not (
+                name.startswith('.')
+                or name in SKIPPED_FOLDERS
+                or any(fnmatch(name, pattern) for pattern in folder_exclude_patterns)
+            )
+        )
+        for name in sorted(filenames):
+            if not any(fnmatch(name, pattern) for pattern in file_exclude_patterns):
+                yield os.path.join(root, name)
+
+
+def can_batch(linter: type[Linter]) -> bool:
+    """Return True if `linter` can lint many files in one go."""
+    regex = linter.regex
+    return (
+        bool(linter.tempfile_suffix)
+        and regex is not None
+        and not isinstance(regex, str)
+        and 'filename' in regex.groupindex
+    )
+
+
+def expand_file_markers(cmd: list[str], filenames: list[FileName]) -> list[str]:
+    """Replace the file placeholders in `cmd` with `filenames`.
+
+    If there is no placeholder, the filenames are appended.
+    """
+    rv: list[str] = []
+    for arg in cmd:
+        if arg in FILE_MARKERS:
+            rv.extend(filenames)
+        else:
+            rv.append(arg)
+    if rv == cmd:
+        rv.extend(filenames)
+    return rv
+
+
+def file_context(filename: FileName) -> dict[str, str]:
+    basename = os.path.basename(filename)
+    file_base_name, file_extension = os.path.splitext(basename)
+    return {
+        'file': filename,
+        'file_path': os.path.dirname(filename),
+        'file_name': basename,
+        'file_base_name': file_base_name,
+        'file_extension': file_extension,
+        'file_on_disk': filename,
+        'canonical_filename': filename,
+        'short_canonical_filename': basename,
+    }
+
+
+def plan_batches(
+    view: sublime.View,
+    folder: str,
+    filenames: list[FileName],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    only: set[LinterName] = set()
+) -> list[Batch]:
+    """Group `filenames` into the invocations we need for each linter."""
+    context = linter_module.get_view_context(view, {'reason': 'on_user_request'})
+    scopes: dict[str, str] = {}
+
+    def scope_for(filename: FileName) -> str:
+        # The syntax is usually determined by the extension
+        key = os.path.splitext(filename)[1] or os.path.basename(filename)
+        try:
+            return scopes[key]
+        except KeyError:
+            syntax = sublime.find_syntax_for_file(filename)
+            scopes[key] = scope = syntax.scope if syntax else ''
+            return scope
+
+    batches: list[Batch] = []
+    for name, klass in persist.linter_classes.items():
+        if only and name not in only:
+            continue
+        if klass.disabled is True:
+            continue
+        # Linters with `cmd = None` must implement `run`
+        if klass.run is not linter_module.Linter.run:
+            logger.info("{}: implements its own `run`; skipped.".format(name))
+            continue
+        if klass.parse_output is not linter_module.Linter.parse_output:
+            logger.info("{}: implements its own `parse_output`; skipped.".format(name))
+            continue
+
+        raw_settings = linter_module.get_raw_linter_settings(klass, view)
+        settings = linter_module.LinterSettings(raw_settings, context)
+        if klass.disabled is None and settings.get('disable'):
+            continue
+        selector = settings.get('selector')
+        if not selector:
+            continue
+
+        excludes = settings.get('excludes', [])
+        matching = [
+            filename for filename in filenames
+            if sublime.score_selector(scope_for(filename), selector)
+            and not (excludes and linter_module.excluded_by(filename, excludes))
+        ]
+        if not matching:
+            continue
+
+        batched = can_batch(klass)
+        size = max(1, batch_size) if batched else 1
+        batches.extend(
+            Batch(name, klass, raw_settings, folder, matching[i:i + size], batched)
+            for i in range(0, len(matching), size)
+        )
+    return batches
+
+
+class ProjectLint:
+    """A running lint over all files of a window."""
+
+    def __init__(
+        self,
+        window: sublime.Window,
+        view: sublime.View,
+        only: set[LinterName] = set(),
+        max_workers: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        previous_filenames: set[FileName] = set()
+    ) -> None:
+        self.window = window
+        self.view = view
+        self.only = only
+        self.max_workers = max_workers
+        self.previous_filenames = previous_filenames
+        self.batch_size = batch_size
+        self.cancelled = False
+        self.batches: list[Batch] = []
+        self.filenames_per_linter: defaultdict[LinterName, set[FileName]] = defaultdict(set)
+        self.finished = 0
+        self.error_count = 0
+        self.context = linter_module.get_view_context(view, {'reason': 'on_user_request'})
+        self._futures: list[Future] = []
+        self._procs: set[subprocess.Popen] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        # Walking the folders must not block a worker of the shared executor
+        threading.Thread(target=self.plan, name='SublimeLinterProject', daemon=True).start()
+
+    def plan(self) -> None:
+        settings = self.view.settings()
+        folder_exclude_patterns = settings.get('folder_exclude_patterns') or []
+        file_exclude_patterns = (
+            (settings.get('file_exclude_patterns') or [])
+            + (settings.get('binary_file_patterns') or [])
+        )
+        batches = []
+        for folder in self.window.folders():
+            filenames = list(collect_files(folder, folder_exclude_patterns, file_exclude_patterns))
+            batches.extend(plan_batches(self.view, folder, filenames, self.batch_size, self.only))
+            if self.cancelled:
+                return
+
+        with self._lock:
+            self.batches = batches
+            for batch in batches:
+                self.filenames_per_linter[batch.linter_name].update(batch.filenames)
+        if not batches:
+            self.window.status_message("SublimeLinter: No files to lint in this project")
+            self.done()
+            return
+
+        total_files = len({filename for batch in batches for filename in batch.filenames})
+        logger.info(
+            "Linting {} files in {} invocations".format(total_files, len(batches)))
+        self.report_progress()
+        with self._lock:
+            if self.cancelled:
+                return
+            self._futures = [
+                backend.executor.schedule(
+                    partial(self.run_batch, batch),
+                    scheduler.PRIORITY_BACKGROUND,
+                    owner=('lint_project', self.window.id()),
+                    group=batch.linter_name,
+                    limit=self.limit_for(batch)
+                )
+                for batch in batches
+            ]
+
+    def limit_for(self, batch: Batch) -> Optional[int]:
+        """Return how many processes of the linter of `batch` may run at once."""
+        limits = [
+            n for n in (self.max_workers, batch.raw_settings.get('max_concurrent'))
+            if isinstance(n, int) and n > 0
+        ]
+        return min(limits) if limits else None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.cancelled = True
+            futures, procs = self._futures, list(self._procs)
+        for f in futures:
+            f.cancel()
+        for proc in procs:
+            util.terminate_process(proc)
+        persist.project_filenames[self.window.id()].update(self.previous_filenames)
+        self.window.status_message("SublimeLinter: Cancelled linting the project")
+
+    def run_batch(self, batch: Batch) -> None:
+        if self.cancelled:
+            return
+        try:
+            errors = self.lint(batch)
+        except (linter_module.TransientError, linter_module.PermanentError):
+            errors = None
+        except Exception:
+            logger.exception("{}: linting {} files failed".format(batch.linter_name, len(batch.filenames)))
+            errors = None
+
+        if errors is not None and not self.cancelled:
+            sublime.set_timeout_async(partial(self.report, batch, errors))
+
+        with self._lock:
+            self.finished += 1
+            all_done = self.finished == len(self.batches)
+        if all_done:
+            # Enqueue behind the `report`s above
+            sublime.set_timeout_async(self.done)
+        else:
+            self.report_progress()
+
+    def lint(self, batch: Batch) -> list[LintError]:
+        filename = batch.filenames[0]
+        context = ChainMap(file_context(filename), {'folder': batch.folder}, self.context)
+        linter = batch.klass(self.view, linter_module.LinterSettings(batch.raw_settings, context))
+        cmd = linter.get_cmd()
+        if not cmd:
+            raise linter_module.PermanentError("couldn't find an executable")
+
+        code: Optional[str] = None
+        if batch.batched:
+            cmd = expand_file_markers(
+                [
+                    arg if arg in FILE_MARKERS else linter_module.substitute_variables(linter.context, arg)
+                    for arg in cmd
+                ],
+                batch.filenames
+            )
+        else:
+            linter.context['temp_file'] = filename
+            cmd = linter.finalize_cmd(
+                cmd, linter.context, at_value=filename, auto_append=bool(linter.tempfile_suffix))
+            # Otherwise `normalize_filename` takes it for the main file of the view
+            del linter.context['temp_file']
+            if not linter.tempfile_suffix:
+                vv = linter_module.VirtualView.from_file(filename)
+                code = vv.substr(sublime.Region(0, vv.size()))
+
+        output = self.communicate(linter, cmd, code)
+        if self.cancelled:
+            raise linter_module.TransientError('Cancelled')
+
+        errors = [
+            persist.make_error_record(error)
+            for error in parse_output(linter, output, batch)
+        ]
+        for error in errors:
+            error['linter'] = batch.linter_name
+            error.update({
+                'uid': backend.make_error_uid(error),
+                'priority': style.get_value('priority', error, 0),
+            })
+        return errors
+
+    def communicate(self, linter: Linter, cmd: list[str], code: Optional[str]) -> util.popen_output:
+        output_stream = linter.error_stream
+        try:
+            proc = subprocess.Popen(
+                cmd, env=linter.get_environment(), cwd=linter.get_working_dir(),
+                stdin=subprocess.PIPE if code is not None else None,
+                stdout=subprocess.PIPE if output_stream & util.STREAM_STDOUT else None,
+                stderr=subprocess.PIPE if output_stream & util.STREAM_STDERR else None,
+                startupinfo=util.create_startupinfo(),
+                creationflags=util.get_creationflags(),
+                start_new_session=util.start_new_session()
+            )
+        except Exception as err:
+            logger.error(linter_module.make_nice_log_message(
+                '  Execution failed\n\n  {}'.format(str(err)),
+                cmd, code is not None, linter.get_working_dir(), self.view))
+            raise linter_module.PermanentError("popen constructor failed")
+
+        logger.info("{}: running {}".format(linter.name, ' '.join(cmd)))
+        with self._lock:
+            self._procs.add(proc)
+        try:
+            out = proc.communicate(code.encode('utf8') if code is not None else None)
+        finally:
+            with self._lock:
+                self._procs.discard(proc)
+        return util.popen_output(proc, *out)
+
+    def report(self, batch: Batch, errors: list[LintError]) -> None:
+        if self.cancelled or not self.window.is_valid():
+            return
+
+        grouped: defaultdict[FileName, list[LintError]] = defaultdict(list)
+        for error in errors:
+            grouped[error['filename']].append(error)
+
+        # Linters may report errors for files we didn't ask for, e.g. for
+        # imported modules.  If another batch lints such a file, *its* result
+        # is the complete one.  Otherwise we report the file on its own, and
+        # it will be forgotten by the next run if it isn't reported again.
+        in_batch = set(batch.filenames)
+        linted_elsewhere = self.filenames_per_linter[batch.linter_name] - in_batch
+        for filename in grouped.keys() & linted_elsewhere:
+            logger.info(
+                "{}: ignoring {} errors for {} which is linted in another batch"
+                .format(batch.linter_name, len(grouped[filename]), filename))
+        others = [
+            filename for filename in grouped
+            if filename not in in_batch and filename not in linted_elsewhere
+        ]
+
+        # Results of files with unsaved changes are outdated already
+        main_filenames = [
+            filename for filename in batch.filenames + others
+            if not ((view := self.window.find_open_file(filename)) and view.is_dirty())
+        ]
+        if not main_filenames:
+            return
+
+        persist.project_filenames[self.window.id()].update(main_filenames)
+        for filename in main_filenames:
+            errors_ = grouped.get(filename, [])
+            self.error_count += len(errors_)
+            persist.group_by_filename_and_update(
+                self.window, filename, 'on_user_request', batch.linter_name, errors_)
+
+    def report_progress(self) -> None:
+        if not self.cancelled:
+            self.window.status_message(
+                "SublimeLinter: Linting project {}/{}".format(self.finished, len(self.batches)))
+
+    def done(self) -> None:
+        if runs.get(self.window.id()) is self:
+            del runs[self.window.id()]
+        if self.cancelled:
+            return
+        if self.only:
+            persist.project_filenames[self.window.id()].update(self.previous_filenames)
+        else:
+            # Files which we don't lint anymore, e.g. deleted ones
+            forget_files(
+                self.window,
+                self.previous_filenames - persist.project_filenames[self.window.id()]
+            )
+        if not self.batches:
+            return
+        self.window.status_message(
+            "SublimeLinter: Linted {} files, found {} problem{}".format(
+                len({filename for batch in self.batches for filename in batch.filenames}),
+                self.error_count,
+                '' if self.error_count == 1 else 's'
+            )
+        )
+
+
+def forget_files(window: sublime.Window, filenames: set[FileName]) -> None:
+    """Clear the errors of `filenames` unless they're open."""
+    for filename in filenames:
+        if window.find_open_file(filename):
+            continue
+        for linter_name in {error['linter'] for error in persist.file_errors.get(filename, [])}:
+            persist.update_file_errors(filename, linter_name, [])
+        persist.file_errors.pop(filename, None)
+        error_index.forget(filename)
+        persist.affected_filenames_per_filename.pop(filename, None)
+
+
+def parse_output(
+    linter: Linter,
+    output: Union[str, util.popen_output],
+    batch: Batch
+) -> list[LintError]:
+    """Parse `output` and attribute the errors to the files of `batch`."""
+    if isinstance(output, util.popen_output):
+        output = linter.select_output(output)
+    if not output:
+        logger.info('{}: no output'.format(linter.name))
+        return []
+
+    # `process_match` takes the filename of the view as the "main file" and
+    # will use the virtual view we pass in here for its errors.
+    vv = linter_module.VirtualView('')
+    if linter.filename:
+        try:
+            vv = linter_module.VirtualView.from_file(linter.filename)
+        except OSError:
+            pass
+    errors = [
+        error
+        for m in attribute_matches(linter, linter.find_errors(output), batch)
+        if (error := linter.process_match(m, vv))
+    ]
+    return linter.filter_errors(errors)
+
+
+def attribute_matches(
+    linter: Linter,
+    matches: Iterable[linter_module.LintMatch],
+    batch: Batch
+) -> Iterator[linter_module.LintMatch]:
+    """Set the filename of `matches` which don't name their file."""
+    main_filename = batch.filenames[0]
+    for m in matches:
+        if not m.filename or linter.is_stdin_filename(m.filename):
+            # Without a filename, we don't know which file of a batch
+            # is meant.
+            if batch.batched:
+                logger.info("{}: ignoring error without a filename: {}".format(linter.name, m))
+                continue
+            m = m._replace(filename=main_filename)
+        yield m
+
+
+runs: dict[sublime.WindowId, ProjectLint] = {}
+
+
+def lint_project(window: sublime.Window, view: sublime.View, only: set[LinterName] = set()) -> ProjectLint:
+    """Start linting all files in the folders of `window`."""
+    cancel(window)
+    run = runs[window.id()] = ProjectLint(
+        window, view, only,
+        max_workers=persist.settings.get('lint_project.max_workers') or None,
+        batch_size=persist.settings.get('lint_project.batch_size') or DEFAULT_BATCH_SIZE,
+        previous_filenames=persist.project_filenames.pop(window.id(), set())
+    )
+    run.start()
+    return run
+
+
+def is_running(window: sublime.Window) -> bool:
+    return window.id() in runs
+
+
+def cancel(window: sublime.Window) -> bool:
+    run = runs.pop(window.id(), None)
+    if run:
+        run.cancel()
+        return True
+    return False
+
+
+def cancel_all() -> None:
+    for run in list(runs.values()):
+        run.cancel()
+    runs.clear()
@@ -0,0 +1,261 @@
+"""An in-memory, content-addressed cache for lint results.
+
+Undo/redo, toggling between two states of a buffer, or re-saving unchanged
+content would otherwise spawn every linter again although the outcome is
+the same.  We cache the *raw* errors of a lint task, t.i. before
+`finalize_errors` applies the offsets of the linted region, so that a cached
+result can be re-offset for a region at a different position as well.
+
+Linters which read the file from disk (`tempfile_suffix = '-'`) or which
+implement their own `run` are never cached.  The result also depends on the
+executable and on config files on disk, so the key contains the identity of
+the resolved executable and the mtimes of the config files between the file
+and the working dir.  Additionally, we drop the results of the *other* files
+in the folder of a saved file, and below.
+"""
+from __future__ import annotations
+from collections import ChainMap, OrderedDict
+import hashlib
+import logging
+import os
+import threading
+
+import sublime
+
+from . import discovery, linter as linter_module, persist, spawn_cache, util
+
+from typing import Any, Hashable, Iterator, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .linter import Linter
+    from .persist import LintError
+
+
+CacheKey = Hashable
+FileName = str
+
+MAX_SIZE = 16 * 1024 * 1024  # bytes
+# Rough per-entry and per-error overhead of the Python objects we hold on to
+ENTRY_OVERHEAD = 200
+ERROR_OVERHEAD = 400
+CONFIG_FILE_EXTENSIONS = ('.cfg', '.ini', '.json', '.toml', '.yaml', '.yml')
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """LRU cache which evicts by (estimated) size in bytes."""
+
+    def __init__(self, max_size: int = MAX_SIZE) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[CacheKey, tuple[FileName, list[LintError], int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey) -> list[LintError] | None:
+        with self._lock:
+            try:
+                _, errors, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_errors(errors)
+
+    def put(self, key: CacheKey, filename: FileName, errors: list[LintError]) -> None:
+        errors = copy_errors(errors)
+        size = estimate_size(errors)
+        if size > self.max_size:
+            return
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (filename, errors, size)
+            self._size += size
+            while self._size > self.max_size:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def discard_below(self, folder: str, keep: Optional[FileName] = None) -> None:
+        """Drop the results of all files inside `folder`, except for `keep`."""
+        with self._lock:
+            for key in [
+                key for key, (filename, _, _) in self._entries.items()
+                if filename != keep and util.is_below(filename, folder)
+            ]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self._size,
+            }
+
+    def _discard(self, key: CacheKey) -> None:
+        # Must be called with the lock held.
+        try:
+            _, _, size = self._entries.pop(key)
+        except KeyError:
+            pass
+        else:
+            self._size -= size
+
+
+cache = ResultCache()
+
+
+def make_key(linter: Linter, code: str) -> CacheKey | None:
+    """Compute the cache key for linting `code` with `linter`.
+
+    Return `None` if the result of the linter cannot be cached.
+    """
+    if (
+        type(linter).run is not linter_module.Linter.run
+        or linter.tempfile_suffix == '-'
+    ):
+        return None
+
+    spec = spawn_cache.get_spawn_spec(linter)
+    if spec is None:
+        return None
+    executable = executable_identity(spec.cmd[0])
+    if executable is None:
+        return None
+
+    context = linter.context
+    return (
+        linter.name,
+        type(linter).__qualname__,
+        fingerprint(spec.cmd),
+        executable,
+        settings_fingerprint(linter.settings),
+        tuple(context.get(key) for key in spawn_cache.CONTEXT_KEYS_FOR_KEY),
+        persist.settings.change_count(),
+        config_fingerprint(linter, spec.cwd),
+        content_hash(linter, code),
+    )
+
+
+def executable_identity(executable: str) -> tuple[str, int, int] | None:
+    try:
+        stat = os.stat(executable)
+    except OSError:
+        return None
+    return (executable, stat.st_size, stat.st_mtime_ns)
+
+
+def config_fingerprint(linter: Linter, stop_at: Optional[str]) -> str:
+    filename = linter.context.get('file')
+    if not filename:
+        return ''
+
+    entries = sorted(config_files(os.path.dirname(filename), stop_at))
+    return fingerprint(entries)
+
+
+def config_files(start_dir: str, stop_at: Optional[str]) -> Iterator[tuple[str, int]]:
+    """Yield the config files and their mtimes from `start_dir` up to `stop_at`.
+
+    Which files exist is memoized per directory, we only `stat` the files
+    themselves.
+    """
+    for path in util.paths_upwards_until_home(start_dir):
+        for name in discovery.cache.ask(path, 'config_files', lambda: list_config_files(path)):
+            try:
+                yield os.path.join(path, name), os.stat(os.path.join(path, name)).st_mtime_ns
+            except OSError:
+                pass
+
+        if not stop_at or os.path.normcase(path) == os.path.normcase(stop_at):
+            return
+
+
+def list_config_files(path: str) -> list[str]:
+    try:
+        with os.scandir(path) as it:
+            return sorted(
+                entry.name for entry in it
+                if is_config_file(entry.name) and entry.is_file()
+            )
+    except OSError:
+        return []
+
+
+def is_config_file(name: str) -> bool:
+    return (
+        name.startswith('.')
+        or name.endswith(CONFIG_FILE_EXTENSIONS)
+        or name.endswith('rc')
+    )
+
+
+def content_hash(linter: Linter, code: str) -> str:
+    snapshot = linter.snapshot_of(code)
+    if snapshot:
+        return snapshot.hash
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def settings_fingerprint(settings: Any) -> Hashable:
+    """Fingerprint the settings of a linter.
+
+    Instead of enumerating the settings of the view, we take its change
+    count.
+    """
+    # Tests often pass in plain dicts instead of `LinterSettings`
+    raw_settings = getattr(settings, 'raw_settings', settings)
+    if not isinstance(raw_settings, ChainMap):
+        return fingerprint(raw_settings)
+    return tuple(
+        (settings_.view.id(), linter_module.view_settings_change_count(settings_.view))
+        if isinstance(settings_, linter_module.ViewSettings)
+        else fingerprint(settings_)
+        for settings_ in raw_settings.maps
+    )
+
+
+def fingerprint(value: Any) -> str:
+    return hashlib.sha256(repr(normalize(value)).encode('utf-8')).hexdigest()
+
+
+def normalize(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, 'items'):
+        return sorted((str(k), normalize(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return repr(value)
+
+
+def copy_errors(errors: list[LintError]) -> list[LintError]:
+    return [copy_error(error) for error in errors]
+
+
+def copy_error(error: LintError) -> LintError:
+    # `finalize_errors` mutates the errors *and* their regions in place.
+    rv = error.copy()
+    region = error.get('region')
+    if region is not None:
+        rv['region'] = sublime.Region(region.a, region.b)
+    return rv
+
+
+def estimate_size(errors: list[LintError]) -> int:
+    return ENTRY_OVERHEAD + sum(
+        ERROR_OVERHEAD + sum(len(v) for v in error.values() if isinstance(v, str))
+        for error in errors
+    )
@@ -0,0 +1,280 @@
+"""A priority aware thread pool for lint jobs.
+
+A plain `ThreadPoolExecutor` works strictly FIFO.  For us that means that
+a `relint_views` storm after a settings change puts all background tabs in
+front of the view the user is actually typing in.  The `PriorityExecutor`
+below instead picks the next work item by
+
+  - priority class: the active view, then other visible views, then
+    everything else (background views, relints),
+  - and within the same class round-robin per owner (usually a buffer),
+    so that one buffer with many tasks (e.g. `enable_cells`) cannot starve
+    the other buffers.
+
+Queued low priority work is thus effectively preempted as soon as higher
+prioritized work comes in.  Already running work is never interrupted.
+
+On top of that the executor does admission control: work items can belong
+to a `group` (usually the linter name) with a `limit` of concurrently
+running items, and the executor can have a global `budget` shared by all
+grouped items.  Items which are not admissible stay queued; they don't
+block a worker thread.  Last but not least, queued items with the same
+`coalesce_key` replace each other so that only the newest one runs.
+"""
+from __future__ import annotations
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+import logging
+import threading
+
+import sublime
+
+from typing import Any, Callable, Hashable, TypeVar
+from typing_extensions import ParamSpec
+
+
+P = ParamSpec('P')
+T = TypeVar('T')
+Owner = Hashable
+
+PRIORITY_ACTIVE = 0
+PRIORITY_VISIBLE = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_NAMES = {
+    PRIORITY_ACTIVE: 'active',
+    PRIORITY_VISIBLE: 'visible',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class WorkItem:
+    future: Future
+    fn: Callable[[], Any]
+    priority: int
+    owner: Owner = field(default=None)
+    group: Hashable = None
+    limit: int | None = None
+    coalesce_key: Hashable = None
+
+    def run(self) -> None:
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            result = self.fn()
+        except BaseException as exc:
+            self.future.set_exception(exc)
+        else:
+            self.future.set_result(result)
+
+
+class PriorityExecutor(Executor):
+    def __init__(
+        self,
+        max_workers: int,
+        thread_name_prefix: str = 'SublimeLinter',
+        budget: Callable[[], int | None] | None = None
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._budget = budget
+        self._condition = threading.Condition()
+        self._queues: dict[int, OrderedDict[Owner, deque[WorkItem]]] = {}
+        self._pending: dict[Hashable, WorkItem] = {}
+        self._running: Counter[Hashable] = Counter()
+        self._rejected = 0
+        self._threads: set[threading.Thread] = set()
+        self._idle_workers = 0
+        self._shutdown = False
+
+    def submit(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+        # Stay compatible with the standard `Executor` interface.  Subclasses
+        # can derive the priority from the arguments, see `scheduling_hints`.
+        return self.schedule(lambda: fn(*args, **kwargs), **self.scheduling_hints(args))
+
+    def scheduling_hints(self, args: tuple) -> dict[str, Any]:
+        """Return the keyword arguments for `schedule` for work submitted via `submit`."""
+        return {}
+
+    def schedule(
+        self,
+        fn: Callable[[], T],
+        priority: int = PRIORITY_BACKGROUND,
+        owner: Owner = None,
+        group: Hashable = None,
+        limit: int | None = None,
+        coalesce_key: Hashable = None
+    ) -> Future[T]:
+        """Enqueue `fn` with the given `priority` for the given `owner`.
+
+        At most `limit` items of the same `group` run at the same time.  If
+        an item with the same `coalesce_key` is still queued, it gets
+        cancelled and replaced by this one.
+        """
+        f: Future[T] = Future()
+        item = WorkItem(f, fn, priority, owner, group, limit, coalesce_key)
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+
+            if coalesce_key is not None:
+                previous = self._pending.pop(coalesce_key, None)
+                if previous:
+                    self._remove(previous)
+                    previous.future.cancel()
+                    self._rejected += 1
+                self._pending[coalesce_key] = item
+
+            queue = self._queues.setdefault(priority, OrderedDict())
+            queue.setdefault(owner, deque()).append(item)
+            self._adjust_thread_count()
+            self._condition.notify()
+        return f
+
+    def shutdown(self, wait: bool = True, **kwargs: Any) -> None:
+        with self._condition:
+            self._shutdown = True
+            for queue in self._queues.values():
+                for items in queue.values():
+                    for item in items:
+                        item.future.cancel()
+            self._queues.clear()
+            self._pending.clear()
+            self._condition.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def queued_count(self, priority: int | None = None) -> int:
+        with self._condition:
+            return sum(
+                len(items)
+                for prio, queue in self._queues.items()
+                if priority is None or prio == priority
+                for items in queue.values()
+            )
+
+    def state(self) -> dict[str, Any]:
+        """Return a snapshot of the running, queued and rejected work."""
+        with self._condition:
+            return {
+                'running': {
+                    group: n for group, n in self._running.items()
+                    if group is not None and n
+                },
+                'running_total': sum(self._running.values()),
+                'queued': {
+                    PRIORITY_NAMES.get(priority, priority): n
+                    for priority, queue in sorted(self._queues.items())
+                    if (n := sum(len(items) for items in queue.values()))
+                },
+                'rejected': self._rejected,
+            }
+
+    def _adjust_thread_count(self) -> None:
+        # Must be called with the lock held.
+        if self._idle_workers > 0 or len(self._threads) >= self._max_workers:
+            return
+
+        thread = threading.Thread(
+            target=self._worker,
+            name='{}_{}'.format(self._thread_name_prefix, len(self._threads)),
+            daemon=True
+        )
+        self._threads.add(thread)
+        thread.start()
+
+    def _remove(self, item: WorkItem) -> None:
+        # Must be called with the lock held.
+        queue = self._queues[item.priority]
+        items = queue[item.owner]
+        items.remove(item)
+        if not items:
+            del queue[item.owner]
+
+    def _is_admissible(self, item: WorkItem) -> bool:
+        # Must be called with the lock held.
+        if item.group is None:
+            return True
+        if item.limit and self._running[item.group] >= item.limit:
+            return False
+        budget = self._budget() if self._budget else None
+        if budget and sum(self._running.values()) - self._running[None] >= budget:
+            return False
+        return True
+
+    def _next_item(self) -> WorkItem | None:
+        # Must be called with the lock held.
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            # Round-robin between the owners of this priority class: take
+            # the first admissible item of the first owner, then move that
+            # owner to the end.
+            for owner, items in queue.items():
+                for item in items:
+                    if self._is_admissible(item):
+                        break
+                else:
+                    continue
+
+                items.remove(item)
+                if items:
+                    queue.move_to_end(owner)
+                else:
+                    del queue[owner]
+                if self._pending.get(item.coalesce_key) is item:
+                    del self._pending[item.coalesce_key]
+                self._running[item.group] += 1
+                return item
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._condition:
+                item = self._next_item()
+                while item is None:
+                    if self._shutdown:
+                        self._threads.discard(threading.current_thread())
+                        return
+                    self._idle_workers += 1
+                    self._condition.wait()
+                    self._idle_workers -= 1
+                    item = self._next_item()
+
+            item.run()
+            with self._condition:
+                self._running[item.group] -= 1
+                # Finished work may make blocked items admissible again.
+                self._condition.notify_all()
+            del item
+
+
+def priority_for_view(view: sublime.View) -> int:
+    """Compute the priority class for linting the given view.
+
+    The active view of the active window gets the highest priority, views
+    visible in any group of any window come next, everything else is
+    background work.
+    """
+    bid = view.buffer_id()
+    active_window = sublime.active_window()
+    active_view = active_window.active_view() if active_window else None
+    if active_view and active_view.buffer_id() == bid:
+        return PRIORITY_ACTIVE
+
+    for window in sublime.windows():
+        for group in range(window.num_groups()):
+            visible_view = window.active_view_in_group(group)
+            if visible_view and visible_view.buffer_id() == bid:
+                return PRIORITY_VISIBLE
+
+    return PRIORITY_BACKGROUND
@@ -0,0 +1,64 @@
+"""Immutable snapshots of the code we lint.
+
+A lint request fans out to every linter and every region of a view.  Each
+of these tasks needs the same text, the task spawning the process needs
+it UTF-8 encoded, the result cache needs a hash of it, and the parser
+needs to map offsets to lines.  A `Snapshot` computes each of these
+at most once and is shared by all tasks of a lint request.
+
+The derived values are computed lazily and without locking.  Two threads
+racing may compute the same value twice, which is harmless as the
+outcome is equal.
+"""
+from __future__ import annotations
+from array import array
+import hashlib
+from itertools import accumulate
+
+
+class Snapshot:
+    __slots__ = ('text', '_encoded', '_hash', '_line_offsets')
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._encoded: bytes | None = None
+        self._hash: str | None = None
+        self._line_offsets: array[int] | None = None
+
+    def __repr__(self) -> str:
+        return '<Snapshot size={}>'.format(len(self.text))
+
+    @property
+    def encoded(self) -> bytes:
+        """The text as UTF-8 encoded bytes."""
+        if self._encoded is None:
+            self._encoded = self.text.encode('utf8')
+        return self._encoded
+
+    @property
+    def hash(self) -> str:
+        """The sha256 hex digest of the encoded text."""
+        if self._hash is None:
+            self._hash = hashlib.sha256(self.encoded).hexdigest()
+        return self._hash
+
+    @property
+    def line_offsets(self) -> array[int]:
+        """The character offsets at which the lines of the text begin."""
+        if self._line_offsets is None:
+            self._line_offsets = compute_line_offsets(self.text)
+        return self._line_offsets
+
+
+def compute_line_offsets(code: str) -> array[int]:
+    newlines = array('q', accumulate(
+        map(len, code.splitlines(keepends=True)),
+        initial=0
+    ))
+    # A trailing "\n" *begins* a new line.
+    # Refer the two interpretations of "split":
+    #   "mypy\n".splitlines(keepends=True) == ['mypy\n']
+    #   "mypy\n".split("\n")               == ['mypy', '']
+    if code.endswith("\n"):
+        newlines.append(len(code))
+    return newlines
@@ -0,0 +1,182 @@
+"""Cache what we need to spawn a linter: the command, cwd and env.
+
+Computing the command line is surprisingly expensive.  We split `cmd`,
+resolve the executable which for Node and Python linters means walking
+up the directory tree and scanning the PATH, build the args from the
+settings, and compute the working dir and the environment.  The outcome
+only changes if the settings change, so we compute it once per linter,
+settings and file and reuse it for every keystroke.
+
+Only the per-lint variables, t.i. `${temp_file}` and `${file_on_disk}`, are
+substituted when we actually spawn, see `Linter.finalize_cmd`.
+
+Some linters store what they found while computing the command, e.g.
+`project_root` in `self.context` or a `VIRTUAL_ENV` in `self.env`.  We
+record these side-effects and replay them on a cache hit.  Of the
+environment we only store what `get_environment` adds on top of
+`linter.env`, and rebuild it for every lint, see `environment_of`.
+
+Note that we also cache what plugins compute in their own `cmd`,
+`get_working_dir` or `get_environment` methods.  These must only depend
+on the settings and the file.
+
+The cache is cleared whenever the global settings change.  Saving a file
+drops the specs of the files in its folder and below, as it might have
+changed a config file.
+"""
+from __future__ import annotations
+from collections import ChainMap, OrderedDict
+from dataclasses import dataclass
+import logging
+import threading
+
+from . import events, linter as linter_module, persist, result_cache, util
+
+from typing import Hashable, Mapping, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .linter import Linter
+
+
+CacheKey = Hashable
+FileName = str
+
+MAX_ENTRIES = 256
+# The variables the outcome of `get_cmd` depends on.  `project_root` is not
+# among them as linters derive it from the 'file' while computing the cmd.
+CONTEXT_KEYS_FOR_KEY = ('file', 'folder', 'project_path', 'canonical_filename')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SpawnSpec:
+    cmd: tuple[str, ...]
+    cwd: Optional[str]
+    # What `get_environment` adds on top of `linter.env`
+    env: Mapping[str, str]
+    # What `get_cmd` added to `linter.context` and `linter.env`
+    context: Mapping[str, str]
+    linter_env: Mapping[str, str]
+
+
+class SpawnCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, tuple[Optional[FileName], SpawnSpec]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey) -> SpawnSpec | None:
+        with self._lock:
+            try:
+                _, spec = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def put(self, key: CacheKey, spec: SpawnSpec, filename: Optional[FileName] = None) -> None:
+        with self._lock:
+            self._entries[key] = (filename, spec)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_below(self, folder: str) -> None:
+        """Drop the specs computed for files inside `folder`."""
+        with self._lock:
+            for key in [
+                key for key, (filename, _) in self._entries.items()
+                if filename and util.is_below(filename, folder)
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+            }
+
+
+cache = SpawnCache()
+
+
+@events.on('settings_changed')
+def on_settings_changed(settings, **kwargs):
+    cache.clear()
+
+
+def make_key(linter: Linter) -> CacheKey:
+    context = linter.context
+    return (
+        type(linter),
+        result_cache.settings_fingerprint(linter.settings),
+        tuple(context.get(key) for key in CONTEXT_KEYS_FOR_KEY),
+        persist.settings.change_count(),
+    )
+
+
+def get_spawn_spec(linter: Linter) -> SpawnSpec | None:
+    """Return the spawn spec for `linter`, computing it on a cache miss.
+
+    Apply the side-effects of `get_cmd` to `linter` in any case.  Return
+    `None` if there is no executable.
+    """
+    try:
+        key: CacheKey | None = make_key(linter)
+    except Exception:
+        logger.exception('Computing the spawn cache key failed:\n', extra={'demote': True})
+        key = None
+
+    spec = cache.get(key) if key is not None else None
+    if spec is None:
+        spec = compute_spawn_spec(linter)
+        if spec is None:
+            return None
+        if key is not None:
+            cache.put(key, spec, linter.context.get('file'))
+    else:
+        linter.context.update(spec.context)
+        linter.env.update(spec.linter_env)
+    return spec
+
+
+def compute_spawn_spec(linter: Linter) -> SpawnSpec | None:
+    context_before = dict(linter.context)
+    env_before = dict(linter.env)
+    cmd = linter.get_cmd()
+    if not cmd:
+        return None
+
+    return SpawnSpec(
+        cmd=tuple(cmd),
+        cwd=linter.get_working_dir(),
+        env=changed_items(
+            ChainMap(linter.env, linter_module.BASE_LINT_ENVIRONMENT),
+            linter.get_environment()
+        ),
+        context=changed_items(context_before, linter.context),
+        linter_env=changed_items(env_before, linter.env),
+    )
+
+
+def environment_of(linter: Linter, spec: SpawnSpec) -> ChainMap[str, str]:
+    """Rebuild the environment of `spec` for this lint of `linter`."""
+    return ChainMap({}, dict(spec.env), linter.env, linter_module.BASE_LINT_ENVIRONMENT)
+
+
+def changed_items(before: Mapping[str, str], after: Mapping[str, str]) -> dict[str, str]:
+    return {
+        key: value
+        for key, value in after.items()
+        if key not in before or before[key] != value
+    }
@@ -9,14 +9,14 @@ import locale
 import logging
 import os
 import re
-import shutil
+import signal
 import subprocess
 import sys
 import time
 import threading
 
 import sublime
-from . import events
+from . import discovery, events
 from .const import IS_ENABLED_SWITCH
 
 
@@ -35,6 +35,8 @@ HOME = os.path.expanduser('~')
 STREAM_STDOUT = 1
 STREAM_STDERR = 2
 STREAM_BOTH = STREAM_STDOUT + STREAM_STDERR
+# Seconds a terminated process gets to exit before we kill it
+KILL_GRACE_PERIOD = 2.0
 
 ANSI_COLOR_RE = re.compile(r'\033\[[0-9;]*m')
 ERROR_PANEL_NAME = "SublimeLinter Messages"
@@ -216,7 +218,7 @@ def read_json_file(path: str) -> dict[str, Any]:
     return _read_json_file(path, os.path.getmtime(path))
 
 
-@lru_cache(maxsize=16)
+@lru_cache(maxsize=128)
 def _read_json_file(path: str, _mtime: float) -> dict[str, Any]:
     with open(path, 'r', encoding='utf8') as f:
         return json.load(f)
@@ -247,6 +249,12 @@ def paths_upwards_until_home(path: str) -> Iterator[str]:
     return takewhile(lambda p: p != HOME, paths_upwards(path))
 
 
+def is_below(filename: str, folder: str) -> bool:
+    """Return True if `filename` is `folder` or inside of it."""
+    filename, folder = os.path.normcase(filename), os.path.normcase(folder)
+    return filename == folder or filename.startswith(os.path.join(folder, ''))
+
+
 def get_syntax(view: sublime.View) -> str:
     """
     Return a short syntax name used as a key against "syntax_map"
@@ -330,13 +338,13 @@ def get_augmented_path() -> str:
 
 def which(cmd: str) -> str | None:
     """Return the full path to an executable searching PATH."""
-    return shutil.which(cmd, path=get_augmented_path())
+    return discovery.which(cmd, get_augmented_path())
 
 
 def where(executable: str) -> Iterator[str]:
     """Yield full paths to given executable."""
     for path in get_augmented_path().split(os.pathsep):
-        resolved = shutil.which(executable, path=path)
+        resolved = discovery.which(executable, path)
         if resolved:
             yield resolved
 
@@ -441,6 +449,83 @@ def get_creationflags():
         return 0
 
 
+def start_new_session():
+    # Run in an own process group, so that we can signal the whole tree
+    # of processes a linter might spawn.
+    return sys.platform != "win32"
+
+
+def terminate_process(proc: subprocess.Popen, grace_period: float = KILL_GRACE_PERIOD) -> None:
+    """Terminate `proc`, and kill its process group after `grace_period`."""
+    if proc.poll() is not None:
+        return
+    # Remember the group now.  The leader might exit on the first signal
+    # while its children ignore it and keep our pipes open.
+    pgid = process_group_of(proc)
+    signal_process(proc, pgid, force=False)
+    timer = threading.Timer(grace_period, kill_process, (proc, pgid))
+    timer.daemon = True
+    timer.start()
+
+
+def kill_process(proc: subprocess.Popen, pgid: Optional[int] = None) -> None:
+    # As long as the leader is not reaped, its pid and thus the group id are
+    # still ours.  Afterwards, the group id can be reused as soon as the
+    # group is empty, so we only signal if it still has members.
+    if proc.poll() is not None and (pgid is None or not process_group_exists(pgid)):
+        return
+    logger.info("Kill <pid {}> after it did not terminate".format(proc.pid))
+    signal_process(proc, pgid, force=True)
+
+
+def process_group_of(proc: subprocess.Popen) -> Optional[int]:
+    """Return the process group of `proc` if it leads its own group."""
+    if sys.platform == "win32":
+        return None
+    try:
+        pgid = os.getpgid(proc.pid)
+    except (ProcessLookupError, PermissionError):
+        return None
+    return pgid if pgid == proc.pid else None
+
+
+def process_group_exists(pgid: int) -> bool:
+    try:
+        os.killpg(pgid, 0)
+    except (ProcessLookupError, PermissionError):
+        return False
+    return True
+
+
+def signal_process(proc: subprocess.Popen, pgid: Optional[int], force: bool) -> None:
+    try:
+        if sys.platform == "win32":
+            if force:
+                # Also kill the children, `TerminateProcess` alone doesn't.
+                subprocess.call(
+                    ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    startupinfo=create_startupinfo()
+                )
+            else:
+                try:
+                    proc.send_signal(signal.CTRL_BREAK_EVENT)
+                except OSError:
+                    proc.terminate()
+        elif pgid is not None:
+            # The group outlives its leader as long as it has members, and
+            # its id is not reused until then.  `kill_process` checks that
+            # before it signals the group after the grace period.
+            os.killpg(pgid, signal.SIGKILL if force else signal.SIGTERM)
+        elif force:
+            proc.kill()
+        else:
+            proc.terminate()
+    except (ProcessLookupError, PermissionError):
+        # Already gone
+        pass
+
+
 # misc utils
 
 
@@ -1,18 +1,20 @@
 from __future__ import annotations
-from collections import defaultdict
+from collections import Counter, defaultdict, OrderedDict
 from functools import lru_cache, partial
 from itertools import chain
 import os
 import sublime
 import sublime_plugin
 import textwrap
+import threading
+import time
 import uuid
 
 from .lint import elect, events, persist, util
 
 from typing import (
-    Any, Callable, Collection, Dict, Iterable, List,
-    Optional, TypedDict, TypeVar
+    Any, Callable, Collection, Dict, Iterable, List, Mapping,
+    Optional, Tuple, TypedDict, TypeVar
 )
 
 
@@ -24,6 +26,8 @@ LinterName = persist.LinterName
 Reason = Optional[str]
 Action = Callable[[], None]
 ErrorsByFile = Dict[FileName, List[LintError]]
+# begin, end, replacement, expected size of the panel before the edit
+PanelEdit = Tuple[int, int, str, int]
 
 
 class State_(TypedDict):
@@ -36,6 +40,7 @@ class State_(TypedDict):
 class DrawInfo(TypedDict, total=False):
     panel: sublime.View
     content: str
+    edit: PanelEdit
     errors_from_active_view: list[LintError]
     nearby_lines: int | list[int]
 
@@ -68,6 +73,7 @@ def plugin_unloaded():
 
     for window in sublime.windows():
         window.destroy_output_panel(PANEL_NAME)
+    rendered_panels.clear()
 
 
 LINT_RESULT_CACHE: defaultdict[str, list[tuple[FileName, Reason]]] = defaultdict(list)
@@ -185,7 +191,20 @@ class UpdateState(sublime_plugin.EventListener):
         else:
             stop_viewport_poller()
 
+    # Sublime has no events for scrolling.  But scrolling usually comes
+    # along with, or after, one of the following events, so we use them as
+    # a hint to watch the viewport closely again.
+    def on_modified_async(self, view):
+        poke_viewport_poller()
+
+    def on_post_text_command(self, view, command_name, args):
+        poke_viewport_poller()
+
+    def on_hover(self, view, point, hover_zone):
+        poke_viewport_poller()
+
     def on_selection_modified_async(self, view):
+        poke_viewport_poller()
         active_view = State['active_view']
         # Do not race between `plugin_loaded` and this event handler
         if active_view is None:
@@ -344,11 +363,12 @@ def draw(draw_info: DrawInfo) -> None:
 def draw_(
     panel: sublime.View,
     content: str = None,
+    edit: PanelEdit = None,
     errors_from_active_view: list[LintError] = [],
     nearby_lines: int | list[int] | None = None
 ) -> None:
     if content is not None:
-        update_panel_content(panel, content)
+        update_panel_content(panel, content, edit)
 
     if nearby_lines is None:
         mark_lines(panel, None)
@@ -364,12 +384,12 @@ def draw_(
         scroll_into_view(panel, [nearby_lines], errors_from_active_view)
 
 
-def get_window_errors(window: sublime.Window, errors_by_file: ErrorsByFile) -> ErrorsByFile:
+def get_window_errors(
+    window: sublime.Window,
+    errors_by_file: Mapping[FileName, List[LintError]]
+) -> ErrorsByFile:
     return {
-        filename: sorted(
-            errors,
-            key=lambda e: (e["line"], e["start"], e["linter"], e["region"].end())
-        )
+        filename: sort_errors(filename, errors)
         for filename, errors in (
             (filename, errors_by_file.get(filename))
             for filename in filenames_per_window(window)
@@ -378,6 +398,37 @@ def get_window_errors(window: sublime.Window, errors_by_file: ErrorsByFile) -> E
     }
 
 
+MAX_SORTED_FILES = 512
+sorted_errors_cache: OrderedDict[FileName, tuple[list[LintError], list[LintError]]] = OrderedDict()
+sorted_errors_lock = threading.Lock()
+
+
+def sort_errors(filename: FileName, errors: list[LintError]) -> list[LintError]:
+    """Sort `errors` by position, reusing the result while `errors` is unchanged.
+
+    The error store *replaces* the list of a file when its errors change,
+    so we can recognize unchanged errors by identity.  Returning the same
+    sorted list again in turn lets `fill_panel` reuse the text it has
+    rendered for this file.
+    """
+    with sorted_errors_lock:
+        cached = sorted_errors_cache.get(filename)
+        if cached is not None and cached[0] is errors:
+            sorted_errors_cache.move_to_end(filename)
+            return cached[1]
+
+    rv = sorted(
+        errors,
+        key=lambda e: (e["line"], e["start"], e["linter"], e["region"].end())
+    )
+    with sorted_errors_lock:
+        sorted_errors_cache[filename] = (errors, rv)
+        sorted_errors_cache.move_to_end(filename)
+        while len(sorted_errors_cache) > MAX_SORTED_FILES:
+            sorted_errors_cache.popitem(last=False)
+    return rv
+
+
 def buffer_ids_per_window(window):
     return {v.buffer_id() for v in window.views()}
 
@@ -385,7 +436,7 @@ def buffer_ids_per_window(window):
 def filenames_per_window(window: sublime.Window) -> set[FileName]:
     """Return filenames of all open files plus their dependencies."""
     open_filenames = set(util.canonical_filename(v) for v in window.views())
-    return open_filenames | set(
+    return open_filenames | persist.project_filenames.get(window.id(), set()) | set(
         flatten(
             flatten(persist.affected_filenames_per_filename[filename].values())
             for filename in open_filenames
@@ -467,8 +518,13 @@ def _format_error(
     return rv
 
 
-def fill_panel(window: sublime.Window) -> None:
-    """Create the panel if it doesn't exist, then update its contents."""
+def fill_panel(window: sublime.Window, follow_cursor: bool = True) -> None:
+    """Create the panel if it doesn't exist, then update its contents.
+
+    Usually we also mark and scroll to the errors under the cursor of
+    the active view.  With `follow_cursor=False` we only update the content,
+    e.g. when the user scrolls the panel, and shouldn't be disturbed.
+    """
     panel = ensure_panel(window)
     # If we're here and the user actually closed the *window* in the meantime,
     # we cannot create a panel anymore, and just pass.
@@ -497,25 +553,127 @@ def fill_panel(window: sublime.Window) -> None:
     settings = panel.settings()
     settings.set("result_base_dir", base_dir)
 
-    widths: tuple[tuple[str, int], ...] = tuple(
-        zip(
-            ('line', 'col', 'error_type', 'linter_name'),
-            map(
-                max,
-                zip(*[
-                    (
-                        len(str(error['line'] + 1)),
-                        len(str(error['start'] + 1)),
-                        len(error['error_type']),
-                        len(error['linter']),
-                    )
-                    for error in flatten(errors_by_file.values())
-                ])
+    with rendered_panels_lock:
+        previous = rendered_panels.get(window.id())
+        if previous is None or previous.panel_id != panel.id():
+            previous = RenderedPanel(panel.id())
+
+        column_widths = {
+            filename: previous.column_widths_of(filename, errors)
+            for filename, errors in errors_by_file.items()
+        }
+        widths: Widths = tuple(
+            zip(
+                ('line', 'col', 'error_type', 'linter_name'),
+                map(max, zip(*[w for w in column_widths.values() if w]))
             )
         )
-    )
-    widths += (('viewport', int(vx // panel.em_width()) - 1), )
+        widths += (('viewport', int(vx // panel.em_width()) - 1), )
+
+        max_rendered_errors = persist.settings.get('panel.max_rendered_errors')
+        virtual = (
+            max_rendered_errors is not None
+            and sum(map(len, errors_by_file.values())) > max_rendered_errors
+        )
+        cursor = State['cursor'] if active_view and State['cursor'] != -1 else None
+        blocks = [
+            previous.block_for(
+                filename, fpath, errors, widths,
+                None if errors else no_results_message(filename),
+                previous.window_for(
+                    filename, errors,
+                    cursor if filename == active_filename else None
+                ) if virtual and errors else None
+            )
+            for fpath, filename, errors in sort_files(
+                errors_by_file, fpath_by_file, active_filename
+            )
+        ]
+
+        row = 0
+        markers: list[Marker] = []
+        for block in blocks:
+            # Blocks we have drawn at the same row before have already
+            # told their errors where they are.
+            if block.row != row:
+                for error, (a, b) in zip(block.errors, block.spans):
+                    error["panel_line"] = (row + a, row + b)
+                block.row = row
+            markers.extend(
+                (row + offset, block.filename, direction)
+                for offset, direction in block.markers
+            )
+            row += block.height
+
+        content = ''.join(block.text for block in blocks)[:-1]
+        draw_info: DrawInfo = {
+            'panel': panel,
+            'content': content,
+        }
+        if previous.blocks and content:
+            draw_info['edit'] = compute_edit(previous.blocks, blocks)
+
+        rendered_panels[window.id()] = RenderedPanel(
+            panel.id(),
+            blocks,
+            {
+                filename: (errors, column_widths[filename])
+                for filename, errors in errors_by_file.items()
+            },
+            markers
+        )
+
+        if not follow_cursor:
+            edit = draw_info.get('edit')
+            sublime.set_timeout(lambda: update_panel_content(panel, content, edit))
+        elif active_view:
+            update_panel_selection(draw_info=draw_info, **State)  # type: ignore[arg-type]
+        else:
+            draw(draw_info)
+
+
+def page_in(window: sublime.Window, filename: FileName, direction: int) -> None:
+    """Render `PAGE_SIZE` more of the hidden errors of `filename`.
+
+    When we page in above, we scroll down the panel by the same amount
+    so that the errors the user is looking at stay in place.
+    """
+    panel = get_panel(window)
+    if not panel:
+        return
+
+    with rendered_panels_lock:
+        rendered = rendered_panels.get(window.id())
+        block = rendered.block_of(filename) if rendered else None
+        if not rendered or not block or not block.window:
+            return
 
+        start, stop = block.window
+        if direction < 0:
+            start = max(0, start - PAGE_SIZE)
+        else:
+            stop = min(len(block.errors), stop + PAGE_SIZE)
+        rendered.requested_windows[filename] = (start, stop)
+        fill_panel(window, follow_cursor=False)
+
+        if direction < 0:
+            next_rendered = rendered_panels.get(window.id())
+            next_block = next_rendered.block_of(filename) if next_rendered else None
+            if next_block:
+                lines = next_block.height - block.height
+                sublime.set_timeout(lambda: scroll_by_lines(panel, lines))
+
+
+def scroll_by_lines(panel: sublime.View, lines: int) -> None:
+    x, y = panel.viewport_position()
+    panel.set_viewport_position((x, y + lines * panel.line_height()), False)
+
+
+def sort_files(
+    errors_by_file: ErrorsByFile,
+    fpath_by_file: dict[FileName, str],
+    active_filename: Optional[FileName]
+) -> list[tuple[str, FileName, list[LintError]]]:
     def sorted_by_path(active_filename, items):
         active_filename_parts = len(fpath_by_file[active_filename].split(os.sep))
 
@@ -525,84 +683,340 @@ def fill_panel(window: sublime.Window) -> None:
             return (abs(len(parts) - active_filename_parts), len(parts), parts)
         return sorted(items, key=by_path)
 
-    to_render = []
-    if active_filename:
-        affected_filenames = set(flatten(
-            persist.affected_filenames_per_filename.get(active_filename, {}).values()
-        ))
-
-        sorted_errors = (
-            # Unrelated errors surprisingly come first. The scroller
-            # will scroll past them, often showing empty space below
-            # the current file to reduce visual noise.
-            sorted(
+    if not active_filename:
+        return sorted(
+            (fpath_by_file[filename], filename, errors)
+            for filename, errors in errors_by_file.items()
+        )
+
+    affected_filenames = set(flatten(
+        persist.affected_filenames_per_filename.get(active_filename, {}).values()
+    ))
+
+    return (
+        # Unrelated errors surprisingly come first. The scroller
+        # will scroll past them, often showing empty space below
+        # the current file to reduce visual noise.
+        sorted(
+            (fpath_by_file[filename], filename, errors_by_file[filename])
+            for filename in (
+                errors_by_file.keys()
+                - affected_filenames
+                - {active_filename}
+            )
+        )
+
+        # For the current active file, always show something.
+        # The scroller will try to show this file at the top of the
+        # view.
+        + [(
+            fpath_by_file[active_filename],
+            active_filename,
+            errors_by_file.get(active_filename, [])
+        )]
+
+        # Affected files can be clean, just omit those
+        + sorted_by_path(
+            active_filename,
+            (
                 (fpath_by_file[filename], filename, errors_by_file[filename])
-                for filename in (
-                    errors_by_file.keys()
-                    - affected_filenames
-                    - {active_filename}
-                )
+                for filename in affected_filenames
+                if filename in errors_by_file
             )
+        )
+    )
+
+
+def no_results_message(filename: FileName) -> str:
+    actual_linter_names = ', '.join(sorted(
+        persist.actual_linters.get(filename, set())
+    ))
+    if actual_linter_names:
+        return NO_RESULTS_MESSAGE + " Running {}.".format(actual_linter_names)
+    else:
+        return NO_RESULTS_MESSAGE
+
+
+ColumnWidths = Tuple[int, int, int, int]
+Widths = Tuple[Tuple[str, int], ...]
+
+
+def compute_column_widths(errors: list[LintError]) -> Optional[ColumnWidths]:
+    if not errors:
+        return None
+    return tuple(map(max, zip(*[
+        (
+            len(str(error['line'] + 1)),
+            len(str(error['start'] + 1)),
+            len(error['error_type']),
+            len(error['linter']),
+        )
+        for error in errors
+    ])))
+
+
+# In the virtual mode we render only `PAGE_SIZE` errors around the cursor
+# and page in more when the user scrolls to the hidden ones.
+PAGE_SIZE = 200  # [errors]
+PAGE_MARGIN = 20  # [errors]
+MORE_MARKER = "  \u22ef "
+PanelWindow = Tuple[int, int]
+Marker = Tuple[int, FileName, int]
+
+
+class PanelBlock:
+    """The rendered section of one file in the panel.
+
+    `text` holds the header, the errors (or the "No lint results."
+    message) and the empty line which separates the files, each line
+    terminated with a newline.  `spans` are the first and last line of
+    each error relative to the header.
+
+    If `window` is set, only the errors `errors[start:stop]` are rendered.
+    The hidden errors are summarized on a line above resp. below them,
+    and their `spans` point to that line.  `markers` hold these lines
+    together with the direction we have to page in to show them.
+    """
 
-            # For the current active file, always show something.
-            # The scroller will try to show this file at the top of the
-            # view.
-            + [(
-                fpath_by_file[active_filename],
-                active_filename,
-                errors_by_file.get(active_filename, [])
-            )]
-
-            # Affected files can be clean, just omit those
-            + sorted_by_path(
-                active_filename,
-                (
-                    (fpath_by_file[filename], filename, errors_by_file[filename])
-                    for filename in affected_filenames
-                    if filename in errors_by_file
+    __slots__ = (
+        'filename', 'fpath', 'errors', 'widths', 'note', 'window',
+        'text', 'height', 'spans', 'markers', 'row'
+    )
+
+    def __init__(
+        self,
+        filename: FileName,
+        fpath: str,
+        errors: list[LintError],
+        widths: Widths,
+        note: Optional[str],
+        window: Optional[PanelWindow] = None
+    ) -> None:
+        self.filename = filename
+        self.fpath = fpath
+        self.errors = errors
+        self.widths = widths
+        self.note = note
+        self.window = window
+        # The row the errors have been told they are at, see `fill_panel`
+        self.row: Optional[int] = None
+
+        start, stop = window or (0, len(errors))
+        lines = [format_header(fpath)]
+        spans = []
+        markers = []
+        if start > 0:
+            span = (len(lines), len(lines))
+            markers.append((len(lines), -1))
+            lines.append(format_hidden_errors(errors[:start], "more above"))
+            spans.extend([span] * start)
+        for error in errors[start:stop]:
+            formatted = format_error(error, widths)
+            spans.append((len(lines), len(lines) + len(formatted) - 1))
+            lines.extend(formatted)
+        if stop < len(errors):
+            span = (len(lines), len(lines))
+            markers.append((len(lines), 1))
+            lines.append(format_hidden_errors(
+                errors[stop:], "more below" if stop else "problems"))
+            spans.extend([span] * (len(errors) - stop))
+        if note is not None:
+            lines.append(note)
+        # Insert empty line between files
+        lines.append("")
+
+        self.spans = spans
+        self.markers = markers
+        self.height = len(lines)
+        self.text = '\n'.join(lines) + '\n'
+
+    def renders(
+        self,
+        fpath: str,
+        errors: list[LintError],
+        widths: Widths,
+        note: Optional[str],
+        window: Optional[PanelWindow]
+    ) -> bool:
+        return (
+            self.fpath == fpath
+            and self.note == note
+            and (
+                # The text of a clean file doesn't depend on the widths.
+                not errors and not self.errors
+                or (
+                    self.errors is errors
+                    and self.widths == widths
+                    and self.window == window
                 )
             )
         )
 
-    else:
-        sorted_errors = sorted(
-            (fpath_by_file[filename], filename, errors)
-            for filename, errors in errors_by_file.items()
+    def covers(self, cursor: int) -> bool:
+        """Return whether the errors around `cursor` are rendered."""
+        if self.window is None:
+            return True
+        return window_covers(self.window, len(self.errors), cursor_index(self.errors, cursor))
+
+
+def format_hidden_errors(errors: list[LintError], what: str) -> str:
+    counts = Counter(error['error_type'] for error in errors)
+    return "{}{} {} ({})".format(
+        MORE_MARKER, len(errors), what,
+        ", ".join(
+            "{}: {}".format(error_type, count)
+            for error_type, count in sorted(counts.items())
         )
+    )
 
-    for fpath, filename, errors in sorted_errors:
-        to_render.append(format_header(fpath))
 
-        if errors:
-            for error in errors:
-                lines = format_error(error, widths)
-                to_render.extend(lines)
-                error["panel_line"] = (len(to_render) - len(lines), len(to_render) - 1)
+def cursor_index(errors: list[LintError], cursor: int) -> int:
+    """Return the index of the first error at or after `cursor`."""
+    lo, hi = 0, len(errors)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if errors[mid]['region'].begin() < cursor:
+            lo = mid + 1
         else:
-            actual_linter_names = ', '.join(sorted(
-                persist.actual_linters.get(filename, set())
-            ))
-            if actual_linter_names:
-                to_render.append(
-                    NO_RESULTS_MESSAGE
-                    + " Running {}.".format(actual_linter_names)
-                )
-            else:
-                to_render.append(NO_RESULTS_MESSAGE)
+            hi = mid
+    return lo
 
-        # Insert empty line between files
-        to_render.append("")
 
-    content = '\n'.join(to_render)
-    draw_info: DrawInfo = {
-        'panel': panel,
-        'content': content
-    }
+def window_covers(window: PanelWindow, total: int, index: int) -> bool:
+    start, stop = window
+    return (
+        (start == 0 or start + PAGE_MARGIN <= index)
+        and (stop == total or index < stop - PAGE_MARGIN)
+    )
+
+
+def window_around(total: int, index: int) -> PanelWindow:
+    stop = min(total, max(0, index - PAGE_SIZE // 2) + PAGE_SIZE)
+    return max(0, stop - PAGE_SIZE), stop
 
-    if active_view:
-        update_panel_selection(draw_info=draw_info, **State)  # type: ignore[arg-type]
-    else:
-        draw(draw_info)
+
+class RenderedPanel:
+    """What `fill_panel` has rendered into the panel of a window."""
+
+    __slots__ = (
+        'panel_id', 'blocks', 'column_widths', 'markers',
+        'requested_windows', '_blocks_by_file'
+    )
+
+    def __init__(
+        self,
+        panel_id: sublime.ViewId,
+        blocks: list[PanelBlock] = [],
+        column_widths: dict[FileName, tuple[list[LintError], Optional[ColumnWidths]]] = {},
+        markers: list[Marker] = []
+    ) -> None:
+        self.panel_id = panel_id
+        self.blocks = blocks
+        self.column_widths = column_widths
+        self.markers = markers
+        self.requested_windows: dict[FileName, PanelWindow] = {}
+        self._blocks_by_file = {block.filename: block for block in blocks}
+
+    def block_of(self, filename: FileName) -> Optional[PanelBlock]:
+        return self._blocks_by_file.get(filename)
+
+    def column_widths_of(self, filename: FileName, errors: list[LintError]) -> Optional[ColumnWidths]:
+        cached = self.column_widths.get(filename)
+        if cached is not None and cached[0] is errors:
+            return cached[1]
+        return compute_column_widths(errors)
+
+    def window_for(
+        self,
+        filename: FileName,
+        errors: list[LintError],
+        cursor: Optional[int]
+    ) -> PanelWindow:
+        """Choose the errors to render of a file in the virtual mode.
+
+        We keep what we have rendered before, or what the user paged in,
+        but always show the errors around the `cursor` of the active file.
+        """
+        total = len(errors)
+        window = self.requested_windows.get(filename)
+        if window is None:
+            block = self._blocks_by_file.get(filename)
+            window = block.window if block and block.window else (0, 0)
+        start, stop = window
+        window = min(start, total), min(stop, total)
+
+        if cursor is not None:
+            index = cursor_index(errors, cursor)
+            if not window_covers(window, total, index):
+                window = window_around(total, index)
+        return window
+
+    def block_for(
+        self,
+        filename: FileName,
+        fpath: str,
+        errors: list[LintError],
+        widths: Widths,
+        note: Optional[str],
+        window: Optional[PanelWindow] = None
+    ) -> PanelBlock:
+        block = self._blocks_by_file.get(filename)
+        if block is not None and block.renders(fpath, errors, widths, note, window):
+            return block
+        return PanelBlock(filename, fpath, errors, widths, note, window)
+
+    def marker_between(self, top: int, bottom: int) -> Optional[Marker]:
+        """Return the first marker of hidden errors within the given rows."""
+        return next(
+            (marker for marker in self.markers if top <= marker[0] <= bottom),
+            None
+        )
+
+
+rendered_panels: dict[sublime.WindowId, RenderedPanel] = {}
+rendered_panels_lock = threading.RLock()
+
+
+def compute_edit(old: list[PanelBlock], new: list[PanelBlock]) -> PanelEdit:
+    """Compute the replacement which turns the `old` into the `new` content.
+
+    The blocks at the start and at the end which didn't change frame
+    the text we actually have to replace.  Since the content drops the
+    newline of the very last block we take care to not replace past
+    the end of the old content.
+    """
+    prefix = 0
+    for a, b in zip(old, new):
+        if a is not b:
+            break
+        prefix += 1
+
+    suffix = 0
+    for a, b in zip(reversed(old[prefix:]), reversed(new[prefix:])):
+        if a is not b:
+            break
+        suffix += 1
+
+    begin = sum(len(block.text) for block in old[:prefix])
+    end = sum(len(block.text) for block in old[:len(old) - suffix])
+    text = ''.join(block.text for block in new[prefix:len(new) - suffix])
+    old_size = sum(len(block.text) for block in old) - 1
+    if suffix == 0:
+        if begin > old_size:
+            # Only appended blocks; they need the dropped newline back.
+            begin, text = old_size, '\n' + text
+        elif not text:
+            # Only removed blocks; remove the newline before them as well.
+            begin -= 1
+        end, text = old_size, text[:-1]
+    return begin, end, text, old_size
+
+
+def renders_errors_around(window: sublime.Window, filename: FileName, cursor: int) -> bool:
+    with rendered_panels_lock:
+        rendered = rendered_panels.get(window.id())
+        block = rendered.block_of(filename) if rendered else None
+    return block is None or block.covers(cursor)
 
 
 def update_panel_selection(
@@ -612,9 +1026,6 @@ def update_panel_selection(
     **kwargs: Any
 ) -> None:
     """Alter panel highlighting according to the current cursor position."""
-    if draw_info is None:
-        draw_info = {}
-
     window = active_view.window()
     assert window
     panel = get_panel(window)
@@ -625,6 +1036,11 @@ def update_panel_selection(
         return
 
     filename = util.canonical_filename(active_view)
+    if not draw_info and not renders_errors_around(window, filename, cursor):
+        # Page in the errors around the cursor, `fill_panel` then calls us
+        # again.
+        fill_panel(window)
+        return
 
     try:
         # Rarely, and if so only on hot-reload, `update_panel_selection` runs
@@ -634,6 +1050,8 @@ def update_panel_selection(
     except KeyError:
         all_errors = []
 
+    if draw_info is None:
+        draw_info = {}
     draw_info.update({
         'panel': panel,
         'errors_from_active_view': all_errors
@@ -699,9 +1117,19 @@ def update_panel_selection(
 #   Visual side-effects   #
 
 
-def update_panel_content(panel, text):
+def update_panel_content(panel, text, edit=None):
     if not text:
         text = NO_RESULTS_MESSAGE
+    elif edit:
+        begin, end, replacement, expected_size = edit
+        # Only patch the content if the panel still has the content we
+        # computed the edit for, otherwise fall back to replacing everything.
+        if panel.size() == expected_size:
+            if begin != end or replacement:
+                panel.run_command('sublime_linter_patch_panel_content', {
+                    'begin': begin, 'end': end, 'text': replacement
+                })
+            return
     panel.run_command('sublime_linter_replace_panel_content', {'text': text})
 
 
@@ -718,6 +1146,14 @@ class sublime_linter_replace_panel_content(sublime_plugin.TextCommand):
         view.set_viewport_position((0, y), False)
 
 
+class sublime_linter_patch_panel_content(sublime_plugin.TextCommand):
+    def run(self, edit, begin, end, text):
+        view = self.view
+        view.set_read_only(False)
+        view.replace(edit, sublime.Region(begin, end), text)
+        view.set_read_only(True)
+
+
 INNER_MARGIN = 2  # [lines]
 JUMP_COEFFICIENT = 3
 
@@ -832,7 +1268,20 @@ VIEWPORT_MARKER_KEY = 'SL.Panel.ViewportMarker'
 VIEWPORT_MARKER_SCOPE = 'region.bluish.visible_viewport.sublime_linter'
 VIEWPORT_BACKGROUND_KEY = 'SL.Panel.ViewportBackground'
 
+# Sublime has no events for scrolling or resizing a view, so we poll.
+# Right after any activity we poll fast, and while nothing changes we
+# back off until we poll only every few seconds.
+MIN_POLL_INTERVAL = 16  # [ms]
+MAX_POLL_INTERVAL = 2000  # [ms]
+POLL_BACK_OFF = 2
+
 _RUNNING = False
+_INTERVAL = MIN_POLL_INTERVAL
+_GENERATION = 0
+_TOKENS: tuple = (None, None, None)
+# Instrumentation, see `viewport_poller_stats`
+VIEWPORT_STATS: Counter[str] = Counter()
+VIEWPORT_TIMINGS: Dict[str, float] = {}
 
 
 def get_viewport_background_scope():
@@ -840,12 +1289,15 @@ def get_viewport_background_scope():
 
 
 def start_viewport_poller():
-    global _RUNNING
+    global _RUNNING, _INTERVAL, _GENERATION
     if _RUNNING:
         return
 
     _RUNNING = True
-    update_viewport()
+    _INTERVAL = MIN_POLL_INTERVAL
+    _GENERATION += 1
+    VIEWPORT_TIMINGS['started'] = time.perf_counter()
+    update_viewport(_GENERATION)
 
 
 def stop_viewport_poller():
@@ -853,14 +1305,64 @@ def stop_viewport_poller():
     _RUNNING = False
 
 
-def update_viewport(token1=None, token2=None):
-    global _RUNNING
-    if not _RUNNING:
+def poke_viewport_poller():
+    """Poll fast again, e.g. after the user typed or scrolled."""
+    if _RUNNING and _INTERVAL != MIN_POLL_INTERVAL:
+        sublime.set_timeout(_wake_up_viewport_poller)
+
+
+def _wake_up_viewport_poller():
+    global _INTERVAL, _GENERATION
+    if not _RUNNING or _INTERVAL == MIN_POLL_INTERVAL:
         return
 
-    next_token1 = mayby_rerender_panel(token1)
-    next_token2 = maybe_render_viewport(token2)
-    sublime.set_timeout(partial(update_viewport, next_token1, next_token2), 16)
+    # Drop the pending, slow tick and start a new chain of fast ticks.
+    _INTERVAL = MIN_POLL_INTERVAL
+    _GENERATION += 1
+    update_viewport(_GENERATION)
+
+
+def next_poll_interval(interval: int, changed: bool) -> int:
+    if changed:
+        return MIN_POLL_INTERVAL
+    return min(MAX_POLL_INTERVAL, interval * POLL_BACK_OFF)
+
+
+def update_viewport(generation):
+    global _INTERVAL, _TOKENS
+    if not _RUNNING or generation != _GENERATION:
+        return
+
+    start_time = time.perf_counter()
+    token1, token2, token3 = _TOKENS
+    tokens = (
+        mayby_rerender_panel(token1),
+        maybe_render_viewport(token2),
+        maybe_page_in_panel(token3),
+    )
+    changed = tokens != _TOKENS
+    _TOKENS = tokens
+    _INTERVAL = next_poll_interval(_INTERVAL, changed)
+
+    VIEWPORT_STATS['ticks'] += 1
+    VIEWPORT_STATS['changes'] += changed
+    VIEWPORT_TIMINGS['seconds'] = (
+        VIEWPORT_TIMINGS.get('seconds', 0.0) + time.perf_counter() - start_time)
+    sublime.set_timeout(partial(update_viewport, generation), _INTERVAL)
+
+
+def viewport_poller_stats() -> dict[str, float]:
+    """Return the tick rate and the cost per tick of the viewport poller."""
+    ticks = VIEWPORT_STATS['ticks']
+    started = VIEWPORT_TIMINGS.get('started')
+    elapsed = time.perf_counter() - started if started else 0
+    return {
+        'ticks': ticks,
+        'ticks_with_changes': VIEWPORT_STATS['changes'],
+        'ticks_per_second': ticks / elapsed if elapsed else 0,
+        'ms_per_tick': VIEWPORT_TIMINGS.get('seconds', 0.0) * 1000 / ticks if ticks else 0,
+        'interval_ms': _INTERVAL if _RUNNING else 0,
+    }
 
 
 def mayby_rerender_panel(previous_token):
@@ -879,6 +1381,32 @@ def mayby_rerender_panel(previous_token):
     return token
 
 
+def maybe_page_in_panel(previous_token):
+    view = State['active_view']
+    if not view:
+        return
+
+    window = view.window()
+    if not window:
+        return
+    panel = get_panel(window)
+    if not panel:
+        return
+
+    visible_region = panel.visible_region()
+    token = (panel.change_count(), visible_region)
+    if token != previous_token:
+        top, _ = panel.rowcol(visible_region.begin())
+        bottom, _ = panel.rowcol(visible_region.end())
+        with rendered_panels_lock:
+            rendered = rendered_panels.get(window.id())
+            marker = rendered.marker_between(top, bottom) if rendered else None
+        if marker:
+            _, filename, direction = marker
+            sublime.set_timeout_async(lambda: page_in(window, filename, direction))
+    return token
+
+
 def maybe_render_viewport(previous_token):
     view = State['active_view']
     if not view:
@@ -2,6 +2,7 @@ from __future__ import annotations
 import sublime
 import sublime_plugin
 
+from .lint import error_index
 from .lint import persist
 from .lint import quick_fix
 from .lint import util
@@ -89,7 +90,8 @@ class sublime_linter_quick_actions(sublime_plugin.TextCommand):
             char_selection = sublime.Region(sel.a, sel.a + 1)
             errors = get_errors_where(
                 filename,
-                lambda region: region.intersects(char_selection)
+                lambda region: region.intersects(char_selection),
+                near=char_selection
             )
             if errors:
                 return errors
@@ -98,12 +100,23 @@ class sublime_linter_quick_actions(sublime_plugin.TextCommand):
 
         return get_errors_where(
             filename,
-            lambda region: region.intersects(sel)
+            lambda region: region.intersects(sel),
+            near=sel
         )
 
 
-def get_errors_where(filename: str, fn: Callable[[sublime.Region], bool]) -> list[LintError]:
-    return [
-        error for error in persist.file_errors[filename]
-        if fn(error['region'])
-    ]
+def get_errors_where(
+    filename: str,
+    fn: Callable[[sublime.Region], bool],
+    near: sublime.Region | None = None
+) -> list[LintError]:
+    """Return the errors of `filename` whose region satisfies `fn`.
+
+    If given, only errors touching or overlapping `near` are considered.
+    """
+    errors = (
+        persist.file_errors[filename]
+        if near is None
+        else error_index.errors_intersecting(filename, near)
+    )
+    return [error for error in errors if fn(error['region'])]
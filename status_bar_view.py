@@ -2,7 +2,7 @@ from __future__ import annotations
 import sublime
 import sublime_plugin
 
-from .lint import persist, events, util
+from .lint import error_index, persist, events, util
 
 from typing import Iterable, Optional, TypedDict
 
@@ -104,10 +104,7 @@ def messages_under_cursor(filename: FileName, current_pos: int) -> str:
 
 
 def get_errors_under_cursor(filename: FileName, cursor: int) -> Iterable[LintError]:
-    return (
-        error for error in persist.file_errors.get(filename, [])
-        if error['region'].contains(cursor)
-    )
+    return error_index.errors_at(filename, cursor)
 
 
 def get_current_pos(view: sublime.View) -> int:
@@ -1066,6 +1066,7 @@ class Settings:
     def has(self, key: str) -> bool: ...
     def set(self, key: str, value: Any): ...
     def erase(self, key: str) -> None: ...
+    def to_dict(self) -> dict[str, Any]: ...
     def add_on_change(self, tag: str, callback: Any) -> None: ...
     def clear_on_change(self, tag: str) -> None: ...
 
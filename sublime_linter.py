@@ -1,24 +1,31 @@
 """This module provides the SublimeLinter plugin class and supporting methods."""
 from __future__ import annotations
 
-from collections import defaultdict
 from itertools import chain
 import logging
+import os
 
 import sublime
 import sublime_plugin
 
 from . import log_handler
 from .lint import backend
+from .lint import discovery
+from .lint import disk_cache
 from .lint import elect
+from .lint import error_index
 from .lint import events
 from .lint import linter as linter_module
 from .lint import persist
+from .lint import project_lint
 from .lint import queue
 from .lint import reloader
+from .lint import result_cache
 from .lint import settings
+from .lint import spawn_cache
 from .lint import util
 from .lint.util import flash
+from .lint.base_linter import daemon_linter, python_linter
 
 
 from typing import Callable
@@ -28,7 +35,6 @@ Bid: TypeAlias = "sublime.BufferId"
 LinterName = str
 FileName = str
 Reason = str
-LintError = persist.LintError
 Linter = linter_module.Linter
 LinterSettings = linter_module.LinterSettings
 ViewChangedFn = Callable[[], bool]
@@ -67,6 +73,9 @@ def plugin_loaded():
     util.determine_thread_names()
     logger.info("debug mode: on")
     logger.info("version: " + util.get_sl_version())
+    if disk_cache.is_enabled():
+        disk_cache.evict()
+    python_linter.prefetch_python_versions()
 
     # Lint the visible views from the active window on startup
     bc = BackendController()
@@ -90,6 +99,8 @@ def plugin_unloaded():
         pass
 
     queue.unload()
+    project_lint.cancel_all()
+    daemon_linter.shutdown_all_workers()
     persist.settings.unobserve()
     util.close_all_error_panels()
     events.off(on_settings_changed)
@@ -178,14 +189,24 @@ class BackendController(sublime_plugin.EventListener):
         if renamed_filename:
             persist.record_filename_change(*renamed_filename)
 
+        refresh_python_venv(view)
         if has_syntax_changed(view):
+            disk_cache.paint_cached_results(view)
             backend.hit(view, 'on_load')
 
     @util.distinct_until_buffer_changed
     def on_post_save_async(self, view):
+        # Cached results and commands of the files next to and below the
+        # saved file may depend on it, e.g. if it is a config file.
+        filename = view.file_name()
+        if filename:
+            folder = os.path.dirname(filename)
+            result_cache.cache.discard_below(folder, keep=filename)
+            spawn_cache.cache.discard_below(folder)
+            discovery.invalidate(filename)
+
         # check if the project settings changed
         window = view.window()
-        filename = view.file_name()
         if window and window.project_file_name() == filename:
             if settings.validate_project_settings(filename):
                 for window in sublime.windows():
@@ -200,8 +221,10 @@ class BackendController(sublime_plugin.EventListener):
             return
 
         backend.hit(view, 'on_save')
+        refresh_python_venv(view)
 
     def on_close(self, view: sublime.View) -> None:
+        linter_module.view_settings_change_counts.pop(view.id(), None)
         bid = view.buffer_id()
         filename = util.canonical_filename(view)
 
@@ -223,12 +246,19 @@ class BackendController(sublime_plugin.EventListener):
         direct_deps = dependencies_per_file.pop(filename, set())
         other_deps = set(flatten(dependencies_per_file.values()))
 
-        to_discard = ({filename} | direct_deps) - open_filenames - other_deps
+        project_filenames = set(flatten(persist.project_filenames.values()))
+
+        to_discard = (
+            ({filename} | direct_deps) - open_filenames - other_deps - project_filenames
+        )
         for fn in to_discard:
             persist.affected_filenames_per_filename.pop(fn, None)
             persist.file_errors.pop(fn, None)
+            error_index.forget(fn)
 
         persist.assigned_linters.pop(bid, None)
+        backend.discard_cell_results(bid)
+        elect.forget_elections(bid)
         buffer_filenames.pop(bid, None)
         buffer_base_scopes.pop(bid, None)
         queue.cleanup(bid)
@@ -251,6 +281,12 @@ def detect_rename(view: sublime.View) -> tuple[FileName, FileName] | None:
         buffer_filenames[bid] = current_filename
 
 
+def refresh_python_venv(view: sublime.View) -> None:
+    filename = view.file_name()
+    if filename and view.match_selector(0, 'source.python'):
+        python_linter.prefetch_venv(filename)
+
+
 def has_syntax_changed(view: sublime.View) -> bool:
     bid = view.buffer_id()
     base_scope = view.scope_name(0).split(" ")[0]
@@ -323,35 +359,67 @@ class sublime_linter_lint(sublime_plugin.TextCommand):
         backend.hit(self.view, 'on_user_request', only_run=run)
 
 
+class sublime_linter_lint_project(sublime_plugin.WindowCommand):
+    """A command that lints all files in the folders of the window."""
+
+    def is_enabled(self):
+        return bool(self.window.folders())
+
+    def run(self, run: list[LinterName] = []):
+        if not isinstance(run, list):
+            run = [run]  # type: ignore[unreachable]
+
+        view = self.window.active_view()
+        if not view:
+            return
+
+        self.window.status_message("SublimeLinter: Linting project...")
+        project_lint.lint_project(self.window, view, set(run))
+
+
+class sublime_linter_cancel_lint_project(sublime_plugin.WindowCommand):
+    """A command that cancels a running project lint."""
+
+    def is_enabled(self):
+        return project_lint.is_running(self.window)
+
+    def run(self):
+        project_lint.cancel(self.window)
+
+
 class sublime_linter_config_changed(sublime_plugin.ApplicationCommand):
-    def run(self, hint: str = None, wid: sublime.WindowId = None, linter: list[LinterName] = []):
+    def run(
+        self,
+        hint: str = None,
+        wid: sublime.WindowId = None,
+        linter: list[LinterName] = [],
+        folder: str = None
+    ):
         if hint is None or hint == 'relint':
-            relint_views(wid, linter)
+            relint_views(wid, linter, folder)
         elif hint == 'redraw':
             force_redraw()
 
 
-def relint_views(wid: sublime.WindowId = None, linter: list[LinterName] = []):
+def relint_views(
+    wid: sublime.WindowId = None,
+    linter: list[LinterName] = [],
+    folder: str = None
+):
     windows = [sublime.Window(wid)] if wid else sublime.windows()
     for window in windows:
         for view in window.views():
+            if folder and not util.is_below(view.file_name() or '', folder):
+                continue
             if view.buffer_id() in persist.assigned_linters and view.is_primary():
                 backend.hit(view, 'relint_views', only_run=linter)
 
 
 def force_redraw():
-    for filename, errors in persist.file_errors.items():
-        for linter_name, linter_errors in group_by_linter(errors).items():
+    for filename in persist.file_errors:
+        for linter_name, linter_errors in persist.file_errors.by_linter(filename).items():
             events.broadcast(events.LINT_RESULT, {
                 'filename': filename,
                 'linter_name': linter_name,
                 'errors': linter_errors
             })
-
-
-def group_by_linter(errors: list[LintError]) -> defaultdict[LinterName, list[LintError]]:
-    by_linter: defaultdict[LinterName, list[LintError]] = defaultdict(list)
-    for error in errors:
-        by_linter[error['linter']].append(error)
-
-    return by_linter
@@ -0,0 +1,35 @@
+"""A stub daemon speaking the line-delimited JSON protocol of `DaemonLinter`.
+
+For every line containing "bad" in the code of a request, it reports an
+error.  The code "crash" makes it exit, "error" makes it answer with an
+error, "sleep" makes it not answer at all.
+"""
+import json
+import os
+import sys
+
+
+def main():
+    for line in sys.stdin:
+        request = json.loads(line)
+        code = request['code'] or ''
+        if code == 'crash':
+            sys.exit(1)
+        elif code == 'sleep':
+            continue
+        elif code == 'error':
+            response = {'id': request['id'], 'error': 'Something went wrong'}
+        else:
+            stdout = ''.join(
+                'stdin:{}:1: ERROR: bad line in {}\n'.format(n, os.getpid())
+                for n, text in enumerate(code.splitlines(), start=1)
+                if 'bad' in text
+            )
+            response = {'id': request['id'], 'stdout': stdout, 'stderr': '', 'returncode': 0}
+
+        sys.stdout.write(json.dumps(response) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import expect, mock, unstub, verify, when
 
 from SublimeLinter.lint import (
+    backend,
     linter as linter_module,
+    persist,
 )
 
 
@@ -54,3 +57,127 @@ class TestCloningSettings(DeferrableTestCase):
         cloneB['a'] = 'bar'
         self.assertEqual('foo', cloneA['a'])
         self.assertEqual('bar', cloneB['a'])
+
+
+class TestAdaptiveDelay(DeferrableTestCase):
+    def setUp(self):
+        when(persist.settings).get('delay').thenReturn(0.1)
+        self.addCleanup(unstub)
+        self.addCleanup(backend.elapsed_runtimes.clear)
+        self.addCleanup(backend.linter_runtimes.clear)
+        backend.elapsed_runtimes.clear()
+        backend.linter_runtimes.clear()
+
+    def make_linter(self, linter_name, filename):
+        ctx = {'canonical_filename': filename, 'short_canonical_filename': filename}
+        return mock({'name': linter_name, 'context': ctx, 'view': None})
+
+    def record(self, linter_name, filename, runtime):
+        when(backend.time).perf_counter().thenReturn(0.0, runtime)
+        with backend.remember_runtime(self.make_linter(linter_name, filename)):
+            pass
+        unstub(backend.time)
+
+    def test_unknown_linters_use_the_base_delay(self):
+        self.assertEqual(0.1, backend.get_delay())
+        self.assertEqual(0.1, backend.get_delay('flake8', 'a.py'))
+
+    def test_slow_linters_do_not_affect_fast_linters(self):
+        self.record('mypy', 'a.py', 3.0)
+        self.record('flake8', 'a.py', 0.02)
+
+        self.assertEqual(1.5, backend.get_delay('mypy', 'a.py'))
+        self.assertEqual(0.1, backend.get_delay('flake8', 'a.py'))
+
+    def test_runtimes_are_tracked_per_file(self):
+        self.record('mypy', 'a.py', 3.0)
+        self.record('mypy', 'b.py', 0.4)
+
+        self.assertEqual(1.5, backend.get_delay('mypy', 'a.py'))
+        self.assertEqual(0.2, backend.get_delay('mypy', 'b.py'))
+
+    def test_unknown_files_fall_back_to_the_linter_runtimes(self):
+        self.record('mypy', 'a.py', 3.0)
+
+        self.assertEqual(1.5, backend.get_delay('mypy', 'c.py'))
+
+    def test_automatic_delay_is_capped(self):
+        self.record('mypy', 'a.py', 30.0)
+
+        self.assertEqual(backend.MAX_AUTOMATIC_DELAY, backend.get_delay('mypy', 'a.py'))
+
+    def test_completed_runs_are_recorded(self):
+        linter = self.make_linter('mypy', 'a.py')
+        when(linter).lint(...).thenReturn([])
+        when(backend).finalize_errors(...).thenReturn(None)
+
+        backend.execute_lint_task(linter, 'code', (0, 0, 0), lambda: False)
+
+        self.assertEqual(1, len(backend.elapsed_runtimes[('mypy', 'a.py')]))
+
+    def test_aborted_runs_are_not_recorded(self):
+        linter = self.make_linter('mypy', 'a.py')
+        when(linter).lint(...).thenRaise(linter_module.TransientError('aborted'))
+
+        with self.assertRaises(linter_module.TransientError):
+            backend.execute_lint_task(linter, 'code', (0, 0, 0), lambda: False)
+
+        self.assertNotIn(('mypy', 'a.py'), backend.elapsed_runtimes)
+        self.assertNotIn('mypy', backend.linter_runtimes)
+
+    def test_cached_results_are_not_recorded(self):
+        linter = self.make_linter('mypy', 'a.py')
+        when(backend.result_cache).make_key(...).thenReturn('a')
+        when(backend.result_cache.cache).get('a').thenReturn([])
+        when(backend).finalize_errors(...).thenReturn(None)
+        when(backend.util).short_canonical_filename(...).thenReturn('a.py')
+
+        backend.execute_lint_task_cached(linter, 'code', (0, 0, 0), lambda: False)
+
+        self.assertNotIn(('mypy', 'a.py'), backend.elapsed_runtimes)
+
+
+class TestCellResults(DeferrableTestCase):
+    def setUp(self):
+        self.addCleanup(unstub)
+        self.addCleanup(backend.cell_results.clear)
+        when(backend).finalize_errors(...).thenReturn(None)
+        when(backend.util).short_canonical_filename(...).thenReturn('a.md')
+
+    def test_carry_over_only_the_cells_of_the_last_job(self):
+        first = backend.start_cell_results(1, 'flake8')
+        first.current['a'] = []
+        second = backend.start_cell_results(1, 'flake8')
+
+        self.assertEqual({'a': []}, second.previous)
+        self.assertEqual({}, second.current)
+        self.assertEqual({}, backend.start_cell_results(1, 'flake8').previous)
+
+    def test_unchanged_cells_are_not_linted(self):
+        linter = mock({'name': 'flake8', 'view': None})
+        when(backend.result_cache).make_key(...).thenReturn('a')
+        expect(backend, times=0).execute_lint_task(...)
+        error = {'msg': 'Boom'}
+        cells = backend.CellResults({'a': [error]})
+
+        errors = backend.execute_lint_task_cached(linter, 'code', (0, 0, 0), lambda: False, cells)
+
+        self.assertEqual([error], errors)
+        self.assertIsNot(error, errors[0])
+        self.assertEqual({'a': [error]}, cells.current)
+
+    def test_changed_cells_are_linted(self):
+        linter = mock({'name': 'flake8', 'view': None})
+        when(backend.result_cache).make_key(...).thenReturn('b')
+        when(backend.result_cache.cache).get('b').thenReturn(None)
+        cells = backend.CellResults({'a': []})
+        view_has_changed = lambda: False  # noqa: E731
+        when(backend).execute_lint_task(
+            linter, 'code', (0, 0, 0), view_has_changed, cache_key='b', raw_results=cells.current
+        ).thenReturn([])
+
+        backend.execute_lint_task_cached(linter, 'code', (0, 0, 0), view_has_changed, cells)
+
+        verify(backend).execute_lint_task(
+            linter, 'code', (0, 0, 0), view_has_changed, cache_key='b', raw_results=cells.current
+        )
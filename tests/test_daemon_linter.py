@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import os
+import shutil
+import unittest
+
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import mock, unstub, when
+
+from SublimeLinter.lint import linter as linter_module
+from SublimeLinter.lint.base_linter import daemon_linter
+
+
+PYTHON = shutil.which('python3') or shutil.which('python')
+STUB = os.path.join(os.path.dirname(__file__), 'daemon_stub.py')
+
+
+@unittest.skipIf(PYTHON is None, 'no python found to run the stub daemon')
+class TestDaemonWorker(DeferrableTestCase):
+    def setUp(self):
+        self.addCleanup(daemon_linter.shutdown_all_workers)
+        self.cmd = [PYTHON, STUB]
+
+    def get_worker(self, key='stub'):
+        return daemon_linter.get_worker(key, self.cmd, idle_timeout=10)
+
+    def test_answers_requests(self):
+        worker = self.get_worker()
+        response = worker.request({'code': 'ok\nbad'}, timeout=10)
+
+        self.assertEqual(
+            'stdin:2:1: ERROR: bad line in {}\n'.format(worker.proc.pid),
+            response['stdout']
+        )
+
+    def test_worker_is_reused(self):
+        worker = self.get_worker()
+        worker.request({'code': 'ok'}, timeout=10)
+
+        self.assertIs(worker, self.get_worker())
+        self.assertIsNot(worker, self.get_worker('other'))
+
+    def test_error_responses(self):
+        response = self.get_worker().request({'code': 'error'}, timeout=10)
+
+        self.assertEqual('Something went wrong', response['error'])
+
+    def test_crash_fails_pending_requests_and_restarts(self):
+        worker = self.get_worker()
+        with self.assertRaises(daemon_linter.DaemonCrashed):
+            worker.request({'code': 'crash'}, timeout=10)
+
+        next_worker = self.get_worker()
+        self.assertIsNot(worker, next_worker)
+        self.assertEqual('', next_worker.request({'code': 'ok'}, timeout=10)['stdout'])
+
+    def test_give_up_after_too_many_crashes(self):
+        for _ in range(daemon_linter.MAX_RESTARTS + 1):
+            with self.assertRaises(daemon_linter.DaemonCrashed):
+                self.get_worker().request({'code': 'crash'}, timeout=10)
+
+        with self.assertRaises(daemon_linter.DaemonCrashed):
+            self.get_worker()
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.get_worker().request({'code': 'sleep'}, timeout=0.1)
+
+    def test_big_concurrent_requests_do_not_deadlock(self):
+        # Both pipes fill up: the daemon blocks writing a big answer while
+        # we're still writing the next big request.
+        worker = self.get_worker()
+        code = 'bad\n' * 100000
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(worker.request, {'code': code}, 10)
+                for _ in range(3)
+            ]
+            for f in futures:
+                self.assertEqual(100000, f.result().get('stdout', '').count('\n'))
+
+    def test_idle_workers_are_shut_down(self):
+        worker = self.get_worker()
+        worker.request({'code': 'ok'}, timeout=10)
+
+        daemon_linter.reap_idle_workers(now=worker.last_used + 5)
+        self.assertIs(worker, self.get_worker())
+
+        daemon_linter.reap_idle_workers(now=worker.last_used + 11)
+        self.assertFalse(worker.is_alive())
+        self.assertIsNot(worker, self.get_worker())
+
+
+class FakeDaemonLinter(daemon_linter.DaemonLinter):
+    defaults = {'selector': 'NONE'}
+    cmd = (PYTHON or 'python', STUB)
+    regex = r'^stdin:(?P<line>\d+):(?P<col>\d+): (?P<error>ERROR): (?P<message>.*)$'
+
+
+@unittest.skipIf(PYTHON is None, 'no python found to run the stub daemon')
+class TestDaemonLinter(DeferrableTestCase):
+    def setUp(self):
+        self.addCleanup(daemon_linter.shutdown_all_workers)
+        self.addCleanup(unstub)
+        self.view = mock({'file_name': lambda: None, 'buffer_id': lambda: 1})
+        self.linter = FakeDaemonLinter(self.view, {})
+
+    def test_output_goes_through_the_usual_pipeline(self):
+        output = self.linter.run(list(FakeDaemonLinter.cmd), 'ok\nbad')
+        worker = next(iter(daemon_linter.workers.values()))
+
+        self.assertEqual(
+            'stdin:2:1: ERROR: bad line in {}\n'.format(worker.proc.pid),
+            output.stdout
+        )
+
+    def test_daemon_errors_are_permanent(self):
+        when(self.linter).notify_failure().thenReturn(None)
+        with self.assertRaises(linter_module.PermanentError):
+            self.linter.run(list(FakeDaemonLinter.cmd), 'error')
+
+    def test_crashed_daemons_are_restarted_once(self):
+        when(self.linter).notify_failure().thenReturn(None)
+        with self.assertRaises(linter_module.PermanentError):
+            self.linter.run(list(FakeDaemonLinter.cmd), 'crash')
+
+        self.assertEqual(1, len(daemon_linter.restarts[self.linter.get_daemon_key(
+            list(FakeDaemonLinter.cmd))]))
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import unstub, verify, when
+
+from SublimeLinter.lint import discovery
+
+
+class TestDiscovery(DeferrableTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.addCleanup(unstub)
+        self.addCleanup(discovery.clear)
+        discovery.clear()
+
+    def test_memoizes_answers(self):
+        path = os.path.join(self.tmp_dir, 'package.json')
+        when(os.path).exists(path).thenReturn(False)
+
+        self.assertFalse(discovery.exists(path))
+        self.assertFalse(discovery.exists(path))
+        verify(os.path, times=1).exists(path)
+
+    def test_answers_change_with_the_directory(self):
+        discovery.RECHECK_INTERVAL = 0
+        self.addCleanup(setattr, discovery, 'RECHECK_INTERVAL', 2.0)
+
+        path = os.path.join(self.tmp_dir, 'package.json')
+        self.assertFalse(discovery.exists(path))
+
+        with open(path, 'w') as f:
+            f.write('{}')
+        # Force a different mtime even on coarse file systems
+        os.utime(self.tmp_dir, ns=(0, 0))
+        self.assertTrue(discovery.exists(path))
+
+    def test_invalidate_forgets_the_directory(self):
+        path = os.path.join(self.tmp_dir, 'package.json')
+        self.assertFalse(discovery.exists(path))
+
+        with open(path, 'w') as f:
+            f.write('{}')
+        discovery.invalidate(path)
+        self.assertTrue(discovery.exists(path))
+
+    def test_which_searches_all_folders(self):
+        folder = os.path.join(self.tmp_dir, 'bin')
+        os.mkdir(folder)
+        when(shutil).which('mylinter', path=self.tmp_dir).thenReturn(None)
+        when(shutil).which('mylinter', path=folder).thenReturn('fake.exe')
+
+        path = os.pathsep.join([self.tmp_dir, folder])
+        self.assertEqual('fake.exe', discovery.which('mylinter', path))
+        self.assertEqual('fake.exe', discovery.which('mylinter', path))
+        verify(shutil, times=1).which('mylinter', path=folder)
@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import time
+
+import sublime
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import mock, unstub, when
+
+from SublimeLinter.lint import disk_cache, queue, util
+
+
+class FakeLinterInfo:
+    name = 'fakelinter'
+
+
+def make_error():
+    return {
+        'linter': 'fakelinter',
+        'filename': '/a.py',
+        'line': 1,
+        'start': 2,
+        'region': sublime.Region(10, 12),
+        'error_type': 'error',
+        'code': 'E1',
+        'msg': 'Boom',
+        'offending_text': 'xx',
+        'uid': 'abc',
+        'priority': 0,
+        'panel_line': (1, 2),
+    }
+
+
+class TestDiskCache(DeferrableTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.addCleanup(unstub)
+        when(disk_cache).cache_dir().thenReturn(self.tmp_dir)
+        when(disk_cache).make_identity(...).thenReturn(['/bin/fake', 1, 2.0])
+
+    def test_serialization_roundtrip(self):
+        error = make_error()
+        data = disk_cache.serialize_error(error)
+        restored = disk_cache.deserialize_error(data)
+
+        del error['panel_line']
+        self.assertEqual(error, restored)
+
+    def test_store_and_load(self):
+        disk_cache.store(None, '/a.py', FakeLinterInfo, 'hash', [make_error()])
+        errors = disk_cache.load(None, '/a.py', FakeLinterInfo, 'hash')
+
+        self.assertEqual(1, len(errors))
+        self.assertEqual(sublime.Region(10, 12), errors[0]['region'])
+
+    def test_content_hash_must_match(self):
+        disk_cache.store(None, '/a.py', FakeLinterInfo, 'hash', [make_error()])
+
+        self.assertIsNone(disk_cache.load(None, '/a.py', FakeLinterInfo, 'other'))
+
+    def test_identity_must_match(self):
+        disk_cache.store(None, '/a.py', FakeLinterInfo, 'hash', [make_error()])
+        when(disk_cache).make_identity(...).thenReturn(['/bin/fake', 1, 3.0])
+
+        self.assertIsNone(disk_cache.load(None, '/a.py', FakeLinterInfo, 'hash'))
+
+    def test_evict_by_age_and_size(self):
+        now = time.time()
+        for n, age in enumerate([0, 10, 20, 100]):
+            path = os.path.join(self.tmp_dir, '{}.json'.format(n))
+            with open(path, 'w') as f:
+                f.write('x' * 10)
+            os.utime(path, (now - age, now - age))
+
+        disk_cache._evict(max_age=50, max_size=25)
+
+        self.assertEqual(['0.json', '1.json'], sorted(os.listdir(self.tmp_dir)))
+
+    def make_view(self, dirty):
+        view = mock()
+        when(view).file_name().thenReturn('/a.py')
+        when(view).is_dirty().thenReturn(dirty)
+        when(util).canonical_filename(view).thenReturn('/a.py')
+        when(disk_cache).content_hash(view).thenReturn('hash')
+        when(disk_cache).is_enabled().thenReturn(True)
+        self.debounced = []
+        when(queue).debounce(...).thenAnswer(
+            lambda callback, delay, key: self.debounced.append((delay, key)))
+        return view
+
+    def test_stores_results_of_clean_views_debounced(self):
+        view = self.make_view(dirty=False)
+        disk_cache.store_result(view, FakeLinterInfo, [make_error()])
+
+        self.assertEqual([(disk_cache.STORE_DELAY, 'disk_cache./a.py.fakelinter')], self.debounced)
+
+    def test_does_not_store_results_of_dirty_views(self):
+        view = self.make_view(dirty=True)
+        disk_cache.store_result(view, FakeLinterInfo, [make_error()])
+
+        self.assertEqual([], self.debounced)
@@ -0,0 +1,93 @@
+import sublime
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import spy2, unstub, verify
+
+from SublimeLinter.lint import Linter, elect, linter as linter_module, persist
+
+
+NUMBER_OF_LINTERS = 50
+
+
+def make_linters(selectors):
+    return [
+        type('FakeElectLinter{}'.format(i), (Linter,), {
+            'cmd': 'fake_linter_1',
+            'defaults': {'selector': selector},
+        })
+        for i, selector in enumerate(selectors)
+    ]
+
+
+class TestElection(DeferrableTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.view = sublime.active_window().new_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.view:
+            cls.view.set_scratch(True)
+            cls.view.close()
+
+    def setUp(self):
+        self.linter_classes = persist.linter_classes.copy()
+        persist.linter_classes.clear()
+        elect.elections.clear()
+        self.addCleanup(elect.elections.clear)
+        self.addCleanup(unstub)
+        spy2(linter_module.get_linter_settings)
+        spy2(elect.is_candidate)
+
+    def tearDown(self):
+        persist.linter_classes.clear()
+        persist.linter_classes.update(self.linter_classes)
+
+    def elect(self):
+        return [
+            info.name
+            for info in elect.assignable_linters_for_view(self.view, 'on_modified')
+        ]
+
+    def test_only_candidates_get_their_settings_computed(self):
+        linters = make_linters(
+            ['text.plain'] + ['source.fake{}'.format(i) for i in range(NUMBER_OF_LINTERS - 1)]
+        )
+
+        self.assertEqual([linters[0].name], self.elect())
+        verify(linter_module, times=NUMBER_OF_LINTERS).get_linter_settings(...)
+
+        self.assertEqual([linters[0].name], self.elect())
+        verify(linter_module, times=NUMBER_OF_LINTERS + 1).get_linter_settings(...)
+        verify(linter_module, times=2).get_linter_settings(linters[0], ...)
+
+    def test_new_linters_are_checked(self):
+        make_linters(['source.fake'])
+        self.assertEqual([], self.elect())
+
+        linter = make_linters(['text.plain'])[0]
+        self.assertEqual([linter.name], self.elect())
+
+    def test_view_settings_are_part_of_the_key(self):
+        linter = make_linters(['source.fake'])[0]
+        self.assertEqual([], self.elect())
+
+        key = 'SublimeLinter.linters.{}.selector'.format(linter.name)
+        self.view.settings().set(key, 'text.plain')
+        self.addCleanup(self.view.settings().erase, key)
+        # Let Sublime notify the observer of the settings
+        yield 10
+        self.assertEqual([linter.name], self.elect())
+
+    def test_unchanged_settings_reuse_the_election(self):
+        make_linters(
+            ['text.plain'] + ['source.fake{}'.format(i) for i in range(NUMBER_OF_LINTERS - 1)]
+        )
+        self.elect()
+        self.elect()
+        verify(elect, times=NUMBER_OF_LINTERS).is_candidate(...)
+
+        self.view.settings().set('SublimeLinter.linters.foo.selector', 'text.plain')
+        self.addCleanup(self.view.settings().erase, 'SublimeLinter.linters.foo.selector')
+        yield 10
+        self.elect()
+        verify(elect, times=2 * NUMBER_OF_LINTERS).is_candidate(...)
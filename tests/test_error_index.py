@@ -0,0 +1,60 @@
+import random
+
+import sublime
+from unittesting import DeferrableTestCase
+
+from SublimeLinter.lint import error_index, persist
+
+
+def make_error(a, b, line=0):
+    return {'region': sublime.Region(a, b), 'line': line, 'msg': '{}-{}'.format(a, b)}
+
+
+class TestErrorIndex(DeferrableTestCase):
+    def setUp(self):
+        self.addCleanup(error_index.forget)
+        self.addCleanup(persist.file_errors.pop, 'a.py', None)
+
+    def test_errors_at(self):
+        errors = [make_error(5, 10), make_error(0, 3), make_error(3, 3), make_error(20, 30)]
+        index = error_index.ErrorIndex(errors)
+
+        self.assertEqual([errors[1], errors[2]], index.at(3))
+        self.assertEqual([errors[0]], index.at(10))
+        self.assertEqual([], index.at(15))
+
+    def test_matches_a_linear_scan(self):
+        rnd = random.Random(42)
+        errors = []
+        for _ in range(500):
+            a = rnd.randrange(1000)
+            errors.append(make_error(a, a + rnd.choice([0, 1, 5, 50, 500])))
+        index = error_index.ErrorIndex(errors)
+
+        for _ in range(200):
+            a = rnd.randrange(1500)
+            query = sublime.Region(a, a + rnd.choice([0, 1, 20]))
+            expected = [
+                error for error in errors
+                if error['region'].begin() <= query.end()
+                and error['region'].end() >= query.begin()
+            ]
+            self.assertEqual(expected, index.intersecting(query))
+
+    def test_errors_touching_a_line(self):
+        # Line-based lookups ask for the region of the line, so errors
+        # which moved with edits are found on their current line.
+        errors = [make_error(0, 1, line=0), make_error(5, 6, line=0), make_error(2, 3, line=1)]
+        index = error_index.ErrorIndex(errors)
+
+        self.assertEqual([errors[0], errors[2]], index.intersecting(sublime.Region(0, 4)))
+        self.assertEqual([], index.intersecting(sublime.Region(10, 14)))
+
+    def test_rebuilds_when_the_errors_change(self):
+        persist.file_errors['a.py'] = [make_error(0, 1)]
+        first = error_index.get_index('a.py')
+        self.assertIs(first, error_index.get_index('a.py'))
+
+        persist.file_errors['a.py'] = [make_error(4, 5)]
+        self.assertEqual([], error_index.errors_at('a.py', 0))
+        self.assertEqual(persist.file_errors['a.py'], error_index.errors_at('a.py', 4))
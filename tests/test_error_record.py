@@ -0,0 +1,66 @@
+import sys
+
+import sublime
+from unittesting import DeferrableTestCase
+
+from SublimeLinter.lint import backend, persist
+
+
+def make_error(i, factory=persist.ErrorRecord, uid=None):
+    return factory(
+        linter='flake8',
+        filename='/p/a/b/file.py',
+        line=i,
+        start=3,
+        region=sublime.Region(i, i + 3),
+        error_type='warning',
+        code='E501',
+        msg='line too long ({} > 79 characters)'.format(i),
+        offending_text='x',
+        uid=uid or backend.make_error_uid({
+            'filename': 'a', 'linter': 'b', 'line': i, 'start': 0,
+            'error_type': 'c', 'code': 'd', 'msg': 'e'
+        }),
+        priority=0,
+    )
+
+
+class TestErrorRecord(DeferrableTestCase):
+    def test_behaves_like_a_dict(self):
+        error = persist.ErrorRecord(filename='a.py', line=1, msg='Boom')
+        error['revalidate'] = True
+
+        self.assertEqual({'filename': 'a.py', 'line': 1, 'msg': 'Boom', 'revalidate': True}, error)
+        self.assertIn('msg', error)
+        self.assertNotIn('code', error)
+        self.assertIsNone(error.get('code'))
+        self.assertEqual('a.py:1', '{filename}:{line}'.format(**error))
+        with self.assertRaises(KeyError):
+            error['code']
+
+        del error['revalidate']
+        self.assertEqual(['filename', 'line', 'msg'], list(error))
+
+    def test_copies_are_independent(self):
+        error = persist.ErrorRecord(line=1)
+        copy = error.copy()
+        copy['line'] = 2
+        self.assertEqual(1, error['line'])
+        self.assertIsInstance(copy, persist.ErrorRecord)
+
+    def test_interns_repeated_fields(self):
+        a = persist.ErrorRecord(code=''.join(['E', '501']))
+        b = persist.ErrorRecord(code=''.join(['E', '501']))
+        self.assertIs(a['code'], b['code'])
+
+    def test_short_uids(self):
+        self.assertEqual(16, len(make_error(1)['uid']))
+
+    def test_has_no_instance_dict(self):
+        error = make_error(1)
+        self.assertFalse(hasattr(error, '__dict__'))
+        self.assertIsNone(error._extra)
+
+    def test_is_smaller_than_a_dict(self):
+        error = make_error(1)
+        self.assertLess(sys.getsizeof(error), sys.getsizeof(dict(error)))
@@ -0,0 +1,49 @@
+from unittesting import DeferrableTestCase
+
+from SublimeLinter.lint import persist
+
+
+def make_error(linter, msg='Boom'):
+    return {'linter': linter, 'msg': msg}
+
+
+class TestErrorStore(DeferrableTestCase):
+    def setUp(self):
+        self.store = persist.ErrorStore()
+
+    def test_replaces_only_the_errors_of_one_linter(self):
+        flake8 = [make_error('flake8', 'a'), make_error('flake8', 'b')]
+        mypy = [make_error('mypy', 'c')]
+        self.store.set_linter_errors('a.py', 'flake8', flake8)
+        self.store.set_linter_errors('a.py', 'mypy', mypy)
+        self.assertEqual(flake8 + mypy, self.store['a.py'])
+
+        first = self.store['a.py']
+        self.assertIs(first, self.store['a.py'])
+
+        new_flake8 = [make_error('flake8', 'd')]
+        self.store.set_linter_errors('a.py', 'flake8', new_flake8)
+        self.assertIsNot(first, self.store['a.py'])
+        self.assertEqual(new_flake8 + mypy, self.store['a.py'])
+        self.assertEqual({'flake8': new_flake8, 'mypy': mypy}, self.store.by_linter('a.py'))
+
+    def test_empty_results_keep_the_file(self):
+        self.store.set_linter_errors('a.py', 'flake8', [])
+        self.assertIn('a.py', self.store)
+        self.assertEqual([], self.store['a.py'])
+        self.assertEqual({}, self.store.by_linter('a.py'))
+
+    def test_assignment_partitions_by_linter(self):
+        errors = [make_error('flake8'), make_error('mypy'), make_error('flake8')]
+        self.store['a.py'] = errors
+        self.assertIs(errors, self.store['a.py'])
+        self.assertEqual([errors[0], errors[2]], self.store.by_linter('a.py')['flake8'])
+
+    def test_behaves_like_a_defaultdict(self):
+        self.assertIsNone(self.store.get('a.py'))
+        self.assertNotIn('a.py', self.store)
+        self.assertEqual([], self.store['a.py'])
+        self.assertIn('a.py', self.store)
+
+        self.store.pop('a.py')
+        self.assertEqual([], list(self.store))
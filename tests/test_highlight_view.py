@@ -0,0 +1,144 @@
+import sublime
+from unittesting import DeferrableTestCase
+
+from SublimeLinter import highlight_view
+from SublimeLinter.highlight_view import GutterIcon, Squiggle
+
+
+class TestDiffDrawing(DeferrableTestCase):
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.view.run_command('append', {'characters': 'foo bar baz\n'})
+        self.addCleanup(self.close_view, self.view)
+
+    def close_view(self, view):
+        highlight_view.undraw(view)
+        highlight_view.forget_drawn(view)
+        view.set_scratch(True)
+        view.close()
+
+    def draw(self, *regions, uid='uid1'):
+        squiggle = Squiggle('fake', uid, 'region.redish', sublime.DRAW_NO_FILL)
+        icon = GutterIcon('fake', 'region.redish', 'dot')
+        regions = list(regions)
+        highlight_view.draw(self.view, 'fake', {squiggle: regions}, {icon: regions})
+
+    def draw_calls(self):
+        return sum(highlight_view.DRAW_CALLS.values())
+
+    def test_unchanged_results_are_not_drawn_again(self):
+        self.draw(sublime.Region(0, 3))
+        calls = self.draw_calls()
+
+        self.draw(sublime.Region(0, 3))
+        self.assertEqual(calls, self.draw_calls())
+
+    def test_changed_regions_are_drawn(self):
+        self.draw(sublime.Region(0, 3))
+        calls = self.draw_calls()
+
+        self.draw(sublime.Region(4, 7))
+        # The squiggle, the gutter icon and the protected regions
+        self.assertEqual(calls + 3, self.draw_calls())
+        self.assertEqual([sublime.Region(4, 7)], self.view.get_regions(
+            Squiggle('fake', 'uid1', 'region.redish', sublime.DRAW_NO_FILL)))
+
+    def test_new_errors_replace_old_ones(self):
+        self.draw(sublime.Region(0, 3))
+        calls = self.draw_calls()
+
+        self.draw(sublime.Region(0, 3), uid='uid2')
+        # Erase the old squiggle, draw the new one
+        self.assertEqual(calls + 2, self.draw_calls())
+
+    def test_regions_moved_by_edits_are_not_drawn_again(self):
+        self.draw(sublime.Region(4, 7))
+        self.view.sel().clear()
+        self.view.sel().add(sublime.Region(0))
+        self.view.run_command('insert', {'characters': 'xx'})
+        calls = self.draw_calls()
+
+        self.draw(sublime.Region(6, 9))
+        self.assertEqual(calls, self.draw_calls())
+
+
+def make_error(i, error_type='error'):
+    return {
+        'linter': 'fake',
+        'filename': 'a.py',
+        'line': i,
+        'start': 0,
+        'region': sublime.Region(i * 10, i * 10 + 3),
+        'error_type': error_type,
+        'code': 'E1',
+        'msg': 'Boom',
+        'offending_text': 'foo',
+        'uid': 'uid{}'.format(i),
+        'priority': 0,
+    }
+
+
+class TestLazyDrawing(DeferrableTestCase):
+    def test_partition_by_region(self):
+        errors = [make_error(i) for i in range(10)]
+        inside, outside = highlight_view.partition_by_region(errors, sublime.Region(20, 40))
+        self.assertEqual(errors[2:5], inside)
+        self.assertEqual(errors[:2] + errors[5:], outside)
+
+    def test_aggregated_squiggles_need_one_key_per_style(self):
+        errors = [make_error(i) for i in range(100)] + [make_error(100, 'warning')]
+        squiggles = highlight_view.prepare_highlights_data(
+            errors,
+            demote_predicate=highlight_view.DemotePredicates.none,
+            demote_scope='',
+            quiet=False,
+            idle=True,
+            aggregate=True
+        )
+        self.assertEqual(2, len(squiggles))
+        self.assertEqual(101, sum(len(regions) for regions in squiggles.values()))
+
+    def test_aggregated_squiggles_remember_their_errors(self):
+        errors = [make_error(i) for i in range(3)]
+        members = {}
+        squiggles = highlight_view.prepare_highlights_data(
+            errors,
+            demote_predicate=highlight_view.DemotePredicates.none,
+            demote_scope='',
+            quiet=False,
+            idle=True,
+            aggregate=True,
+            members=members
+        )
+        self.assertEqual(squiggles.keys(), members.keys())
+        self.assertEqual(errors, next(iter(members.values())))
+
+
+class TestOverviewRegions(DeferrableTestCase):
+    def setUp(self):
+        self.view = sublime.active_window().new_file()
+        self.view.run_command('append', {'characters': 'foo bar baz\n'})
+        self.addCleanup(self.close_view, self.view)
+
+    def close_view(self, view):
+        highlight_view.OVERVIEW_MEMBERS.pop(view.id(), None)
+        view.set_scratch(True)
+        view.close()
+
+    def test_reads_back_the_moved_region_of_each_error(self):
+        key = Squiggle('fake', highlight_view.OVERVIEW_UID, 'region.redish', sublime.DRAW_NO_FILL)
+        errors = [
+            dict(make_error(0), uid='b', region=sublime.Region(8, 11)),
+            dict(make_error(0), uid='a', region=sublime.Region(0, 3)),
+        ]
+        self.view.add_regions(key, [error['region'] for error in errors])
+        highlight_view.remember_overview_members(self.view, {key: errors})
+
+        self.view.sel().clear()
+        self.view.sel().add(sublime.Region(0))
+        self.view.run_command('insert', {'characters': 'xx'})
+
+        self.assertEqual(
+            {'a': (key, sublime.Region(2, 5)), 'b': (key, sublime.Region(10, 13))},
+            highlight_view.overview_regions_by_uid(self.view, frozenset({key}))
+        )
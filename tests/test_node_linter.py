@@ -14,6 +14,7 @@ from SublimeLinter.tests.mockito import (
 import sublime
 from SublimeLinter import lint
 from SublimeLinter.lint import (
+    discovery,
     elect,
     backend,
     linter as linter_module,
@@ -53,6 +54,9 @@ class TestNodeLinters(DeferrableTestCase):
 
     def tearDown(self):
         unstub()
+        # The memoized answers depend on the mocks of each test
+        discovery.clear()
+        node_linter.clear_resolutions()
 
     def create_view(self, window):
         view = window.new_file()
@@ -105,6 +109,22 @@ class TestNodeLinters(DeferrableTestCase):
         self.assertEqual(cmd, ['fake.exe'])
         self.assertEqual(working_dir, ROOT_DIR)
 
+    def test_remembers_the_resolution_per_directory(self):
+        PRESENT_BIN_PATH = os.path.join('/p', 'node_modules', '.bin')
+
+        when(self.view).file_name().thenReturn('/p/a/b/f.js')
+        when(shutil).which('mylinter', ...).thenReturn(None)
+        when(shutil).which('mylinter', path=PRESENT_BIN_PATH).thenReturn('fake.exe')
+        linter = make_fake_linter(self.view)
+        self.assertEqual(linter.get_cmd(), ['fake.exe'])
+
+        # Forget the per directory answers, the resolution is still fresh
+        discovery.clear()
+        linter = make_fake_linter(self.view)
+        self.assertEqual(linter.get_cmd(), ['fake.exe'])
+        self.assertEqual(linter.get_working_dir(), '/p')
+        verify(shutil, times=1).which('mylinter', path=PRESENT_BIN_PATH)
+
     @p.expand([
         ('do not go above home', '/a/home', '/a', '/a/home/a/b/f.js'),
         ('do not fallback to home', '/a/home', '/a/home', '/p/a/b/f.js'),
@@ -361,6 +381,34 @@ class TestNodeLinters(DeferrableTestCase):
         self.assertEqual(cmd, [YARN_BIN, 'run', '--silent', 'mylinter'])
         self.assertEqual(working_dir, ROOT_DIR)
 
+    def test_notices_when_yarn_is_gone(self):
+        PRESENT_PACKAGE_FILE = os.path.join('/p', 'package.json')
+        YARN_BIN = '/path/to/yarn'
+
+        when(self.view).file_name().thenReturn('/p/a/f.js')
+        exists = os.path.exists
+        when(os.path).exists(...).thenAnswer(exists)
+        when(os.path).exists(PRESENT_PACKAGE_FILE).thenReturn(True)
+        when(shutil).which(...).thenReturn(None)
+        when(shutil).which('yarn').thenReturn(YARN_BIN)
+        when(node_linter).read_json_file(PRESENT_PACKAGE_FILE).thenReturn(
+            {'dependencies': {'mylinter': '0.2'}, 'packageManager': 'yarn@3.5.0'})
+
+        linter = make_fake_linter(self.view)
+        self.assertEqual(linter.get_cmd(), [YARN_BIN, 'run', '--silent', 'mylinter'])
+
+        # Uninstall yarn and let the resolution become due for a check
+        when(shutil).which('yarn').thenReturn(None)
+        for key, resolution in list(node_linter.resolutions.items()):
+            node_linter.resolutions[key] = resolution._replace(checked_at=float('-inf'))
+
+        linter = make_fake_linter(self.view)
+        when(linter).notify_failure().thenReturn(None)
+        when(linter.logger).warning(...).thenReturn(None)
+        with self.assertRaises(linter_module.PermanentError):
+            linter.get_cmd()
+        verify(linter).notify_failure()
+
     @p.expand([
         ('/p', {'dependencies': {'mylinter': '0.2'}, 'packageManager': 'yarn@3.5.0'}),
         ('/p/a', {'devDependencies': {'mylinter': '0.2'}, 'packageManager': 'yarn@3.5.0'}),
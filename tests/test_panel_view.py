@@ -2,11 +2,12 @@ import os
 
 from unittesting import DeferrableTestCase
 from SublimeLinter.tests.parameterized import parameterized as p
-from SublimeLinter.tests.mockito import unstub, when
+from SublimeLinter.tests.mockito import spy2, unstub, when
 
 
 import sublime
 from SublimeLinter import panel_view
+from SublimeLinter.lint import persist
 
 
 CODE = 'arbitrary_violation'
@@ -141,3 +142,136 @@ class TestResultRegexes(DeferrableTestCase):
         # The interface updates async.
         match = yield lambda: panel.find('a.py:\n  No lint results', 0, sublime.LITERAL)
         self.assertTrue(match)
+
+
+class TestIncrementalRendering(DeferrableTestCase):
+    @classmethod
+    def setUpClass(cls):
+        s = sublime.load_settings("Preferences.sublime-settings")
+        s.set("close_windows_when_empty", False)
+
+    def setUp(self):
+        sublime.run_command("new_window")
+        window = self.window = sublime.active_window()
+        panel_view.ensure_panel(window)
+        window.run_command('sublime_linter_panel_toggle')  # make it visible
+        panel_view.State.update({'active_view': None, 'active_filename': None})
+
+    def tearDown(self):
+        panel_view.rendered_panels.pop(self.window.id(), None)
+        self.window.run_command('close_window')
+        unstub()
+
+    def fill_panel(self, errors_by_file):
+        when(panel_view).get_window_errors(...).thenReturn(dict(errors_by_file))
+        panel_view.fill_panel(self.window)
+        return panel_view.rendered_panels[self.window.id()]
+
+    def test_only_changed_files_are_rendered_again(self):
+        errors_by_file = {
+            '/foo/a.py': [std_error()],
+            '/foo/b.py': [std_error(line=1)],
+            '/foo/c.py': [std_error(line=2)],
+        }
+        first = self.fill_panel(errors_by_file)
+
+        errors_by_file['/foo/b.py'] = [std_error(line=3), std_error(line=4, msg='Changed.')]
+        second = self.fill_panel(errors_by_file)
+
+        self.assertIs(first.blocks[0], second.blocks[0])
+        self.assertIsNot(first.blocks[1], second.blocks[1])
+        self.assertIs(first.blocks[2], second.blocks[2])
+
+        panel = panel_view.get_panel(self.window)
+        yield lambda: panel.find('Changed.', 0, sublime.LITERAL)
+        content = panel.substr(sublime.Region(0, panel.size()))
+        self.assertEqual(''.join(block.text for block in second.blocks)[:-1], content)
+
+        # `panel_line` points to the rendered lines of each error
+        error = errors_by_file['/foo/c.py'][0]
+        line = panel.substr(panel.line(panel.text_point(error['panel_line'][0], 0)))
+        self.assertIn(CODE, line)
+        self.assertTrue(line.lstrip().startswith('3:1'))
+
+    def test_compute_edit_replaces_only_the_changed_blocks(self):
+        errors_by_file = {
+            '/foo/a.py': [std_error()],
+            '/foo/b.py': [std_error(line=1)],
+        }
+        first = self.fill_panel(errors_by_file)
+        old_content = ''.join(block.text for block in first.blocks)[:-1]
+
+        errors_by_file['/foo/c.py'] = [std_error(line=2)]
+        second = self.fill_panel(errors_by_file)
+        new_content = ''.join(block.text for block in second.blocks)[:-1]
+
+        begin, end, text, size = panel_view.compute_edit(first.blocks, second.blocks)
+        self.assertEqual(len(old_content), size)
+        self.assertEqual(len(old_content), begin)
+        self.assertEqual(new_content, old_content[:begin] + text + old_content[end:])
+
+    def test_virtual_mode_renders_a_page_around_the_cursor(self):
+        spy2(persist.settings.get)
+        when(persist.settings).get('panel.max_rendered_errors').thenReturn(100)
+        errors = [
+            std_error(line=n, region=sublime.Region(n * 10, n * 10 + 2))
+            for n in range(1000)
+        ]
+        view = self.window.new_file()
+        view.set_scratch(True)
+        panel_view.State.update({
+            'active_view': view,
+            'active_filename': '/foo/a.py',
+            'cursor': 5000
+        })
+        rendered = self.fill_panel({
+            '/foo/a.py': errors,
+            '/foo/b.py': [std_error() for _ in range(300)],
+        })
+
+        a, b = rendered.block_of('/foo/a.py'), rendered.block_of('/foo/b.py')
+        self.assertEqual((400, 600), a.window)
+        self.assertEqual((0, 0), b.window)
+        self.assertIn("\u22ef 400 more above (error: 400)", a.text)
+        self.assertIn("\u22ef 300 problems (error: 300)", b.text)
+
+        # Hidden errors point to the line summarizing them
+        above, below = a.markers
+        self.assertEqual(errors[0]['panel_line'], errors[399]['panel_line'])
+        self.assertEqual(a.row + above[0], errors[0]['panel_line'][0])
+        self.assertEqual(a.row + below[0], errors[999]['panel_line'][0])
+
+        panel_view.page_in(self.window, '/foo/a.py', 1)
+        rendered = panel_view.rendered_panels[self.window.id()]
+        self.assertEqual((400, 800), rendered.block_of('/foo/a.py').window)
+
+
+class TestViewportPoller(DeferrableTestCase):
+    def test_backs_off_while_nothing_changes(self):
+        interval = panel_view.MIN_POLL_INTERVAL
+        intervals = []
+        for _ in range(10):
+            interval = panel_view.next_poll_interval(interval, changed=False)
+            intervals.append(interval)
+
+        self.assertEqual([32, 64, 128, 256, 512, 1024, 2000, 2000], intervals[:8])
+        self.assertEqual(
+            panel_view.MIN_POLL_INTERVAL,
+            panel_view.next_poll_interval(interval, changed=True)
+        )
+
+    def test_reports_tick_rate_and_cost(self):
+        panel_view.stop_viewport_poller()
+        panel_view.VIEWPORT_STATS.clear()
+        panel_view.VIEWPORT_TIMINGS.clear()
+        self.addCleanup(panel_view.stop_viewport_poller)
+
+        panel_view.start_viewport_poller()
+        yield 200
+        stats = panel_view.viewport_poller_stats()
+
+        self.assertGreater(stats['ticks'], 0)
+        self.assertGreater(stats['ticks_per_second'], 0)
+        self.assertGreaterEqual(stats['ms_per_tick'], 0)
+        # Nothing happens, so the poller slows down
+        self.assertGreater(stats['interval_ms'], panel_view.MIN_POLL_INTERVAL)
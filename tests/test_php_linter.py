@@ -14,7 +14,7 @@ from SublimeLinter.tests.mockito import (
 
 import sublime
 from SublimeLinter import lint
-from SublimeLinter.lint import elect, backend, linter as linter_module, util
+from SublimeLinter.lint import discovery, elect, backend, linter as linter_module, util
 from SublimeLinter.lint.base_linter import php_linter
 
 
@@ -48,6 +48,8 @@ class TestPhpLinters(DeferrableTestCase):
 
     def tearDown(self):
         unstub()
+        # The memoized answers depend on the mocks of each test
+        discovery.clear()
 
     def create_view(self, window):
         view = window.new_file()
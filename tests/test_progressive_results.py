@@ -0,0 +1,129 @@
+from textwrap import dedent
+
+import sublime
+from SublimeLinter.lint import Linter, backend, linter as linter_module, persist
+from SublimeLinter.lint.snapshot import Snapshot
+
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import unstub, when
+
+
+INPUT = dedent("""\
+    I
+    am
+    the
+    swan""")
+OUTPUT = [
+    b'stdin:1:1 The message\n',
+    b'noise\n',
+    b'stdin:3:1 Another message\n',
+]
+
+
+class TestProgressiveResults(DeferrableTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.view = sublime.active_window().new_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.view:
+            cls.view.set_scratch(True)
+            cls.view.close()
+
+    def setUp(self):
+        # it's just faster if we mock this out
+        when(linter_module).register_linter(...).thenReturn(None)
+
+    def tearDown(self):
+        unstub()
+
+    def create_linter(self, interval=1e-9, **attrs):
+        FakeLinter = type('FakeLinter', (Linter,), dict({
+            'cmd': 'fake_linter_1',
+            'defaults': {'selector': None},
+            'regex': r'^stdin:(?P<line>\d+):(?P<col>\d+) (?P<message>.*)$',
+        }, **attrs))
+        linter = FakeLinter(self.view, {'progressive_results': interval})
+        linter.snapshot = Snapshot(INPUT)
+        self.published = []
+        linter.on_progress = self.published.append
+        return linter
+
+    def test_publishes_the_errors_found_so_far(self):
+        on_line = self.create_linter().make_progress_reporter()
+        for line in OUTPUT:
+            on_line(line)
+
+        self.assertEqual(
+            [['The message'], ['The message', 'Another message']],
+            [[error['msg'] for error in errors] for errors in self.published]
+        )
+        self.assertEqual(2, self.published[-1][-1]['line'])
+
+    def test_publishes_at_most_every_interval(self):
+        on_line = self.create_linter(interval=3600).make_progress_reporter()
+        for line in OUTPUT:
+            on_line(line)
+
+        self.assertEqual([], self.published)
+
+    def test_off_by_default(self):
+        linter = self.create_linter(interval=0)
+        self.assertIsNone(linter.make_progress_reporter())
+
+    def test_not_for_multiline_regexes(self):
+        linter = self.create_linter(multiline=True)
+        self.assertIsNone(linter.make_progress_reporter())
+
+    def test_not_for_custom_parsers(self):
+        linter = self.create_linter(find_errors=lambda self, output: [])
+        self.assertIsNone(linter.make_progress_reporter())
+
+
+class TestRetractPartialResults(DeferrableTestCase):
+    def setUp(self):
+        self.filename = '/not/a/real/file.py'
+        self.addCleanup(unstub)
+        self.addCleanup(persist.file_errors.pop, self.filename, None)
+        self.addCleanup(persist.affected_filenames_per_filename.pop, self.filename, None)
+        self.addCleanup(backend.results_before_progress.clear)
+        self.sink = backend.ProgressSink(
+            sublime.active_window(), self.filename, 'on_modified', lambda: False)
+
+    def errors(self):
+        return [
+            error['msg']
+            for error in persist.file_errors.by_linter(self.filename).get('fakelinter', [])
+        ]
+
+    def make_error(self, msg):
+        return persist.make_error_record({
+            'linter': 'fakelinter', 'filename': self.filename, 'msg': msg,
+            'region': sublime.Region(0, 1),
+        })
+
+    def test_retract_restores_the_previous_result(self):
+        persist.update_file_errors(self.filename, 'fakelinter', [self.make_error('final')])
+        self.sink('fakelinter', [self.make_error('partial 1')])
+        self.sink('fakelinter', [self.make_error('partial 2')])
+        self.assertEqual(['partial 2'], self.errors())
+
+        self.sink.retract('fakelinter')
+        self.assertEqual(['final'], self.errors())
+
+    def test_retract_without_partial_results_does_nothing(self):
+        persist.update_file_errors(self.filename, 'fakelinter', [self.make_error('final')])
+        self.sink.retract('fakelinter')
+        self.assertEqual(['final'], self.errors())
+
+    def test_aborted_task_retracts(self):
+        def task():
+            raise linter_module.TransientError('timeout')
+
+        linter = type('FakeLinter', (), {'name': 'fakelinter'})()
+        when(sublime).set_timeout_async(...).thenAnswer(lambda fn, *args: fn())
+        self.sink('fakelinter', [self.make_error('partial')])
+        with self.assertRaises(linter_module.TransientError):
+            backend.retract_progress_on_abort(linter, self.sink, task)
+        self.assertEqual([], self.errors())
@@ -0,0 +1,186 @@
+from collections import ChainMap
+import os
+import shutil
+import tempfile
+import threading
+
+import sublime
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import mock, unstub, when
+
+from SublimeLinter.lint import Linter, backend, linter as linter_module, persist, project_lint, util
+
+
+class FakeBatchLinter(Linter):
+    defaults = {'selector': 'NONE'}
+    cmd = 'fake_linter_1'
+    tempfile_suffix = '-'
+    regex = r'^(?P<filename>.+?):(?P<line>\d+): (?P<message>.*)$'
+
+
+class FakeStdinLinter(Linter):
+    defaults = {'selector': 'NONE'}
+    cmd = 'fake_linter_2'
+    regex = r'^stdin:(?P<line>\d+): (?P<message>.*)$'
+
+
+class FakeLinterWithoutFilename(Linter):
+    defaults = {'selector': 'NONE'}
+    cmd = 'fake_linter_3'
+    tempfile_suffix = '-'
+    regex = r'^(?P<line>\d+): (?P<message>.*)$'
+
+
+class FakeProjectLinter(Linter):
+    defaults = {'selector': 'NONE'}
+    cmd = 'fake_project_linter ${file}'
+    tempfile_suffix = '-'
+    regex = r'^(?P<filename>.+?):(?P<line>\d+): (?P<message>.*)$'
+
+
+class TestProjectLint(DeferrableTestCase):
+    def test_can_batch(self):
+        self.assertTrue(project_lint.can_batch(FakeBatchLinter))
+        self.assertFalse(project_lint.can_batch(FakeStdinLinter))
+        self.assertFalse(project_lint.can_batch(FakeLinterWithoutFilename))
+
+    def test_expand_file_markers_replaces_placeholder(self):
+        self.assertEqual(
+            ['lint', 'a.py', 'b.py', '--strict'],
+            project_lint.expand_file_markers(['lint', '${file}', '--strict'], ['a.py', 'b.py'])
+        )
+
+    def test_expand_file_markers_appends_without_placeholder(self):
+        self.assertEqual(
+            ['lint', '--strict', 'a.py', 'b.py'],
+            project_lint.expand_file_markers(['lint', '--strict'], ['a.py', 'b.py'])
+        )
+
+    def test_collect_files_skips_hidden_vendor_and_excluded(self):
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, True)
+        for path in (
+            'a.py', 'b.pyc', 'sub/c.py',
+            '.git/d.py', 'node_modules/e.js', 'build/f.py'
+        ):
+            filename = os.path.join(folder, path)
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, 'w') as f:
+                f.write('')
+
+        actual = list(project_lint.collect_files(folder, ['build'], ['*.pyc']))
+        self.assertEqual(
+            [os.path.join(folder, 'a.py'), os.path.join(folder, 'sub', 'c.py')],
+            actual
+        )
+
+    def test_file_context(self):
+        filename = os.path.join('foo', 'bar.py')
+        context = project_lint.file_context(filename)
+        self.assertEqual(filename, context['file'])
+        self.assertEqual('foo', context['file_path'])
+        self.assertEqual('bar', context['file_base_name'])
+        self.assertEqual('.py', context['file_extension'])
+
+
+class TestLintProject(DeferrableTestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder, True)
+        # 'c.md' is not plain text and thus not linted
+        self.a, self.b, self.c = (
+            os.path.join(self.folder, name) for name in ('a.txt', 'b.txt', 'c.md'))
+        for filename in (self.a, self.b, self.c):
+            with open(filename, 'w') as f:
+                f.write('foo\nbar\n')
+
+        self.view = sublime.active_window().new_file()
+        self.view.set_scratch(True)
+        self.addCleanup(self.view.close)
+
+        window = self.window = mock()
+        when(window).id().thenReturn(-4711)
+        when(window).folders().thenReturn([self.folder])
+        when(window).is_valid().thenReturn(True)
+
+        when(util).which('fake_project_linter').thenReturn('fake_project_linter')
+        get_raw_linter_settings = linter_module.get_raw_linter_settings
+        when(linter_module).get_raw_linter_settings(FakeProjectLinter, ...).thenAnswer(
+            lambda linter, view: ChainMap(
+                {'selector': 'text.plain'}, get_raw_linter_settings(linter, view))
+        )
+
+    def tearDown(self):
+        project_lint.cancel(self.window)
+        project_lint.forget_files(self.window, {self.a, self.b, self.c})
+        persist.project_filenames.pop(self.window.id(), None)
+        unstub()
+
+    def start(self, **kwargs):
+        run = project_lint.runs[self.window.id()] = project_lint.ProjectLint(
+            self.window, self.view, {'fakeprojectlinter'}, **kwargs)
+        run.start()
+        return run
+
+    def messages(self, filename):
+        return [error['msg'] for error in persist.file_errors.get(filename, [])]
+
+    def test_reports_errors_of_other_files_as_their_own(self):
+        when(project_lint.ProjectLint).communicate(...).thenAnswer(
+            lambda linter, cmd, code: (
+                "{}:1: Error in a\n{}:2: Error in c\n".format(self.a, self.c)
+            )
+        )
+
+        self.start()
+        yield lambda: not project_lint.is_running(self.window)
+
+        self.assertEqual(['Error in a'], self.messages(self.a))
+        self.assertEqual([], self.messages(self.b))
+        self.assertEqual(['Error in c'], self.messages(self.c))
+        self.assertEqual(set(), persist.affected_filenames_per_filename[self.a]['fakeprojectlinter'])
+        self.assertEqual(
+            {self.a, self.b, self.c}, persist.project_filenames[self.window.id()])
+
+    def test_errors_of_files_linted_in_another_batch_are_ignored(self):
+        outputs = {
+            self.a: "{}:1: Error in a\n{}:1: Partial error in b\n".format(self.a, self.b),
+            self.b: "{}:2: Error in b\n".format(self.b),
+        }
+        when(project_lint.ProjectLint).communicate(...).thenAnswer(
+            lambda linter, cmd, code: outputs[cmd[-1]]
+        )
+
+        self.start(batch_size=1)
+        yield lambda: not project_lint.is_running(self.window)
+
+        self.assertEqual(['Error in a'], self.messages(self.a))
+        self.assertEqual(['Error in b'], self.messages(self.b))
+
+    def test_cancel_stops_running_and_pending_batches(self):
+        calls = []
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def communicate(linter, cmd, code):
+            calls.append(cmd)
+            release.wait(5)
+            return "{}:1: Error\n".format(cmd[-1])
+
+        when(project_lint.ProjectLint).communicate(...).thenAnswer(communicate)
+
+        self.start(batch_size=1, max_workers=1)
+        yield lambda: calls
+
+        # The batches run on the shared executor and count towards its budget
+        self.assertEqual(1, backend.executor.state()['running'].get('fakeprojectlinter'))
+
+        self.assertTrue(project_lint.cancel(self.window))
+        release.set()
+        yield lambda: 'fakeprojectlinter' not in backend.executor.state()['running']
+        yield 100
+
+        self.assertEqual(1, len(calls))
+        self.assertFalse(project_lint.is_running(self.window))
+        self.assertEqual([], self.messages(self.a))
+        self.assertEqual([], self.messages(self.b))
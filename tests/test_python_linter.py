@@ -13,7 +13,8 @@ from SublimeLinter.tests.mockito import (
 
 import sublime
 from SublimeLinter import lint
-from SublimeLinter.lint import elect, backend, linter as linter_module, util
+from SublimeLinter.lint import discovery, elect, backend, linter as linter_module, util
+from SublimeLinter.lint.base_linter import python_linter
 
 
 def make_fake_linter(view):
@@ -46,6 +47,8 @@ class TestPythonLinters(DeferrableTestCase):
 
     def tearDown(self):
         unstub()
+        # The memoized answers depend on the mocks of each test
+        discovery.clear()
 
     def create_view(self, window):
         view = window.new_file()
@@ -154,3 +157,84 @@ class TestPythonLinters(DeferrableTestCase):
         yield AWAIT_WORKER
 
         verify(sink).__call__(linter.name, [])
+
+
+class TestVenvResolution(DeferrableTestCase):
+    def setUp(self):
+        self.addCleanup(unstub)
+        self.addCleanup(setattr, python_linter, '_known_venvs', None)
+        python_linter._known_venvs = None
+        when(python_linter).load_state(...).thenReturn({})
+        when(python_linter).save_state(...).thenReturn(None)
+        when(python_linter).refresh_venv(...).thenReturn(None)
+        when(sublime).run_command(...).thenReturn(None)
+
+    def test_returns_last_known_venv_and_refreshes_in_background(self):
+        cmd = ('poetry', 'env', 'info', '-p')
+        self.assertIsNone(python_linter.ask_utility_for_venv('/p', cmd))
+        verify(python_linter).refresh_venv('/p', cmd)
+
+        when(util).check_output(cmd, cwd='/p').thenReturn('/venvs/p-py3.12\n')
+        python_linter._refresh_venv('/p', cmd)
+        verify(sublime).run_command(
+            'sublime_linter_config_changed', {'hint': 'relint', 'folder': '/p'})
+
+        self.assertEqual('/venvs/p-py3.12', python_linter.ask_utility_for_venv('/p', cmd))
+        # The answer is fresh, so we don't ask again
+        verify(python_linter, times=1).refresh_venv('/p', cmd)
+
+    def test_only_asks_again_after_max_age(self):
+        cmd = ('poetry', 'env', 'info', '-p')
+        when(util).check_output(cmd, cwd='/p').thenReturn('/venvs/p-py3.12\n')
+        python_linter._refresh_venv('/p', cmd)
+        python_linter._known_venvs[python_linter.venv_key('/p', cmd)]['checked'] -= 120
+
+        # Linting doesn't ask again just because some time has passed ...
+        python_linter.ask_utility_for_venv('/p', cmd)
+        verify(python_linter, times=0).refresh_venv(...)
+
+        # ... but activating or saving a file does
+        python_linter.ask_utility_for_venv('/p', cmd, max_age=python_linter.VENV_REFRESH_INTERVAL)
+        verify(python_linter).refresh_venv('/p', cmd)
+
+    def test_does_not_relint_if_venv_did_not_change(self):
+        cmd = ('pipenv', '--venv')
+        when(util).check_output(cmd, cwd='/p').thenReturn('/venvs/p\n')
+        python_linter._refresh_venv('/p', cmd)
+        python_linter._refresh_venv('/p', cmd)
+        verify(sublime, times=1).run_command(...)
+
+
+class TestInterpreterRegistry(DeferrableTestCase):
+    def setUp(self):
+        self.addCleanup(unstub)
+        self.addCleanup(setattr, python_linter, '_known_interpreters', None)
+        self.addCleanup(python_linter.invalidate_interpreters)
+        python_linter._known_interpreters = None
+        python_linter.invalidate_interpreters()
+        when(python_linter).load_state(...).thenReturn({})
+        when(python_linter).save_state(...).thenReturn(None)
+
+    def test_probes_an_interpreter_only_once(self):
+        when(python_linter).interpreter_identity('/bin/python').thenReturn(['/bin/python3.12', 1.0, 2, 3])
+        when(util).check_output(['/bin/python', '-V']).thenReturn('Python 3.12.1')
+
+        expected = {'major': 3, 'minor': 12}
+        self.assertEqual(expected, python_linter.get_python_version('/bin/python'))
+        self.assertEqual(expected, python_linter.get_python_version('/bin/python'))
+        verify(util, times=1).check_output(...)
+        # Until the next venv refresh event we don't even look at the binary
+        verify(python_linter, times=1).interpreter_identity(...)
+
+    def test_probes_again_if_the_binary_changed(self):
+        when(python_linter).interpreter_identity('/bin/python') \
+            .thenReturn(['/bin/python3.11', 1.0, 2, 3]) \
+            .thenReturn(['/bin/python3.12', 1.0, 4, 3])
+        when(util).check_output(['/bin/python', '-V']) \
+            .thenReturn('Python 3.11.0') \
+            .thenReturn('Python 3.12.1')
+        when(python_linter).ask_utility_for_venv(...).thenReturn(None)
+
+        self.assertEqual({'major': 3, 'minor': 11}, python_linter.get_python_version('/bin/python'))
+        python_linter.prefetch_venv('/p/foo.py')
+        self.assertEqual({'major': 3, 'minor': 12}, python_linter.get_python_version('/bin/python'))
@@ -0,0 +1,177 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import sublime
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.mockito import unstub, when
+
+from SublimeLinter.lint import (
+    Linter, discovery, linter as linter_module, result_cache, spawn_cache, util
+)
+
+
+def make_error(msg='Boom', a=0, b=1):
+    return {
+        'filename': 'a.py',
+        'line': 0,
+        'start': 0,
+        'region': sublime.Region(a, b),
+        'error_type': 'error',
+        'code': 'E1',
+        'msg': msg,
+        'offending_text': 'x',
+    }
+
+
+class TestResultCache(DeferrableTestCase):
+    def test_miss_then_hit(self):
+        cache = result_cache.ResultCache()
+        self.assertIsNone(cache.get('key'))
+
+        cache.put('key', 'a.py', [make_error()])
+        self.assertEqual([make_error()], cache.get('key'))
+        self.assertEqual(1, cache.stats()['hits'])
+        self.assertEqual(1, cache.stats()['misses'])
+
+    def test_returns_independent_copies(self):
+        cache = result_cache.ResultCache()
+        errors = [make_error()]
+        cache.put('key', 'a.py', errors)
+
+        errors[0]['region'].a = 10
+        cached = cache.get('key')
+        cached[0]['msg'] = 'changed'
+        cached[0]['region'].b = 20
+
+        self.assertEqual([make_error()], cache.get('key'))
+
+    def test_evicts_least_recently_used_by_size(self):
+        entry_size = result_cache.estimate_size([make_error()])
+        cache = result_cache.ResultCache(max_size=2 * entry_size)
+        cache.put('a', 'a.py', [make_error()])
+        cache.put('b', 'a.py', [make_error()])
+        cache.get('a')
+        cache.put('c', 'a.py', [make_error()])
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(1, cache.stats()['evictions'])
+        self.assertEqual(2 * entry_size, cache.stats()['size'])
+
+    def test_too_big_results_are_not_stored(self):
+        cache = result_cache.ResultCache(max_size=10)
+        cache.put('a', 'a.py', [make_error()])
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(0, cache.stats()['size'])
+
+    def test_discard_below(self):
+        cache = result_cache.ResultCache()
+        cache.put('a', os.path.join('p', 'a.py'), [make_error()])
+        cache.put('b', os.path.join('p', 'sub', 'b.py'), [])
+        cache.put('c', os.path.join('pp', 'c.py'), [])
+        cache.put('d', os.path.join('p', 'd.py'), [])
+        cache.discard_below('p', keep=os.path.join('p', 'd.py'))
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertIsNotNone(cache.get('d'))
+
+
+class TestMakeKey(DeferrableTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.view = sublime.active_window().new_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.view:
+            cls.view.set_scratch(True)
+            cls.view.close()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+        self.addCleanup(unstub)
+        self.addCleanup(self.view.settings().erase, 'SublimeLinter.linters.fakelinter.args')
+        spawn_cache.cache.clear()
+        discovery.clear()
+        when(util).which('fake_linter_1').thenReturn(sys.executable)
+        when(linter_module).register_linter(...).thenReturn(None)
+
+        class FakeLinter(Linter):
+            name = 'fakelinter'
+            cmd = ('fake_linter_1', '${args}')
+            defaults = {'selector': None, 'args': ''}
+
+        self.FakeLinter = FakeLinter
+
+    def create_linter(self, linter_class=None):
+        linter_class = linter_class or self.FakeLinter
+        context = dict(
+            linter_module.get_view_context(self.view),
+            file=os.path.join(self.tmp_dir, 'a.py'),
+        )
+        settings = linter_module.get_linter_settings(linter_class, self.view, context)
+        return linter_class(self.view, settings)
+
+    def test_key_for_view_settings_is_stable(self):
+        self.view.settings().set('SublimeLinter.linters.fakelinter.args', '--foo')
+        yield 10
+        first = result_cache.make_key(self.create_linter(), 'code')
+        second = result_cache.make_key(self.create_linter(), 'code')
+
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+
+    def test_view_settings_change_the_key(self):
+        self.view.settings().set('SublimeLinter.linters.fakelinter.args', '--foo')
+        first = result_cache.make_key(self.create_linter(), 'code')
+        self.view.settings().set('SublimeLinter.linters.fakelinter.args', '--bar')
+        # Let Sublime notify the observer of the settings
+        yield 10
+        second = result_cache.make_key(self.create_linter(), 'code')
+
+        self.assertNotEqual(first, second)
+
+    def test_config_file_mtime_changes_the_key(self):
+        config_file = os.path.join(self.tmp_dir, 'setup.cfg')
+        with open(config_file, 'w'):
+            pass
+        first = result_cache.make_key(self.create_linter(), 'code')
+        future = time.time() + 10
+        os.utime(config_file, (future, future))
+        second = result_cache.make_key(self.create_linter(), 'code')
+
+        self.assertNotEqual(first, second)
+
+    def test_executable_identity_is_part_of_the_key(self):
+        key = result_cache.make_key(self.create_linter(), 'code')
+        self.assertIn(result_cache.executable_identity(sys.executable), key)
+
+    def test_missing_executable_is_not_cached(self):
+        when(util).which('fake_linter_1').thenReturn(None)
+        self.assertIsNone(result_cache.make_key(self.create_linter(), 'code'))
+
+    def test_linters_with_their_own_run_are_not_cached(self):
+        class FakeLinter(self.FakeLinter):
+            def run(self, cmd, code):
+                return ''
+
+        self.assertIsNone(result_cache.make_key(self.create_linter(FakeLinter), 'code'))
+
+    def test_config_files(self):
+        for name in ('.flake8', 'setup.cfg', 'main.py', '.eslintrc'):
+            with open(os.path.join(self.tmp_dir, name), 'w'):
+                pass
+
+        found = {
+            os.path.basename(path)
+            for path, _ in result_cache.config_files(self.tmp_dir, self.tmp_dir)
+        }
+        self.assertEqual({'.flake8', 'setup.cfg', '.eslintrc'}, found)
@@ -0,0 +1,130 @@
+from concurrent.futures import wait
+import threading
+import time
+
+from unittesting import DeferrableTestCase
+
+from SublimeLinter.lint import scheduler
+from SublimeLinter.lint.scheduler import (
+    PRIORITY_ACTIVE,
+    PRIORITY_BACKGROUND,
+    PRIORITY_VISIBLE,
+)
+
+
+class TestPriorityExecutor(DeferrableTestCase):
+    def setUp(self):
+        self.executor = scheduler.PriorityExecutor(1, 'TestScheduler')
+        self.addCleanup(self.executor.shutdown)
+        self.order = []
+        self.gate = threading.Event()
+        # Block the only worker so that we can fill the queue
+        self.executor.schedule(self.gate.wait, PRIORITY_ACTIVE)
+
+    def record(self, name):
+        return lambda: self.order.append(name)
+
+    def drain(self):
+        self.gate.set()
+        done = self.executor.schedule(lambda: None, PRIORITY_BACKGROUND + 1)
+        done.result(timeout=5)
+
+    def test_higher_priorities_run_first(self):
+        self.executor.schedule(self.record('background'), PRIORITY_BACKGROUND)
+        self.executor.schedule(self.record('visible'), PRIORITY_VISIBLE)
+        self.executor.schedule(self.record('active'), PRIORITY_ACTIVE)
+        self.drain()
+
+        self.assertEqual(['active', 'visible', 'background'], self.order)
+
+    def test_same_priority_is_fifo_for_one_owner(self):
+        for n in range(3):
+            self.executor.schedule(self.record(n), PRIORITY_BACKGROUND, owner='a')
+        self.drain()
+
+        self.assertEqual([0, 1, 2], self.order)
+
+    def test_round_robin_between_owners(self):
+        for n in range(3):
+            self.executor.schedule(self.record(('a', n)), PRIORITY_BACKGROUND, owner='a')
+        self.executor.schedule(self.record(('b', 0)), PRIORITY_BACKGROUND, owner='b')
+        self.drain()
+
+        self.assertEqual([('a', 0), ('b', 0), ('a', 1), ('a', 2)], self.order)
+
+    def test_submit_is_compatible_with_the_executor_interface(self):
+        f = self.executor.submit(lambda x, y: x + y, 1, y=2)
+        self.gate.set()
+        self.assertEqual(3, f.result(timeout=5))
+
+    def test_exceptions_are_set_on_the_future(self):
+        def boom():
+            raise ValueError('boom')
+
+        f = self.executor.schedule(boom)
+        self.gate.set()
+        with self.assertRaises(ValueError):
+            f.result(timeout=5)
+
+
+class TestAdmissionControl(DeferrableTestCase):
+    def setUp(self):
+        self.budget = None
+        self.executor = scheduler.PriorityExecutor(4, 'TestAdmission', budget=lambda: self.budget)
+        self.addCleanup(self.executor.shutdown)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def tracked(self):
+        def task():
+            with self.lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            time.sleep(0.02)
+            with self.lock:
+                self.running -= 1
+        return task
+
+    def test_group_limit(self):
+        futures = [
+            self.executor.schedule(self.tracked(), group='mypy', limit=1)
+            for _ in range(4)
+        ]
+        wait(futures, timeout=5)
+
+        self.assertEqual(1, self.max_running)
+
+    def test_global_budget(self):
+        self.budget = 2
+        futures = [
+            self.executor.schedule(self.tracked(), group=name)
+            for name in ('a', 'b', 'c', 'd')
+        ]
+        wait(futures, timeout=5)
+
+        self.assertEqual(2, self.max_running)
+
+    def test_blocked_items_do_not_block_other_groups(self):
+        gate = threading.Event()
+        self.executor.schedule(gate.wait, group='mypy', limit=1)
+        self.executor.schedule(gate.wait, group='mypy', limit=1)
+        f = self.executor.schedule(lambda: 'flake8', group='flake8')
+
+        self.assertEqual('flake8', f.result(timeout=5))
+        gate.set()
+
+    def test_queued_items_are_coalesced(self):
+        gate = threading.Event()
+        self.executor.schedule(gate.wait, group='mypy', limit=1)
+        old = self.executor.schedule(lambda: 'old', group='mypy', limit=1, coalesce_key=(1, 'mypy'))
+        new = self.executor.schedule(lambda: 'new', group='mypy', limit=1, coalesce_key=(1, 'mypy'))
+
+        self.assertTrue(old.cancelled())
+        state = self.executor.state()
+        self.assertEqual({'mypy': 1}, state['running'])
+        self.assertEqual({'background': 1}, state['queued'])
+        self.assertEqual(1, state['rejected'])
+
+        gate.set()
+        self.assertEqual('new', new.result(timeout=5))
@@ -0,0 +1,56 @@
+import hashlib
+
+import sublime
+from unittesting import DeferrableTestCase
+from SublimeLinter.tests.parameterized import parameterized as p
+
+from SublimeLinter.lint import backend, linter as linter_module
+from SublimeLinter.lint.snapshot import Snapshot
+
+
+class TestSnapshot(DeferrableTestCase):
+    @p.expand([
+        ('',),
+        ('foo',),
+        ('foo\n',),
+        ('foo\nbär\r\nbaz',),
+        ('\n\n',),
+    ])
+    def test_line_offsets(self, code):
+        snapshot = Snapshot(code)
+        vv = linter_module.VirtualView(code, snapshot.line_offsets)
+        expected = linter_module.VirtualView(code)
+
+        self.assertEqual(list(expected._newlines), list(snapshot.line_offsets))
+        self.assertEqual(expected.max_lines(), vv.max_lines())
+        for offset in range(len(code)):
+            self.assertEqual(expected.rowcol(offset), vv.rowcol(offset))
+
+    def test_encoded_and_hash(self):
+        snapshot = Snapshot('bär')
+        self.assertEqual('bär'.encode('utf8'), snapshot.encoded)
+        self.assertIs(snapshot.encoded, snapshot.encoded)
+        self.assertEqual(hashlib.sha256('bär'.encode('utf8')).hexdigest(), snapshot.hash)
+
+
+class TestSharedSnapshots(DeferrableTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.view = sublime.active_window().new_file()
+        cls.view.run_command('append', {'characters': 'foo\nbar\n'})
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.view:
+            cls.view.set_scratch(True)
+            cls.view.close()
+
+    def test_regions_are_read_once(self):
+        snapshots = {}
+        first = backend.get_snapshot(self.view, sublime.Region(0, 3), snapshots)
+        second = backend.get_snapshot(self.view, sublime.Region(0, 3), snapshots)
+        other = backend.get_snapshot(self.view, sublime.Region(4, 7), snapshots)
+
+        self.assertIs(first, second)
+        self.assertEqual('foo', first.text)
+        self.assertEqual('bar', other.text)
@@ -0,0 +1,113 @@
+import os
+
+import sublime
+from unittesting import DeferrableTestCase
+
+from SublimeLinter.lint import Linter, linter as linter_module, spawn_cache, util
+from SublimeLinter.tests.mockito import mock, unstub, when
+
+
+class TestSpawnCache(DeferrableTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.view = sublime.active_window().new_file()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.view:
+            cls.view.set_scratch(True)
+            cls.view.close()
+
+    def setUp(self):
+        spawn_cache.cache.clear()
+        when(util).which('fake_linter_1').thenReturn('/bin/fake_linter_1')
+        when(linter_module).register_linter(...).thenReturn(None)
+
+    def tearDown(self):
+        unstub()
+
+    def test_computes_the_cmd_only_once(self):
+        calls = []
+
+        class FakeLinter(Linter):
+            cmd = ('fake_linter_1', '--foo')
+            defaults = {'selector': None}
+
+            def get_cmd(self):
+                calls.append(1)
+                return super().get_cmd()
+
+        first = spawn_cache.get_spawn_spec(FakeLinter(self.view, {}))
+        second = spawn_cache.get_spawn_spec(FakeLinter(self.view, {}))
+        self.assertEqual(('/bin/fake_linter_1', '--foo'), second.cmd)
+        self.assertIs(first, second)
+        self.assertEqual(1, len(calls))
+
+    def test_different_settings_compute_a_new_cmd(self):
+        class FakeLinter(Linter):
+            cmd = ('fake_linter_1', '${args}')
+            defaults = {'selector': None}
+
+        first = spawn_cache.get_spawn_spec(FakeLinter(self.view, {'args': '--foo'}))
+        second = spawn_cache.get_spawn_spec(FakeLinter(self.view, {'args': '--bar'}))
+        self.assertEqual(('/bin/fake_linter_1', '--foo'), first.cmd)
+        self.assertEqual(('/bin/fake_linter_1', '--bar'), second.cmd)
+
+    def test_replays_side_effects_on_hit(self):
+        class FakeLinter(Linter):
+            cmd = ('fake_linter_1',)
+            defaults = {'selector': None}
+
+            def context_sensitive_executable_path(self, cmd):
+                self.context['project_root'] = '/foo'
+                self.env['VIRTUAL_ENV'] = '/foo/.venv'
+                return False, None
+
+        spawn_cache.get_spawn_spec(FakeLinter(self.view, {}))
+        linter = FakeLinter(self.view, {})
+        when(linter).context_sensitive_executable_path(...).thenRaise(AssertionError)
+        spawn_cache.get_spawn_spec(linter)
+        self.assertEqual('/foo', linter.context['project_root'])
+        self.assertEqual('/foo/.venv', linter.env['VIRTUAL_ENV'])
+
+    def test_rebuilds_the_environment_for_every_lint(self):
+        class FakeLinter(Linter):
+            cmd = ('fake_linter_1',)
+            defaults = {'selector': None}
+
+        first = FakeLinter(self.view, {'env': {'SL_FOO': 'foo'}})
+        first.env['SL_BAR'] = 'first'
+        spec = spawn_cache.get_spawn_spec(first)
+        self.assertEqual({'SL_FOO': 'foo'}, spec.env)
+
+        second = FakeLinter(self.view, {'env': {'SL_FOO': 'foo'}})
+        second.env['SL_BAR'] = 'second'
+        env = spawn_cache.environment_of(second, spawn_cache.get_spawn_spec(second))
+        self.assertEqual('foo', env['SL_FOO'])
+        self.assertEqual('second', env['SL_BAR'])
+
+        env['SL_BAZ'] = 'baz'
+        self.assertNotIn('SL_BAZ', spawn_cache.environment_of(first, spec))
+
+    def test_does_not_cache_a_missing_executable(self):
+        class FakeLinter(Linter):
+            cmd = ('fake_linter_1',)
+            defaults = {'selector': None}
+
+        when(util).which('fake_linter_1').thenReturn(None)
+        self.assertIsNone(spawn_cache.get_spawn_spec(FakeLinter(self.view, {})))
+        self.assertEqual(0, spawn_cache.cache.stats()['entries'])
+
+    def test_discard_below_drops_the_specs_of_the_files_in_a_folder(self):
+        cache = spawn_cache.SpawnCache()
+        spec = mock()
+        cache.put('a', spec, os.path.join('p', 'a.py'))
+        cache.put('b', spec, os.path.join('p', 'sub', 'b.py'))
+        cache.put('c', spec, os.path.join('pp', 'c.py'))
+        cache.put('d', spec)
+        cache.discard_below('p')
+
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIs(spec, cache.get('c'))
+        self.assertIs(spec, cache.get('d'))
@@ -1,4 +1,7 @@
 import subprocess
+import sys
+import time
+from unittest import skipIf
 from textwrap import dedent
 
 from unittesting import DeferrableTestCase
@@ -59,3 +62,49 @@ Executing `python --foo` failed
         verify(util.logger).warning("""\
 Executing `python --foo` failed
   some message""")
+
+
+@skipIf(sys.platform == "win32", "process groups are POSIX only")
+class TestTerminateProcess(DeferrableTestCase):
+    def spawn(self, script):
+        return subprocess.Popen(
+            ["sh", "-c", script],
+            start_new_session=util.start_new_session()
+        )
+
+    def test_terminates_process(self):
+        proc = self.spawn("sleep 30")
+        util.terminate_process(proc)
+        self.assertIsNotNone(proc.wait(5))
+
+    def test_kills_process_which_ignores_terminate(self):
+        proc = self.spawn("trap '' TERM; sleep 30 & wait")
+        time.sleep(0.2)
+        start = time.monotonic()
+        util.terminate_process(proc, grace_period=0.2)
+        proc.wait(5)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_kills_children_after_the_leader_exited(self):
+        # The leader exits on TERM, its child ignores it and keeps stdout open.
+        proc = subprocess.Popen(
+            ["sh", "-c", "(trap '' TERM; sleep 30) & sleep 30"],
+            stdout=subprocess.PIPE,
+            start_new_session=util.start_new_session()
+        )
+        time.sleep(0.2)
+        start = time.monotonic()
+        util.terminate_process(proc, grace_period=0.2)
+        proc.communicate(timeout=5)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_does_not_kill_a_group_which_is_gone(self):
+        proc = self.spawn("exit 0")
+        pgid = util.process_group_of(proc)
+        proc.wait(5)
+        self.addCleanup(unstub)
+        when(util.logger).info(...)
+
+        util.kill_process(proc, pgid)
+
+        verify(util.logger, times=0).info(...)